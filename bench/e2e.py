@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput against the local stand-ins (bench/standins.py), on a
+fresh database and with no network:
+
+  pipeline  run_daily per Places search: prospect -> qualify -> build -> draft
+  approve   approve every draft
+  send      drain the outbox into the SMTP sink
+  replies   one IMAP sync of the replies and bounces the sink answered with
+
+Places doesn't return email addresses, so before sending every lead gets
+one, standing in for the operator's lookup. Website latency (and the other
+knobs) are flags, so the same run can be repeated on slow or fast "internet".
+
+Usage:
+  python bench/e2e.py                              # 3 searches, no added latency
+  python bench/e2e.py --searches 9 --site-latency-ms 250 --site-jitter-ms 100 --out e2e.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = Path(tempfile.gettempdir()) / "openclaw-bench"
+
+
+def timed(results: dict, name: str, fn, count):
+    """Run fn(), record wall time and count(result) items under name, and return the result."""
+    t0 = time.perf_counter()
+    out = fn()
+    wall = time.perf_counter() - t0
+    items = count(out)
+    results[name] = {"items": items, "wall_s": round(wall, 3), "per_s": round(items / wall, 1) if wall else 0.0}
+    print(f"{name:<10} {items:>7} {wall:>9.2f} {results[name]['per_s']:>9.1f}")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenClaw end-to-end benchmark against local stand-ins")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--searches", type=int, default=3, help="Places searches (category x metro) to run")
+    parser.add_argument("--metros", type=int, default=3, help="Metros in the generated fixtures")
+    parser.add_argument("--per-search", type=int, default=60, help="Places results per search")
+    parser.add_argument("--fixtures", default="", help="Fixture dir (default: generated from --seed)")
+    parser.add_argument("--places-latency-ms", type=float, default=0)
+    parser.add_argument("--site-latency-ms", type=float, default=0)
+    parser.add_argument("--site-jitter-ms", type=float, default=0)
+    parser.add_argument("--smtp-latency-ms", type=float, default=0)
+    parser.add_argument("--reply-rate", type=float, default=0.3)
+    parser.add_argument("--bounce-rate", type=float, default=0.03)
+    parser.add_argument("--out", default="", help="Write results as JSON")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    import standins
+
+    ports = standins.free_ports()
+    tmp = tempfile.TemporaryDirectory(prefix="openclaw-e2e-")
+    # Before anything imports openclaw: config is read once, at import
+    os.environ.update(standins.standin_env(ports))
+    os.environ.update({
+        "OPENCLAW_DB_PATH": str(Path(tmp.name, "e2e.db")),
+        "PREVIEW_DIR": str(Path(tmp.name, "previews")),
+        "PREVIEW_HOST": "http://preview.standin.local",
+        "LOG_DIR": str(Path(tmp.name, "logs")),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        "PROSPECT_BATCH_SIZE": str(args.per_search),
+        "OUTREACH_DAILY_LIMIT": "1000000",
+        "SMTP_DOMAIN_INTERVAL": "0",
+    })
+
+    fixtures = args.fixtures or str(BENCH_DIR / f"fixtures-s{args.seed}-m{args.metros}-p{args.per_search}")
+    if not Path(fixtures, "places").is_dir():
+        from synth import METROS
+        print(f"Generating fixtures in {fixtures}: {standins.make_fixtures(fixtures, args.seed, METROS[:args.metros], args.per_search)}")
+    searches = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(Path(fixtures, "places").glob("*.json"))]
+    searches = [(s["category"], s["metro"]) for s in searches][:args.searches]
+
+    from openclaw.persistence.database import init_db, get_db, approve_drafts, count_leads_by_status
+    from openclaw.pipeline import run_daily
+    from openclaw.execution.email_sender import drain_outbox
+    from openclaw.execution.reply_checker import check_replies
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+    services = standins.StandIns(fixtures, args.seed, args.places_latency_ms, args.site_latency_ms,
+                                 args.site_jitter_ms, args.smtp_latency_ms, args.reply_rate, args.bounce_rate,
+                                 ports=ports).start()
+    results = {}
+    try:
+        print(f"{len(searches)} searches, fixtures {fixtures}\n")
+        print(f"{'stage':<10} {'items':>7} {'wall s':>9} {'items/s':>9}")
+        timed(results, "pipeline", lambda: [run_daily(c, m) for c, m in searches],
+              lambda summaries: sum(s["stages"]["prospect"]["out"] for s in summaries))
+        with get_db() as db:
+            db.execute("UPDATE leads SET email = 'owner@' || id || '.example.com' WHERE email = ''")
+        timed(results, "approve", approve_drafts, len)
+        timed(results, "send", lambda: drain_outbox(limit=1000000), lambda r: r["sent"])
+        timed(results, "replies", check_replies, lambda r: r["found"] + r.get("bounced", 0))
+    finally:
+        services.stop()
+
+    funnel = count_leads_by_status()
+    print(f"\nLeads: {', '.join(f'{k} {v}' for k, v in sorted(funnel.items()))}")
+    print(f"Stand-ins: {services.stats()}")
+    report = {
+        "meta": {
+            "seed": args.seed, "searches": len(searches), "per_search": args.per_search,
+            "latency_ms": {"places": args.places_latency_ms, "sites": args.site_latency_ms,
+                           "site_jitter": args.site_jitter_ms, "smtp": args.smtp_latency_ms},
+            "reply_rate": args.reply_rate, "bounce_rate": args.bounce_rate,
+            "at": datetime.utcnow().isoformat(timespec="seconds"), "python": platform.python_version(),
+        },
+        "results": results,
+        "funnel": funnel,
+        "standins": services.stats(),
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.out}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
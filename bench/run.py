@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite — DB helpers, qualifier scoring, builder rendering, outreach
+drafting, reply classification and dashboard queries against a synthetic
+database (bench/synth.py) at 1k / 100k / 1m leads.
+
+The database is built once per (scale, seed) under the temp dir and reused;
+--rebuild forces a fresh one. Each benchmark runs one warm-up pass, then
+--repeat timed passes; results are per operation (best / median) and can be
+written as JSON (--out) and compared with an earlier run (--compare).
+
+CPU-bound benchmarks (scoring, rendering, drafting, classifying) run over a
+fixed in-memory sample, so their numbers don't depend on --scale; the DB and
+dashboard ones are what scale shows. Qualifier scoring skips website checks,
+which are network-bound.
+
+Usage:
+  python bench/run.py                              # 1k leads, everything
+  python bench/run.py --scale 100k --out before.json
+  python bench/run.py --scale 100k --compare before.json --only db,dashboard
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+BENCH_DIR = Path(tempfile.gettempdir()) / "openclaw-bench"
+
+BENCHMARKS = {}
+
+
+def _each(fn, inputs):
+    """Work that calls fn once per input; one operation per call."""
+    inputs = list(inputs)
+
+    def work():
+        for item in inputs:
+            fn(item)
+        return len(inputs)
+    return work
+
+
+def benchmark(name: str):
+    """Register `fn(ctx) -> work`, where work() runs one pass and returns its operation count."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+# ---------------------------------------------------------------------------
+# DB helpers
+# ---------------------------------------------------------------------------
+
+@benchmark("db.get_lead")
+def _get_lead(ctx):
+    from openclaw.persistence.database import get_lead
+    return _each(get_lead, ctx["lead_ids"])
+
+
+@benchmark("db.lead_exists_email")
+def _lead_exists_email(ctx):
+    from openclaw.persistence.database import lead_exists
+    return _each(lambda email: lead_exists(email=email), ctx["emails"])
+
+
+@benchmark("db.lead_exists_name_metro")
+def _lead_exists_name(ctx):
+    from openclaw.persistence.database import lead_exists
+    return _each(lambda name_metro: lead_exists(*name_metro), [("", *nm) for nm in ctx["names"][:50]])
+
+
+@benchmark("db.get_leads_by_status")
+def _get_leads_by_status(ctx):
+    from openclaw.persistence.database import get_leads_by_status
+    return _each(get_leads_by_status, ["new", "qualified", "sent", "replied"] * 5)
+
+
+@benchmark("db.get_outreach_candidates")
+def _get_outreach_candidates(ctx):
+    from openclaw.persistence.database import get_outreach_candidates
+    return _each(lambda _: get_outreach_candidates(), range(5))
+
+
+@benchmark("db.get_drafts_by_status")
+def _get_drafts_by_status(ctx):
+    from openclaw.persistence.database import get_drafts_by_status
+    return _each(get_drafts_by_status, ["draft", "approved"] * 10)
+
+
+@benchmark("db.get_lead_ids_by_emails")
+def _get_lead_ids_by_emails(ctx):
+    from openclaw.persistence.database import get_lead_ids_by_emails
+
+    def work():
+        get_lead_ids_by_emails(ctx["emails"])
+        return len(ctx["emails"])
+    return work
+
+
+@benchmark("db.update_lead")
+def _update_lead(ctx):
+    from openclaw.persistence.database import update_lead
+    return _each(lambda lead_id: update_lead(lead_id, human_notes="bench"), ctx["lead_ids"][:200])
+
+
+# ---------------------------------------------------------------------------
+# Agents (CPU only)
+# ---------------------------------------------------------------------------
+
+@benchmark("qualifier.score")
+def _qualifier_score(ctx):
+    from openclaw.agents.qualifier import QualifierAgent
+    agent = QualifierAgent()
+    leads = [dict(lead, website_url="") for lead in ctx["sample"]]
+
+    def work():
+        for lead in leads:
+            if not agent._check_disqualify(lead):
+                agent._score(lead)
+                agent._estimate_roi(lead)
+                agent._extract_themes(lead)
+        return len(leads)
+    return work
+
+
+@benchmark("creative.generate")
+def _creative_generate(ctx):
+    from openclaw.agents.creative import CreativeAgent
+    agent = CreativeAgent()
+    return _each(agent._generate, ctx["sample"])
+
+
+@benchmark("builder.render")
+def _builder_render(ctx):
+    from openclaw.agents.builder import BuilderAgent
+    from openclaw.agents.creative import CreativeAgent
+    agent, creative = BuilderAgent(), CreativeAgent()
+    pairs = [(lead, creative._generate(lead)) for lead in ctx["sample"]]
+    return _each(lambda pair: agent._render(*pair), pairs)
+
+
+@benchmark("outreach.draft")
+def _outreach_draft(ctx):
+    from openclaw.agents.outreach import OutreachAgent
+    agent = OutreachAgent()
+    return _each(lambda item: agent._generate_draft(item[1], item[0] % 3), list(enumerate(ctx["sample"])))
+
+
+@benchmark("replies.classify")
+def _replies_classify(ctx):
+    from openclaw.execution.reply_checker import _classify
+    return _each(_classify, ctx["reply_texts"])
+
+
+# ---------------------------------------------------------------------------
+# Dashboard
+# ---------------------------------------------------------------------------
+
+def _query(name: str, fn_name: str):
+    def setup(ctx):
+        from openclaw.persistence import database
+        return _each(lambda _: getattr(database, fn_name)(), range(3))
+    BENCHMARKS[name] = setup
+
+
+for _fn in ("count_leads_by_status", "count_drafts_by_status", "get_reply_count", "get_positive_reply_count",
+            "get_conversion_stats", "get_total_roi_pipeline", "get_closed_revenue", "get_stage_timings"):
+    _query(f"dashboard.{_fn}", _fn)
+
+
+@benchmark("dashboard.print")
+def _dashboard_print(ctx):
+    from openclaw.observability.dashboard import print_dashboard
+
+    def work():
+        with contextlib.redirect_stdout(io.StringIO()):
+            print_dashboard()
+        return 1
+    return work
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def prepare(scale: str, seed: int, rebuild: bool) -> dict:
+    """Point openclaw at the (scale, seed) database, building it if needed. Returns its row counts."""
+    db_path = BENCH_DIR / f"bench-{scale}-s{seed}.db"
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    os.environ["OPENCLAW_DB_PATH"] = str(db_path)
+    os.environ.setdefault("LOG_DIR", str(BENCH_DIR / "logs"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, str(ROOT))
+
+    import synth
+    if rebuild or not db_path.exists():
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            synth.populate(SCALES[scale], seed)
+        print(f"Built {db_path} in {time.perf_counter() - t0:.1f}s")
+
+    with contextlib.closing(sqlite3.connect(db_path)) as db:
+        return {table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("leads", "outreach_drafts", "replies", "lead_events")}
+
+
+def context(seed: int, sample: int) -> dict:
+    """Inputs shared by the benchmarks: existing keys to look up, and an in-memory sample."""
+    import random
+    import synth
+    from openclaw.persistence.database import get_db
+
+    rng = random.Random(seed)
+    with get_db() as db:
+        max_rowid = db.execute("SELECT COALESCE(MAX(rowid), 0) FROM leads").fetchone()[0]
+        rowids = rng.sample(range(1, max_rowid + 1), min(500, max_rowid))
+        by_rowid = {r["rowid"]: r for r in db.execute(
+            f"SELECT rowid, id, email, business_name, metro FROM leads WHERE rowid IN "
+            f"({', '.join('?' * len(rowids))})", rowids)}
+    rows = [by_rowid[rowid] for rowid in rowids if rowid in by_rowid]
+    gen = synth.Synth(seed)
+    sample = [gen.lead() for _ in range(sample)]
+    return {
+        "lead_ids": [r["id"] for r in rows],
+        "emails": [r["email"] for r in rows if r["email"]],
+        "names": [(r["business_name"], r["metro"]) for r in rows],
+        "sample": sample,
+        "reply_texts": [gen.reply_text() for _ in range(len(sample))],
+    }
+
+
+def run(names: list[str], ctx: dict, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        work = BENCHMARKS[name](ctx)
+        ops = work()  # warm-up: imports, caches, SQLite page cache
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            work()
+            times.append(time.perf_counter() - t0)
+        median = statistics.median(times)
+        results[name] = {
+            "ops": ops,
+            "best_us": round(1e6 * min(times) / ops, 2),
+            "median_us": round(1e6 * median / ops, 2),
+            "ops_per_s": round(ops / median, 1),
+        }
+        print(f"{name:<36} {ops:>6} {results[name]['best_us']:>12.1f} {results[name]['median_us']:>12.1f} "
+              f"{results[name]['ops_per_s']:>12.0f}")
+    return results
+
+
+def compare(results: dict, old_path: str):
+    old = json.loads(Path(old_path).read_text())
+    print(f"\nvs {old_path} ({old['meta']['scale']}, {old['meta']['git']}), median per op:")
+    for name, r in results.items():
+        before = old["results"].get(name)
+        if not before:
+            print(f"  {name:<36} new")
+            continue
+        change = 100 * (r["median_us"] - before["median_us"]) / before["median_us"]
+        print(f"  {name:<36} {before['median_us']:>10.1f}us -> {r['median_us']:>10.1f}us  {change:+6.1f}%")
+
+
+def _git_sha() -> str:
+    proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return proc.stdout.strip() if proc.returncode == 0 else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenClaw benchmark suite")
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per benchmark")
+    parser.add_argument("--sample", type=int, default=2000, help="Leads in the CPU benchmarks' sample")
+    parser.add_argument("--only", default="", help="Comma-separated benchmark names or group prefixes (db, ...)")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the synthetic database")
+    parser.add_argument("--out", default="", help="Write results as JSON")
+    parser.add_argument("--compare", default="", help="Earlier --out file to compare against")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+    only = [o.strip() for o in args.only.split(",") if o.strip()]
+    names = [n for n in BENCHMARKS if not only or any(n == o or n.startswith(f"{o}.") for o in only)]
+    if not names:
+        sys.exit(f"No benchmarks match --only {args.only} (see --list)")
+
+    rows = prepare(args.scale, args.seed, args.rebuild)
+    print(f"Scale {args.scale}: {', '.join(f'{n} {t}' for t, n in rows.items())}\n")
+    print(f"{'benchmark':<36} {'ops':>6} {'best us/op':>12} {'median us/op':>12} {'ops/s':>12}")
+    results = run(names, context(args.seed, args.sample), args.repeat)
+
+    report = {
+        "meta": {
+            "scale": args.scale, "seed": args.seed, "repeat": args.repeat, "sample": args.sample,
+            "rows": rows, "git": _git_sha(), "at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
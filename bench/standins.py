@@ -0,0 +1,750 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the services the agents talk to, so end-to-end runs work
+offline and give the same answers every time. Stdlib only.
+
+  PlacesServer  Places text search + details, replayed from fixtures
+  WebsiteFarm   saved websites by host, behind configurable latency
+  SmtpSink      takes any login and every message; can answer a share of
+                them (a reply, or a hard bounce) into the mailbox
+  ImapServer    one mailbox: EXAMINE, UID SEARCH / FETCH (BODYSTRUCTURE,
+                header fields, partial sections) and IDLE
+
+Fixtures live in one directory:
+  places/<query>.json   {"query", "category", "metro", "results": [...], "details": {place_id: {...}}}
+  sites/<host>.html     the page served for every path on that host
+
+`make-fixtures` synthesizes a set from bench/synth.py; `record` captures one
+from the live Places API and websites (needs GOOGLE_PLACES_API_KEY).
+`serve` runs everything and prints the environment that points openclaw at it.
+
+Usage:
+  python bench/standins.py make-fixtures --out /tmp/fixtures
+  python bench/standins.py record --category plumbing --metro "Denver, CO" --out /tmp/fixtures
+  python bench/standins.py serve --fixtures /tmp/fixtures --site-latency-ms 300
+"""
+
+import argparse
+import json
+import random
+import re
+import select
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email import message_from_bytes
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+PAGE_SIZE = 20  # Places text search results per page
+
+
+def query_key(query: str) -> str:
+    """Fixture file stem for a text search query."""
+    return re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")
+
+
+class _Stats:
+    """Request counters, safe to bump from handler threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def bump(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + amount
+
+
+# ---------------------------------------------------------------------------
+# HTTP: Places + website farm
+# ---------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _PlacesHandler(_Handler):
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if server.latency:
+            time.sleep(server.latency)
+        if url.path.endswith("/textsearch/json"):
+            server.stats.bump("search")
+            if "pagetoken" in params:
+                key, _, start = params["pagetoken"].rpartition(":")
+                start = int(start or 0)
+            else:
+                key, start = query_key(params.get("query", "")), 0
+            results = server.searches.get(key, [])
+            page = results[start:start + PAGE_SIZE]
+            body = {"status": "OK" if page else "ZERO_RESULTS", "results": page}
+            if start + PAGE_SIZE < len(results):
+                body["next_page_token"] = f"{key}:{start + PAGE_SIZE}"
+        elif url.path.endswith("/details/json"):
+            server.stats.bump("details")
+            detail = server.details.get(params.get("place_id", ""))
+            body = {"status": "OK", "result": detail} if detail else {"status": "NOT_FOUND"}
+        else:
+            self._send(404, "text/plain", b"not found")
+            return
+        self._send(200, "application/json", json.dumps(body).encode())
+
+
+class PlacesServer(ThreadingHTTPServer):
+    """Text search + place details from <fixtures>/places/*.json. Unknown queries get ZERO_RESULTS."""
+
+    daemon_threads = True
+
+    def __init__(self, fixtures: str, port: int = 0, latency_ms: float = 0):
+        self.searches, self.details = {}, {}
+        for path in sorted(Path(fixtures, "places").glob("*.json")):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.searches[query_key(data["query"])] = data["results"]
+            self.details.update(data.get("details", {}))
+        self.latency = latency_ms / 1000
+        self.stats = _Stats()
+        super().__init__(("127.0.0.1", port), _PlacesHandler)
+
+
+class _FarmHandler(_Handler):
+    def do_GET(self):
+        server = self.server
+        host = self.path.lstrip("/").split("/", 1)[0].split("?", 1)[0].lower()
+        time.sleep(server.delay())
+        page = server.sites / f"{host}.html"
+        if host and ".." not in host and page.is_file():
+            server.stats.bump("hit")
+            self._send(200, "text/html; charset=utf-8", page.read_bytes())
+        else:
+            server.stats.bump("miss")
+            self._send(404, "text/html", b"<html><body>Not found</body></html>")
+
+
+class WebsiteFarm(ThreadingHTTPServer):
+    """Serves <fixtures>/sites/<host>.html at /<host>/<any path>, each after latency +- jitter."""
+
+    daemon_threads = True
+
+    def __init__(self, fixtures: str, port: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 seed: int = 0):
+        self.sites = Path(fixtures, "sites")
+        self.latency, self.jitter = latency_ms / 1000, jitter_ms / 1000
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.stats = _Stats()
+        super().__init__(("127.0.0.1", port), _FarmHandler)
+
+    def delay(self) -> float:
+        with self._rng_lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+
+# ---------------------------------------------------------------------------
+# Mail: shared mailbox, SMTP sink, IMAP server
+# ---------------------------------------------------------------------------
+
+class Mailbox:
+    """The one IMAP mailbox: messages as (uid, internal date, raw bytes), in UID order."""
+
+    def __init__(self, uidvalidity: int = 1):
+        self.uidvalidity = uidvalidity
+        self.messages = []
+        self._next_uid = 1
+        self._changed = threading.Condition()
+
+    def append(self, raw: bytes, when: datetime = None) -> int:
+        with self._changed:
+            uid = self._next_uid
+            self._next_uid += 1
+            self.messages.append((uid, when or datetime.now(timezone.utc), raw))
+            self._changed.notify_all()
+            return uid
+
+    def snapshot(self) -> tuple[list, int]:
+        """(messages, next uid) as of now."""
+        with self._changed:
+            return list(self.messages), self._next_uid
+
+    def wait_for_more(self, count: int, timeout: float) -> bool:
+        """Block until there are more than `count` messages (True) or timeout (False)."""
+        with self._changed:
+            return self._changed.wait_for(lambda: len(self.messages) > count, timeout)
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def _read(self) -> str:
+        return self.rfile.readline(65536).decode("utf-8", "replace").rstrip("\r\n")
+
+    def handle(self):
+        server = self.server
+        server.stats.bump("connections")
+        self._reply("220 standin ESMTP ready")
+        mail_from, rcpts = "", []
+        while True:
+            line = self._read()
+            verb, _, arg = line.partition(" ")
+            verb = verb.upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-standin\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n250 HELP\r\n")
+            elif verb == "HELO":
+                self._reply("250 standin")
+            elif verb == "AUTH":
+                mech, _, initial = arg.partition(" ")
+                if mech.upper() == "LOGIN":
+                    for prompt in ("334 VXNlcm5hbWU6", "334 UGFzc3dvcmQ6"):
+                        self._reply(prompt)
+                        self._read()
+                elif not initial:
+                    self._reply("334 ")
+                    self._read()
+                server.stats.bump("logins")
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpts = _address(arg), []
+                self._reply("250 2.1.0 OK")
+            elif verb == "RCPT":
+                rcpts.append(_address(arg))
+                self._reply("250 2.1.5 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw or raw in (b".\r\n", b".\n"):
+                        break
+                    lines.append(raw[1:] if raw.startswith(b"..") else raw)
+                server.deliver(mail_from, rcpts, b"".join(lines))
+                self._reply("250 2.0.0 OK queued")
+                mail_from, rcpts = "", []
+            elif verb in ("RSET", "NOOP"):
+                if verb == "RSET":
+                    mail_from, rcpts = "", []
+                self._reply("250 2.0.0 OK")
+            elif verb == "QUIT":
+                self._reply("221 2.0.0 Bye")
+                return
+            elif not line:
+                return
+            else:
+                self._reply("502 5.5.2 Command not implemented")
+
+
+def _address(arg: str) -> str:
+    match = re.search(r"<([^>]*)>", arg)
+    return (match.group(1) if match else arg.split(":", 1)[-1]).strip().lower()
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    """
+    Accepts every message. With a mailbox, answers reply_rate of them with a
+    threaded reply from the recipient and bounce_rate with a hard-bounce DSN.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, mailbox: Mailbox = None, reply_rate: float = 0.0,
+                 bounce_rate: float = 0.0, latency_ms: float = 0, seed: int = 0):
+        from synth import Synth
+        self.mailbox = mailbox
+        self.reply_rate, self.bounce_rate = reply_rate, bounce_rate
+        self.latency = latency_ms / 1000
+        self.received = []
+        self.stats = _Stats()
+        self._synth = Synth(seed)
+        self._lock = threading.Lock()
+        super().__init__(("127.0.0.1", port), _SmtpHandler)
+
+    def deliver(self, mail_from: str, rcpts: list[str], data: bytes):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.received.append((mail_from, rcpts, data))
+            self.stats.bump("messages")
+            if self.mailbox is None:
+                return
+            roll = self._synth.rng.random()
+            if roll < self.bounce_rate:
+                answer = self._bounce(mail_from, rcpts[0] if rcpts else "", data)
+            elif roll < self.bounce_rate + self.reply_rate:
+                answer = self._answer(mail_from, rcpts[0] if rcpts else "", data)
+            else:
+                return
+        self.stats.bump("answered")
+        self.mailbox.append(answer)
+
+    def _answer(self, mail_from: str, rcpt: str, data: bytes) -> bytes:
+        original = message_from_bytes(data)
+        message_id = original.get("Message-ID", "")
+        body = self._synth.reply_text()
+        return (
+            f"From: {rcpt}\r\nTo: {mail_from}\r\nSubject: Re: {original.get('Subject', '')}\r\n"
+            f"Date: {format_datetime(datetime.now(timezone.utc))}\r\n"
+            f"Message-ID: <{self._synth.id()}@reply.standin.local>\r\n"
+            f"In-Reply-To: {message_id}\r\nReferences: {message_id}\r\n"
+            f"MIME-Version: 1.0\r\nContent-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Transfer-Encoding: 8bit\r\n\r\n{body}\r\n"
+        ).encode()
+
+    def _bounce(self, mail_from: str, rcpt: str, data: bytes) -> bytes:
+        headers = data.split(b"\r\n\r\n", 1)[0].decode("utf-8", "replace")
+        boundary = f"dsn-{self._synth.id()}"
+        return (
+            f"From: Mail Delivery Subsystem <mailer-daemon@standin.local>\r\nTo: {mail_from}\r\n"
+            f"Subject: Delivery Status Notification (Failure)\r\n"
+            f"Date: {format_datetime(datetime.now(timezone.utc))}\r\n"
+            f"Message-ID: <{self._synth.id()}@dsn.standin.local>\r\nMIME-Version: 1.0\r\n"
+            f'Content-Type: multipart/report; report-type=delivery-status; boundary="{boundary}"\r\n\r\n'
+            f"--{boundary}\r\nContent-Type: text/plain; charset=utf-8\r\n\r\n"
+            f"Delivery to {rcpt} failed permanently.\r\n\r\n"
+            f"--{boundary}\r\nContent-Type: message/delivery-status\r\n\r\n"
+            f"Reporting-MTA: dns; standin.local\r\n\r\n"
+            f"Final-Recipient: rfc822; {rcpt}\r\nAction: failed\r\nStatus: 5.1.1\r\n"
+            f"Diagnostic-Code: smtp; 550 5.1.1 User unknown\r\n\r\n"
+            f"--{boundary}\r\nContent-Type: text/rfc822-headers\r\n\r\n{headers}\r\n\r\n"
+            f"--{boundary}--\r\n"
+        ).encode()
+
+
+class _ImapHandler(socketserver.StreamRequestHandler):
+    def _send(self, data: bytes):
+        self.wfile.write(data)
+
+    def _line(self) -> bytes | None:
+        """One command, with any {n} literals inlined. None when the client has gone."""
+        line = self.rfile.readline(65536)
+        if not line:
+            return None
+        while True:
+            match = re.search(rb"\{(\d+)\}\r?\n$", line)
+            if not match:
+                return line.rstrip(b"\r\n")
+            self._send(b"+ go ahead\r\n")
+            literal = self.rfile.read(int(match.group(1)))
+            line = line[:match.start()] + b'"' + literal.replace(b'"', b'\\"') + b'"' + self.rfile.readline()
+
+    def handle(self):
+        self.server.stats.bump("connections")
+        self._send(b"* OK [CAPABILITY IMAP4rev1 IDLE] standin IMAP ready\r\n")
+        while True:
+            line = self._line()
+            if line is None:
+                return
+            tag, _, rest = line.decode("utf-8", "replace").partition(" ")
+            command, _, args = rest.partition(" ")
+            command = command.upper()
+            self.server.stats.bump(command.lower())
+            if command == "CAPABILITY":
+                self._send(f"* CAPABILITY IMAP4rev1 IDLE\r\n{tag} OK CAPABILITY completed\r\n".encode())
+            elif command in ("LOGIN", "AUTHENTICATE"):
+                self._send(f"{tag} OK LOGIN completed\r\n".encode())
+            elif command in ("SELECT", "EXAMINE"):
+                self._select(tag, command)
+            elif command == "UID":
+                sub, _, sub_args = args.partition(" ")
+                if sub.upper() == "SEARCH":
+                    self._search(tag, sub_args)
+                elif sub.upper() == "FETCH":
+                    self._fetch(tag, sub_args)
+                else:
+                    self._send(f"{tag} BAD UID {sub} not supported\r\n".encode())
+            elif command == "IDLE":
+                self._idle(tag)
+            elif command in ("NOOP", "CHECK", "CLOSE"):
+                messages, _ = self.server.mailbox.snapshot()
+                self._send(f"* {len(messages)} EXISTS\r\n{tag} OK {command} completed\r\n".encode())
+            elif command == "LOGOUT":
+                self._send(f"* BYE standin logging out\r\n{tag} OK LOGOUT completed\r\n".encode())
+                return
+            else:
+                self._send(f"{tag} BAD {command} not supported\r\n".encode())
+
+    def _select(self, tag: str, command: str):
+        mailbox = self.server.mailbox
+        messages, next_uid = mailbox.snapshot()
+        mode = "READ-ONLY" if command == "EXAMINE" else "READ-WRITE"
+        self._send((f"* {len(messages)} EXISTS\r\n* 0 RECENT\r\n"
+                    f"* OK [UIDVALIDITY {mailbox.uidvalidity}] UIDs valid\r\n"
+                    f"* OK [UIDNEXT {next_uid}] Predicted next UID\r\n"
+                    f"{tag} OK [{mode}] {command} completed\r\n").encode())
+
+    def _search(self, tag: str, criteria: str):
+        messages, _ = self.server.mailbox.snapshot()
+        words = criteria.split()
+        if len(words) >= 2 and words[0].upper() == "UID":
+            wanted = _uid_set(words[1], messages[-1][0] if messages else 0)
+            uids = [uid for uid, _, _ in messages if uid in wanted]
+        elif len(words) >= 2 and words[0].upper() == "SINCE":
+            since = datetime.strptime(words[1].strip('"'), "%d-%b-%Y").date()
+            uids = [uid for uid, when, _ in messages if when.date() >= since]
+        else:
+            uids = [uid for uid, _, _ in messages]
+        self._send(f"* SEARCH {' '.join(map(str, uids))}\r\n{tag} OK SEARCH completed\r\n".encode())
+
+    def _fetch(self, tag: str, args: str):
+        uid_spec, _, items = args.partition(" ")
+        messages, _ = self.server.mailbox.snapshot()
+        wanted = _uid_set(uid_spec, messages[-1][0] if messages else 0)
+        sections = re.findall(r"BODY(?:\.PEEK)?\[([^\]]*)\](?:<(\d+)\.(\d+)>)?", items, re.I)
+        out = []
+        for seq, (uid, _, raw) in enumerate(messages, 1):
+            if uid not in wanted:
+                continue
+            msg = message_from_bytes(raw)
+            parts = [f"UID {uid}".encode()]
+            if "BODYSTRUCTURE" in items.upper():
+                parts.append(b"BODYSTRUCTURE " + _bodystructure(msg).encode())
+            for section, start, length in sections:
+                data = _section_bytes(msg, raw, section)
+                key = f"BODY[{section}]"
+                if start:
+                    data = data[int(start):int(start) + int(length)]
+                    key += f"<{start}>"
+                parts.append(f"{key} {{{len(data)}}}\r\n".encode() + data)
+            out.append(f"* {seq} FETCH (".encode() + b" ".join(parts) + b")\r\n")
+        self._send(b"".join(out) + f"{tag} OK FETCH completed\r\n".encode())
+
+    def _idle(self, tag: str):
+        mailbox = self.server.mailbox
+        self._send(b"+ idling\r\n")
+        seen = len(mailbox.snapshot()[0])
+        while True:
+            if mailbox.wait_for_more(seen, timeout=0.2):
+                seen = len(mailbox.snapshot()[0])
+                self._send(f"* {seen} EXISTS\r\n".encode())
+            # The client sends nothing but DONE while idling, so nothing is left in rfile's buffer
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            if readable:
+                line = self.rfile.readline()
+                if not line or line.strip().upper() == b"DONE":
+                    break
+        self._send(f"{tag} OK IDLE terminated\r\n".encode())
+
+
+def _uid_set(spec: str, max_uid: int) -> set[int]:
+    """'1:3,7,9:*' -> {1, 2, 3, 7, 9, ..., max_uid}. n:* always includes max_uid, as on a real server."""
+    uids = set()
+    for piece in spec.split(","):
+        lo, _, hi = piece.partition(":")
+        lo = max_uid if lo == "*" else int(lo)
+        hi = lo if not hi else (max_uid if hi == "*" else int(hi))
+        uids.update(range(min(lo, hi), max(lo, hi) + 1))
+    return uids
+
+
+def _quote(value) -> str:
+    if value is None:
+        return "NIL"
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _body(part) -> bytes:
+    raw = part.as_bytes()
+    sep = raw.find(b"\n\n")
+    return raw[sep + 2:] if sep >= 0 else b""
+
+
+def _params(part, skip: tuple = ("boundary",)) -> str:
+    params = [(k, v) for k, v in (part.get_params() or [])[1:] if k.lower() not in skip]
+    if not params:
+        return "NIL"
+    return "(" + " ".join(f"{_quote(k)} {_quote(v)}" for k, v in params) + ")"
+
+
+def _bodystructure(part) -> str:
+    """BODYSTRUCTURE for a parsed message; message/* parts are treated as leaves."""
+    if part.is_multipart() and part.get_content_maintype() == "multipart":
+        children = "".join(_bodystructure(p) for p in part.get_payload())
+        return f"({children} {_quote(part.get_content_subtype())} {_params(part)})"
+    body = _body(part)
+    b_newline = b"\n"
+    encoding = str(part.get("Content-Transfer-Encoding", "7bit")).strip().lower()
+    fields = (f"{_quote(part.get_content_maintype())} {_quote(part.get_content_subtype())} "
+              f"{_params(part)} NIL NIL {_quote(encoding)} {len(body)}")
+    if part.get_content_maintype() == "text":
+        fields += f" {body.count(b_newline)}"
+    return f"({fields})"
+
+
+def _section_bytes(msg, raw: bytes, section: str) -> bytes:
+    """Bytes for BODY[section]: '', HEADER.FIELDS (...), or a part number like 1 / 2.1."""
+    if section == "":
+        return raw
+    if section.upper().startswith("HEADER.FIELDS"):
+        names = {n.lower() for n in re.findall(r"[\w-]+", section[len("HEADER.FIELDS"):])}
+        lines = [f"{k}: {v}\r\n" for k, v in msg.items() if k.lower() in names]
+        return ("".join(lines) + "\r\n").encode("utf-8", "replace")
+    part = msg
+    for index in section.split("."):
+        if part.is_multipart() and part.get_content_maintype() == "multipart":
+            payload = part.get_payload()
+            i = int(index) - 1
+            if not 0 <= i < len(payload):
+                return b""
+            part = payload[i]
+        elif index != "1":
+            return b""
+    return _body(part)
+
+
+class ImapServer(socketserver.ThreadingTCPServer):
+    """IMAP4rev1 subset over a Mailbox — what the reply checker and watcher use, nothing more."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, mailbox: Mailbox, port: int = 0):
+        self.mailbox = mailbox
+        self.stats = _Stats()
+        super().__init__(("127.0.0.1", port), _ImapHandler)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+_MODERN_PAGE = """<!DOCTYPE html><html><head><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{name}</title></head><body><h1>{name}</h1>
+<form action="/quote" method="post"><input name="phone"><button>Get a free quote</button></form>
+{filler}</body></html>"""
+# Past the qualifier's 40k "modern" threshold
+_MODERN_FILLER = "<p>" + "Licensed, bonded and insured. " * 1500 + "</p>"
+_WEAK_PAGE = """<html><head><title>{name}</title></head><body><h1>{name}</h1>
+<p>Call us for a quote. Serving the area since 1998.</p></body></html>"""
+
+
+def make_fixtures(out: str, seed: int = 0, metros: list[str] = None, per_query: int = 60,
+                  modern_share: float = 0.3) -> dict:
+    """Write Places searches for every category x metro, plus a saved site for each place with a website."""
+    from synth import Synth, CATEGORIES, METROS
+    from openclaw.agents.prospector import SEARCH_TERMS
+
+    synth = Synth(seed)
+    places_dir, sites_dir = Path(out, "places"), Path(out, "sites")
+    places_dir.mkdir(parents=True, exist_ok=True)
+    sites_dir.mkdir(parents=True, exist_ok=True)
+    counts = {"queries": 0, "places": 0, "sites": 0}
+    for metro in metros or METROS[:3]:
+        for category in CATEGORIES:
+            query = f"{SEARCH_TERMS[category]} in {metro}"
+            results, details = [], {}
+            for i in range(per_query):
+                lead = synth.lead()
+                # Names repeat across the synthetic vocabulary; suffix keeps them unique per metro
+                name = f"{lead['business_name']} #{i + 1}"
+                place_id = f"ChIJ{lead['id']}"
+                results.append({"place_id": place_id, "name": name, "rating": lead["rating"],
+                                "user_ratings_total": lead["review_count"],
+                                "formatted_address": f"{100 + i} Main St, {metro}"})
+                website = ""
+                if lead["has_website"]:
+                    host = f"{query_key(name)}-{lead['id'][:6]}.example.com"
+                    website = f"https://{host}/"
+                    if synth.rng.random() < modern_share:
+                        page = _MODERN_PAGE.format(name=name, filler=_MODERN_FILLER)
+                    else:
+                        page = _WEAK_PAGE.format(name=name)
+                    (sites_dir / f"{host}.html").write_text(page, encoding="utf-8")
+                    counts["sites"] += 1
+                review_time = datetime.strptime(lead["last_review_date"], "%Y-%m") + timedelta(days=10)
+                details[place_id] = {
+                    "formatted_phone_number": lead["phone"], "website": website, "url": lead["gbp_link"],
+                    "reviews": [{"author_name": lead["review_excerpt_author"], "text": lead["review_excerpt"],
+                                 "time": int(review_time.replace(tzinfo=timezone.utc).timestamp())}],
+                }
+            (places_dir / f"{query_key(query)}.json").write_text(
+                json.dumps({"query": query, "category": category, "metro": metro, "results": results,
+                            "details": details}), encoding="utf-8")
+            counts["queries"] += 1
+            counts["places"] += len(results)
+    return counts
+
+
+def record(out: str, category: str, metro: str, max_places: int = 60) -> dict:
+    """Capture one live text search (all pages), its place details and each place's homepage."""
+    import requests
+    from openclaw import config
+    from openclaw.agents.prospector import SEARCH_TERMS
+
+    config.require_places()
+    base = "https://maps.googleapis.com/maps/api/place"
+    query = f"{SEARCH_TERMS.get(category, category)} in {metro}"
+    params = {"query": query, "key": config.GOOGLE_PLACES_API_KEY}
+    results = []
+    while len(results) < max_places:
+        data = requests.get(f"{base}/textsearch/json", params=params, timeout=15).json()
+        results.extend(data.get("results", []))
+        if not data.get("next_page_token"):
+            break
+        time.sleep(2)
+        params = {"pagetoken": data["next_page_token"], "key": config.GOOGLE_PLACES_API_KEY}
+    results = results[:max_places]
+
+    sites_dir = Path(out, "sites")
+    sites_dir.mkdir(parents=True, exist_ok=True)
+    details, sites = {}, 0
+    for place in results:
+        detail = requests.get(f"{base}/details/json", timeout=10, params={
+            "place_id": place["place_id"], "fields": "formatted_phone_number,website,url,reviews",
+            "key": config.GOOGLE_PLACES_API_KEY,
+        }).json().get("result", {})
+        details[place["place_id"]] = detail
+        if detail.get("website"):
+            try:
+                resp = requests.get(detail["website"], timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+            except requests.RequestException:
+                continue
+            if resp.status_code == 200:
+                host = urlsplit(detail["website"]).netloc.lower()
+                (sites_dir / f"{host}.html").write_text(resp.text, encoding="utf-8")
+                sites += 1
+
+    places_dir = Path(out, "places")
+    places_dir.mkdir(parents=True, exist_ok=True)
+    (places_dir / f"{query_key(query)}.json").write_text(
+        json.dumps({"query": query, "category": category, "metro": metro, "results": results,
+                    "details": details}, indent=1), encoding="utf-8")
+    return {"query": query, "places": len(results), "sites": sites}
+
+
+# ---------------------------------------------------------------------------
+# Running them
+# ---------------------------------------------------------------------------
+
+class StandIns:
+    """All four servers on ephemeral (or given) ports, each on its own daemon thread."""
+
+    def __init__(self, fixtures: str, seed: int = 0, places_latency_ms: float = 0, site_latency_ms: float = 0,
+                 site_jitter_ms: float = 0, smtp_latency_ms: float = 0, reply_rate: float = 0.0,
+                 bounce_rate: float = 0.0, ports: dict = None):
+        ports = ports or {}
+        self.mailbox = Mailbox()
+        self.places = PlacesServer(fixtures, ports.get("places", 0), places_latency_ms)
+        self.farm = WebsiteFarm(fixtures, ports.get("sites", 0), site_latency_ms, site_jitter_ms, seed)
+        self.smtp = SmtpSink(ports.get("smtp", 0), self.mailbox, reply_rate, bounce_rate, smtp_latency_ms, seed)
+        self.imap = ImapServer(self.mailbox, ports.get("imap", 0))
+        self._servers = {"places": self.places, "sites": self.farm, "smtp": self.smtp, "imap": self.imap}
+
+    def start(self):
+        for name, server in self._servers.items():
+            threading.Thread(target=server.serve_forever, name=f"standin-{name}", daemon=True).start()
+        return self
+
+    def stop(self):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def env(self) -> dict:
+        """Environment that points openclaw at these servers."""
+        return standin_env({name: server.server_address[1] for name, server in self._servers.items()})
+
+    def stats(self) -> dict:
+        return {name: dict(server.stats.counts) for name, server in self._servers.items()}
+
+
+def free_ports() -> dict:
+    """A free port for each stand-in, so the environment can be set before openclaw is imported."""
+    import socket
+    socks, ports = [], {}
+    for name in ("places", "sites", "smtp", "imap"):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        socks.append(sock)
+        ports[name] = sock.getsockname()[1]
+    for sock in socks:
+        sock.close()
+    return ports
+
+
+def standin_env(port: dict) -> dict:
+    """Environment that points openclaw at stand-ins on these ports."""
+    return {
+        "GOOGLE_PLACES_API_KEY": "standin",
+        "PLACES_API_BASE": f"http://127.0.0.1:{port['places']}",
+        "PLACES_PAGE_DELAY": "0",
+        "WEBSITE_FARM_URL": f"http://127.0.0.1:{port['sites']}",
+        "SMTP_HOST": "127.0.0.1", "SMTP_PORT": str(port["smtp"]), "SMTP_SECURITY": "none",
+        "SMTP_USER": "bench@standin.local", "SMTP_PASS": "standin",
+        "FROM_EMAIL": "bench@standin.local", "FROM_NAME": "Bench Sender",
+        "IMAP_HOST": "127.0.0.1", "IMAP_PORT": str(port["imap"]), "IMAP_SECURITY": "none",
+        "IMAP_USER": "bench@standin.local", "IMAP_PASS": "standin",
+    }
+
+
+def main():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    parser = argparse.ArgumentParser(description="Local stand-ins for Places, websites, SMTP and IMAP")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("make-fixtures", help="Synthesize fixtures from bench/synth.py")
+    p.add_argument("--out", required=True)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--metros", type=int, default=3, help="How many synthetic metros (x every category)")
+    p.add_argument("--per-query", type=int, default=60)
+
+    p = sub.add_parser("record", help="Capture a live Places search, its details and websites")
+    p.add_argument("--out", required=True)
+    p.add_argument("--category", required=True)
+    p.add_argument("--metro", required=True)
+    p.add_argument("--max-places", type=int, default=60)
+
+    p = sub.add_parser("serve", help="Run all stand-ins until interrupted")
+    p.add_argument("--fixtures", required=True)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--places-port", type=int, default=8701)
+    p.add_argument("--sites-port", type=int, default=8702)
+    p.add_argument("--smtp-port", type=int, default=8725)
+    p.add_argument("--imap-port", type=int, default=8743)
+    p.add_argument("--places-latency-ms", type=float, default=0)
+    p.add_argument("--site-latency-ms", type=float, default=0)
+    p.add_argument("--site-jitter-ms", type=float, default=0)
+    p.add_argument("--smtp-latency-ms", type=float, default=0)
+    p.add_argument("--reply-rate", type=float, default=0.0, help="Share of sent mail answered with a reply")
+    p.add_argument("--bounce-rate", type=float, default=0.0, help="Share of sent mail answered with a bounce")
+    args = parser.parse_args()
+
+    if args.command == "make-fixtures":
+        from synth import METROS
+        print(make_fixtures(args.out, args.seed, METROS[:args.metros], args.per_query))
+    elif args.command == "record":
+        print(record(args.out, args.category, args.metro, args.max_places))
+    else:
+        standins = StandIns(
+            args.fixtures, args.seed, args.places_latency_ms, args.site_latency_ms, args.site_jitter_ms,
+            args.smtp_latency_ms, args.reply_rate, args.bounce_rate,
+            ports={"places": args.places_port, "sites": args.sites_port, "smtp": args.smtp_port,
+                   "imap": args.imap_port},
+        ).start()
+        print(f"Serving {len(standins.places.searches)} Places searches. Point openclaw here with:\n")
+        for key, value in standins.env().items():
+            print(f"export {key}={value!r}" if " " in value else f"export {key}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            standins.stop()
+
+
+if __name__ == "__main__":
+    main()
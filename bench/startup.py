@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark — regression guard for import-time work.
+
+Runs each command against a scratch database and reports wall time (best /
+median of --runs) next to a bare `python -c pass` baseline, plus the
+heaviest imports from `python -X importtime`. Exits 1 when a command's
+median is over --max-ms, so it can gate CI or a pre-release check.
+
+Usage:
+  python bench/startup.py                      # dashboard + queue, 100ms budget
+  python bench/startup.py approve jobs --runs 20 --max-ms 150
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = str(ROOT / "cli.py")
+
+
+def time_command(argv: list[str], env: dict, runs: int) -> list[float]:
+    """Wall-clock ms for each of `runs` executions."""
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(argv, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        times.append(1000 * (time.perf_counter() - t0))
+    return times
+
+
+def heaviest_imports(command: str, env: dict, top: int) -> list[tuple[str, float]]:
+    """Top-level imports by cumulative time (ms), from -X importtime."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", CLI, command], env=env, cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Unindented names are imported directly by the script (or site), not by another module
+        if not name.startswith("  "):
+            imports.append((name.strip(), int(cumulative) / 1000))
+    return sorted(imports, key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenClaw CLI startup benchmark")
+    parser.add_argument("commands", nargs="*", default=["dashboard", "queue"])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=100.0, help="Budget for each command's median")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list per command")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "OPENCLAW_DB_PATH": os.path.join(tmp, "bench.db"), "LOG_DIR": os.path.join(tmp, "logs")}
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        subprocess.run([sys.executable, CLI, "init-db"], env=env, cwd=ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        # Warm the bytecode cache so no timed run includes a compile
+        for command in args.commands:
+            time_command([sys.executable, CLI, command], env, 1)
+
+        baseline = statistics.median(time_command([sys.executable, "-c", "pass"], env, args.runs))
+        print(f"python -c pass: {baseline:.0f}ms median\n")
+        print(f"{'command':<14} {'best ms':>8} {'median ms':>10} {'over python':>12}  budget")
+        failed = []
+        for command in args.commands:
+            times = time_command([sys.executable, CLI, command], env, args.runs)
+            median = statistics.median(times)
+            ok = median <= args.max_ms
+            if not ok:
+                failed.append(command)
+            print(f"{command:<14} {min(times):>8.0f} {median:>10.0f} {median - baseline:>12.0f}  "
+                  f"{'ok' if ok else f'OVER {args.max_ms:.0f}ms'}")
+
+        for command in args.commands:
+            print(f"\nHeaviest imports for '{command}' (cumulative ms):")
+            for name, ms in heaviest_imports(command, env, args.top):
+                print(f"  {ms:>7.1f}  {name}")
+
+    if failed:
+        print(f"\nOver budget: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Synthetic data for benchmarks: leads, outreach drafts, replies and
+conversions shaped like what the prospector, outreach and reply checker
+write. Everything comes from one seeded RNG, so a given (leads, seed) always
+produces the same rows; dates are relative to today so review recency and
+stage timings look like a live pipeline.
+
+Leads are spread over the funnel (FUNNEL) and walked there one status at a
+time, so lead_events gets a real history through the same triggers the app
+uses.
+
+Usage (standalone, e.g. to poke at a big DB with the CLI):
+  OPENCLAW_DB_PATH=/tmp/synth.db python bench/synth.py --leads 100000 --seed 1
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from openclaw.agents.prospector import SEARCH_TERMS  # noqa: E402
+from openclaw.agents.qualifier import AVG_TICKET  # noqa: E402
+
+CATEGORIES = list(SEARCH_TERMS)
+
+METROS = [
+    "Denver, CO", "Austin, TX", "Phoenix, AZ", "Charlotte, NC", "Nashville, TN",
+    "Columbus, OH", "Portland, OR", "Tampa, FL", "Raleigh, NC", "Boise, ID",
+    "Kansas City, MO", "Salt Lake City, UT", "Sacramento, CA", "Richmond, VA",
+]
+
+# Final status, share of leads, statuses walked through after `new`
+FUNNEL = [
+    ("new", 0.30, []),
+    ("lost", 0.22, ["lost"]),
+    ("qualified", 0.14, ["qualified"]),
+    ("draft_ready", 0.08, ["qualified", "draft_ready"]),
+    ("approved", 0.04, ["qualified", "draft_ready", "approved"]),
+    ("sent", 0.14, ["qualified", "draft_ready", "approved", "sent"]),
+    ("replied", 0.05, ["qualified", "draft_ready", "approved", "sent", "replied"]),
+    ("won", 0.01, ["qualified", "draft_ready", "approved", "sent", "replied", "won"]),
+    ("paused", 0.02, ["qualified", "paused"]),
+]
+
+_NAME_PREFIX = ["Summit", "Apex", "Front Range", "Blue Ridge", "Cornerstone", "Evergreen", "Keystone",
+                "Lone Star", "Pioneer", "Red Rock", "Riverside", "Trusty", "Hometown", "Precision",
+                "All Pro", "Patriot", "Mountain View", "Sunrise", "Northside", "Capitol"]
+_NAME_TRADE = {
+    "plumbing": ["Plumbing", "Plumbing & Drain", "Rooter"],
+    "hvac": ["Heating & Air", "HVAC", "Comfort Systems"],
+    "electrical": ["Electric", "Electrical Services", "Electricians"],
+    "roofing": ["Roofing", "Roofing & Exteriors", "Roof Co"],
+    "landscaping": ["Landscaping", "Lawn & Landscape", "Outdoor Living"],
+    "arborists": ["Tree Service", "Tree Care", "Arbor Care"],
+    "carpentry": ["Carpentry", "Woodworks", "Finish Carpentry"],
+    "fence_deck": ["Fence & Deck", "Fence Co", "Decks"],
+    "junk_removal": ["Junk Removal", "Hauling", "Junk Haulers"],
+}
+_NAME_SUFFIX = ["", "", " LLC", " Inc", " Co", " & Sons", " Pros"]
+_FIRST = ["Mike", "Dave", "Chris", "Jose", "Tom", "Brian", "Kevin", "Luis", "Matt", "Steve",
+          "Sarah", "Jen", "Maria", "Amy", "Rachel", "Tony", "Dan", "Greg", "Eric", "Nate"]
+_LAST = ["Smith", "Johnson", "Garcia", "Miller", "Davis", "Martinez", "Wilson", "Anderson",
+         "Thomas", "Moore", "Jackson", "Lee", "Harris", "Clark", "Lewis", "Walker"]
+
+_EXCERPT_OPENERS = [
+    "Called them on a Sunday and they were out within two hours.",
+    "We got three quotes and these guys were the most honest by far.",
+    "Second time using them and just as good as the first.",
+    "The crew showed up on time and left the place clean.",
+    "Had an emergency leak at midnight and they picked up right away.",
+    "Fair price, quality work, and no upselling.",
+    "Very professional from the estimate to the final walkthrough.",
+]
+_EXCERPT_CLOSERS = [
+    "Highly recommend!", "Will definitely use again.", "Great experience overall.",
+    "Friendly and responsive the whole way through.", "Reliable, quick, and reasonably priced.",
+    "Couldn't be happier with the result.", "",
+]
+
+_REPLIES = {
+    "positive": ["Yes, this looks great. Call me tomorrow morning.", "Sounds good, let's talk this week.",
+                 "Love it! How do we get it live?", "I'm interested, tell me more.", "Go ahead and set it up."],
+    "negative": ["Not interested, please remove me from your list.", "No thanks.",
+                 "Please stop emailing me.", "Take me off your list.", "Not right now, we're booked out."],
+    "question": ["How much would this cost per month?", "What's included with the site?",
+                 "Do you host it too or is that on us?", "What do you charge for changes later?"],
+    "ooo": ["I am currently out of the office and will return Monday. For emergencies call the shop.",
+            "Automatic reply: I'm on vacation with limited access to email until next week."],
+    "other": ["Who is this?", "Got it.", "Forwarding to my partner who handles this.", "Thanks"],
+}
+_REPLY_MIX = [("positive", 0.35), ("question", 0.25), ("negative", 0.2), ("ooo", 0.1), ("other", 0.1)]
+
+
+class Synth:
+    """Seeded row factory. Lead dicts match what the prospector hands to insert_lead."""
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def id(self) -> str:
+        return f"{self.rng.getrandbits(48):012x}"
+
+    def lead(self) -> dict:
+        rng = self.rng
+        category = rng.choice(CATEGORIES)
+        business = (f"{rng.choice(_NAME_PREFIX)} {rng.choice(_NAME_TRADE[category])}"
+                    f"{rng.choice(_NAME_SUFFIX)}")
+        slug = "".join(ch for ch in business.lower() if ch.isalnum())
+        first = rng.choice(_FIRST)
+        has_website = rng.random() < 0.45
+        email = ""
+        if rng.random() < 0.7:
+            email = rng.choice([f"info@{slug}.com", f"{first.lower()}@{slug}.com", f"{slug}@gmail.com"])
+        review_date = (self.today - timedelta(days=int(rng.expovariate(1 / 60)))).strftime("%Y-%m")
+        created = self.today - timedelta(days=rng.uniform(0, 90))
+        return {
+            "id": self.id(),
+            "business_name": business,
+            "owner_name": first if rng.random() < 0.4 else "",
+            "email": email,
+            "phone": f"({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+            "category": category,
+            "metro": rng.choice(METROS),
+            "rating": round(min(5.0, max(2.5, rng.gauss(4.55, 0.35))), 1),
+            "review_count": max(1, int(rng.lognormvariate(3.4, 1.0))),
+            "has_website": has_website,
+            "website_url": f"https://www.{slug}.com" if has_website and rng.random() < 0.8 else "",
+            "gbp_link": f"https://maps.google.com/?cid={rng.getrandbits(60)}",
+            "source": "google_places",
+            "last_review_date": review_date,
+            "review_excerpt": self.excerpt(),
+            "review_excerpt_author": f"{rng.choice(_FIRST)} {rng.choice(_LAST)[0]}.",
+            "review_excerpt_date": review_date,
+            "lead_status": "new",
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+        }
+
+    def excerpt(self) -> str:
+        text = f"{self.rng.choice(_EXCERPT_OPENERS)} {self.rng.choice(_EXCERPT_CLOSERS)}".strip()
+        return text[:200]
+
+    def qualification(self, lead: dict) -> dict:
+        """The fields the qualifier writes, plus a preview URL for leads past qualification."""
+        tier = self.rng.choices("ABC", weights=(3, 5, 2))[0]
+        low, high = {"A": (80, 100), "B": (55, 79), "C": (30, 54)}[tier]
+        return {
+            "qualification_score": self.rng.randint(low, high),
+            "tier": tier,
+            "roi_estimate_monthly": (6 if not lead["has_website"] else 3) * AVG_TICKET[lead["category"]],
+            "review_themes": '["Fast response times", "Fair pricing"]',
+            # Most qualified leads have had their preview built by the time anyone looks
+            "preview_url": f"https://preview.example.com/preview/{lead['id']}/" if self.rng.random() < 0.8 else "",
+        }
+
+    def draft(self, lead: dict, followup: int, status: str, at: datetime) -> dict:
+        sent = status == "sent"
+        draft_id = self.id()
+        return {
+            "id": draft_id,
+            "lead_id": lead["id"],
+            "subject": f"Quick website preview for {lead['business_name']}" if followup == 0
+            else f"Following up — {lead['business_name']}",
+            "body": f"Hi {lead['owner_name'] or lead['business_name'].split()[0]},\n\n"
+                    f"I built a quick preview based on your services in {lead['metro']}.\n\n"
+                    f"https://preview.example.com/preview/{draft_id}/\n\n-- Sam",
+            "followup_number": followup,
+            "status": status,
+            "scheduled_for": at.isoformat() if status in ("approved", "sent") else "",
+            "sent_at": at.isoformat() if sent else "",
+            "message_id": f"<{draft_id}@openclaw.local>" if sent else "",
+            "sender_email": "sam@example.com" if sent else "",
+            "created_at": (at - timedelta(hours=2)).isoformat(),
+        }
+
+    def reply_text(self, reply_type: str = "") -> str:
+        reply_type = reply_type or self.reply_type()
+        text = self.rng.choice(_REPLIES[reply_type])
+        if reply_type != "ooo" and self.rng.random() < 0.6:
+            # Most clients quote the original message below the reply
+            text += ("\n\nOn Tue, Sam <sam@example.com> wrote:\n> Hi,\n> I built a quick preview "
+                     "based on your services.\n> Would you be open to that?\n> -- Sam")
+        return text
+
+    def reply_type(self) -> str:
+        types, weights = zip(*_REPLY_MIX)
+        return self.rng.choices(types, weights=weights)[0]
+
+    def reply(self, lead: dict, draft: dict, reply_type: str, at: datetime) -> dict:
+        return {
+            "id": self.id(),
+            "lead_id": lead["id"],
+            "from_email": lead["email"] or f"owner@{lead['id']}.example.com",
+            "subject": f"Re: {draft['subject']}",
+            "in_reply_to": draft["message_id"],
+            "raw_body": self.reply_text(reply_type),
+            "reply_type": reply_type,
+            "message_id": f"<r{self.id()}@mail.example.com>",
+            "created_at": at.isoformat(),
+        }
+
+    def plan(self) -> tuple[str, list[str]]:
+        """A final status and the statuses walked through to reach it."""
+        r, acc = self.rng.random(), 0.0
+        for status, share, path in FUNNEL:
+            acc += share
+            if r < acc:
+                return status, path
+        return FUNNEL[0][0], FUNNEL[0][2]
+
+
+# Qualifier / builder fields, so every lead row has the same columns
+_UNQUALIFIED = {"qualification_score": 0, "tier": "", "roi_estimate_monthly": 0, "review_themes": "[]",
+                "preview_url": ""}
+
+
+def _insert(db, table: str, rows: list[dict]):
+    if rows:
+        cols = list(rows[0])
+        db.executemany(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                       [[row[c] for c in cols] for row in rows])
+
+
+def populate(n_leads: int, seed: int = 0, batch: int = 10000) -> dict:
+    """Create the schema at config.DB_PATH and fill it with n_leads leads and their drafts/replies."""
+    from openclaw.persistence.database import get_db, init_db
+
+    init_db()
+    synth = Synth(seed)
+    counts = {"leads": 0, "drafts": 0, "replies": 0, "conversions": 0}
+    for start in range(0, n_leads, batch):
+        leads, steps, drafts, replies, conversions = [], [], [], [], []
+        for _ in range(min(batch, n_leads - start)):
+            lead = {**_UNQUALIFIED, **synth.lead()}
+            leads.append(lead)
+            final, path = synth.plan()
+            if path and path[0] != "lost":
+                lead.update(synth.qualification(lead))
+            at, reached = datetime.fromisoformat(lead["created_at"]), {}
+            for depth, status in enumerate(path):
+                at += timedelta(hours=synth.rng.expovariate(1 / 30))
+                reached[status] = at
+                steps.append((depth, status, at.isoformat(), lead["id"]))
+            if "draft_ready" in reached:
+                status = {"draft_ready": "draft", "approved": "approved"}.get(final, "sent")
+                first = synth.draft(lead, 0, status, reached.get("sent") or reached.get("approved")
+                                    or reached["draft_ready"])
+                drafts.append(first)
+                if final == "sent" and synth.rng.random() < 0.5:
+                    drafts.append(synth.draft(lead, 1, "sent", reached["sent"] + timedelta(days=3)))
+                if final == "sent" and synth.rng.random() < 0.1:
+                    # Auto-replies don't move the lead
+                    replies.append(synth.reply(lead, first, "ooo", reached["sent"] + timedelta(hours=1)))
+            if "replied" in reached:
+                reply_type = "positive" if final == "won" else synth.reply_type()
+                replies.append(synth.reply(lead, first, reply_type, reached["replied"]))
+            if "won" in reached:
+                conversions.append({"id": synth.id(), "lead_id": lead["id"], "status": "won",
+                                    "deal_value": float(synth.rng.choice([1500, 2500, 3500, 5000])),
+                                    "created_at": reached["won"].isoformat()})
+
+        with get_db() as db:
+            db.execute("PRAGMA synchronous=OFF")
+            _insert(db, "leads", leads)
+            # One pass per depth so each lead's lead_events rows land in order
+            for depth in range(max((s[0] for s in steps), default=-1) + 1):
+                db.executemany("UPDATE leads SET lead_status=?, updated_at=? WHERE id=?",
+                               [s[1:] for s in steps if s[0] == depth])
+            _insert(db, "outreach_drafts", drafts)
+            _insert(db, "replies", replies)
+            _insert(db, "conversions", conversions)
+        counts["leads"] += len(leads)
+        counts["drafts"] += len(drafts)
+        counts["replies"] += len(replies)
+        counts["conversions"] += len(conversions)
+    return counts
+
+
+def main():
+    import argparse
+    import time
+
+    from openclaw import config
+
+    parser = argparse.ArgumentParser(description="Fill OPENCLAW_DB_PATH with synthetic leads")
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if Path(config.DB_PATH).exists():
+        sys.exit(f"{config.DB_PATH} already exists; point OPENCLAW_DB_PATH at a new file")
+    t0 = time.perf_counter()
+    counts = populate(args.leads, args.seed)
+    print(f"{counts} in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,18 +7,36 @@ Commands:
   qualify                          Score all new leads
   build                            Generate preview sites for qualified leads
   draft                            Generate outreach drafts for leads with previews
+  cadence                          Draft due follow-ups for sent leads with no reply
   queue                            List drafts awaiting approval
   approve <draft_id>               Approve a draft for sending
+  approve --tier A --min-score 70 [--metro X] [--followup N] [--all] [--dry-run]
+                                   Approve every draft matching the filters at once
   send-approved [--limit N]        Send approved drafts (default limit: 25)
+  send-scheduler [--once]          Long-running: send approved drafts in metro business hours
+  worker --kinds qualify,build [--once]
+                                   Long-running: run queued per-lead jobs (several may share the DB)
+  enqueue <kind> [--lead-id ID | --category X --metro Y]
+                                   Queue jobs: prospect, or a stage's backlog (qualify/build/draft)
+  jobs                             Show job queue counts
+  events [--since SEQ | --consumer NAME] [--limit N]
+                                   Show lead status changes (a consumer resumes from its checkpoint)
   check-replies                    Poll inbox for replies
+  watch-replies                    Long-running: IMAP IDLE, process replies as they arrive
   replies                          Show leads that replied (need human action)
   boost <lead_id>                  Re-generate a shorter draft for a lead
   pause <lead_id>                  Pause a lead (skip in pipeline)
   unpause <lead_id>                Unpause a lead
   dashboard                        Show funnel stats
+  runs [--agent X] [--limit N]     Show recent agent runs with timings
   smoke-test                       Validate pipeline end-to-end (no real sends)
   serve [--port N]                 Start preview server (default: 8111)
-  run-daily --category X --metro Y Full daily cycle
+  run-daily --category X --metro Y Full daily cycle (incl. follow-up cadence)
+
+Global options (before the command):
+  --profile cprofile|sample        Write a profile to PROFILE_DIR and print the top functions
+  --profile-sql                    Time every SQL statement; report slowest / most frequent
+  --profile-top N                  Rows per summary (default: 20)
 """
 
 import sys
@@ -31,6 +49,11 @@ def main():
     setup_logging()
 
     parser = argparse.ArgumentParser(description="OpenClaw Phase 1 CLI")
+    parser.add_argument("--profile", choices=["cprofile", "sample"], default="",
+                        help="Profile the command: cprofile (main thread) or sample (all threads)")
+    parser.add_argument("--profile-sql", action="store_true",
+                        help="Time every SQL statement and report the slowest / most frequent")
+    parser.add_argument("--profile-top", type=int, default=20, help="Rows in each profile summary")
     sub = parser.add_subparsers(dest="command")
 
     # init-db
@@ -50,20 +73,57 @@ def main():
     # draft
     sub.add_parser("draft")
 
+    # cadence
+    sub.add_parser("cadence")
+
     # queue
     sub.add_parser("queue")
 
     # approve
     p = sub.add_parser("approve")
-    p.add_argument("draft_id")
+    p.add_argument("draft_id", nargs="?")
+    p.add_argument("--tier", default="")
+    p.add_argument("--min-score", type=int, default=None)
+    p.add_argument("--metro", default="")
+    p.add_argument("--followup", type=int, default=None)
+    p.add_argument("--all", action="store_true", help="Approve every draft in the queue")
+    p.add_argument("--dry-run", action="store_true", help="List matching drafts without approving")
 
     # send-approved
     p = sub.add_parser("send-approved")
     p.add_argument("--limit", type=int, default=25)
 
+    # send-scheduler
+    p = sub.add_parser("send-scheduler")
+    p.add_argument("--once", action="store_true", help="Plan and send one pass, then exit")
+
+    # worker
+    p = sub.add_parser("worker")
+    p.add_argument("--kinds", default="qualify,build,draft", help="Comma-separated job kinds to run")
+    p.add_argument("--once", action="store_true", help="Exit when no job is due")
+
+    # enqueue
+    p = sub.add_parser("enqueue")
+    p.add_argument("kind", choices=["prospect", "qualify", "build", "draft"])
+    p.add_argument("--lead-id", default="")
+    p.add_argument("--category", default="")
+    p.add_argument("--metro", default="")
+
+    # jobs
+    sub.add_parser("jobs")
+
+    # events
+    p = sub.add_parser("events")
+    p.add_argument("--since", type=int, default=None, help="Show changes after this seq")
+    p.add_argument("--consumer", default="", help="Resume from, and advance, this checkpoint")
+    p.add_argument("--limit", type=int, default=50)
+
     # check-replies
     sub.add_parser("check-replies")
 
+    # watch-replies
+    sub.add_parser("watch-replies")
+
     # replies
     sub.add_parser("replies")
 
@@ -82,6 +142,11 @@ def main():
     # dashboard
     sub.add_parser("dashboard")
 
+    # runs
+    p = sub.add_parser("runs")
+    p.add_argument("--agent", default="")
+    p.add_argument("--limit", type=int, default=20)
+
     # smoke-test
     sub.add_parser("smoke-test")
 
@@ -100,6 +165,15 @@ def main():
         parser.print_help()
         return
 
+    if not args.profile and not args.profile_sql:
+        _dispatch(args)
+        return
+    from openclaw.observability.profiling import profile_command
+    with profile_command(args.command, args.profile, args.profile_sql, args.profile_top):
+        _dispatch(args)
+
+
+def _dispatch(args):
     # ---------------------------------------------------------------
     # Dispatch
     # ---------------------------------------------------------------
@@ -128,6 +202,11 @@ def main():
         result = OutreachAgent().run()
         _print_result("Outreach", result)
 
+    elif args.command == "cadence":
+        from openclaw.agents.cadence import CadenceAgent
+        result = CadenceAgent().run()
+        _print_result("Cadence", result)
+
     elif args.command == "queue":
         from openclaw.persistence.database import get_drafts_by_status
         drafts = get_drafts_by_status("draft")
@@ -142,7 +221,7 @@ def main():
         print("Use: python cli.py approve <draft_id>\n")
 
     elif args.command == "approve":
-        _cmd_approve(args.draft_id)
+        _cmd_approve(args)
 
     elif args.command == "send-approved":
         from openclaw.execution.email_sender import send_approved
@@ -151,6 +230,71 @@ def main():
             print(f"Error: {result['error']}")
         else:
             print(f"Sent: {result['sent']}  Failed: {result['failed']}  Total: {result['total']}")
+            if result.get("retrying"):
+                print(f"Retrying later: {result['retrying']} (transient errors, backed off)")
+            if result.get("deferred"):
+                print(f"Deferred: {result['deferred']} (sender quotas reached)")
+            if result.get("suppressed"):
+                print(f"Cancelled: {result['suppressed']} (do-not-contact list)")
+            for sender, n in result.get("by_sender", {}).items():
+                print(f"  {sender:<36} {n}")
+
+    elif args.command == "send-scheduler":
+        from openclaw.execution.send_scheduler import run_scheduler
+        result = run_scheduler(once=args.once)
+        if result.get("error"):
+            print(f"Error: {result['error']}")
+        else:
+            print(f"Planned: {result['planned']}  Sent: {result['sent']}  "
+                  f"Failed: {result['failed']}  Retrying: {result['retrying']}")
+
+    elif args.command == "worker":
+        from openclaw.execution.worker import run_worker
+        kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+        result = run_worker(kinds, once=args.once)
+        if result.get("error"):
+            print(f"Error: {result['error']}")
+        else:
+            print(f"Done: {result['done']}  Retrying: {result['retrying']}  Failed: {result['failed']}")
+
+    elif args.command == "enqueue":
+        from openclaw.execution.worker import enqueue
+        try:
+            n = enqueue(args.kind, lead_id=args.lead_id, category=args.category, metro=args.metro)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        print(f"Queued {n} {args.kind} job(s).")
+
+    elif args.command == "jobs":
+        from openclaw.persistence.database import count_jobs_by_status
+        counts = count_jobs_by_status()
+        if not counts:
+            print("\nNo jobs.\n")
+            return
+        print(f"\n{'Kind':<10} {'Queued':>7} {'Running':>8} {'Done':>7} {'Failed':>7}")
+        print("-" * 42)
+        for kind, c in sorted(counts.items()):
+            print(f"{kind:<10} {c.get('queued', 0):>7} {c.get('running', 0):>8} "
+                  f"{c.get('done', 0):>7} {c.get('failed', 0):>7}")
+        print()
+
+    elif args.command == "events":
+        from openclaw.persistence.database import events_since, get_checkpoint, save_checkpoint
+        since = args.since if args.since is not None else (get_checkpoint(args.consumer) if args.consumer else 0)
+        events = events_since(since, limit=args.limit)
+        if not events:
+            print(f"\nNo status changes after seq {since}.\n")
+            return
+        print(f"\n{'Seq':>7}  {'When':<19}  {'Lead':<12}  Change")
+        print("-" * 64)
+        for e in events:
+            print(f"{e['seq']:>7}  {e['created_at'][:19]:<19}  {e['lead_id']:<12}  "
+                  f"{e['from_status'] or '-'} -> {e['to_status']}")
+        if args.consumer:
+            save_checkpoint(args.consumer, events[-1]["seq"])
+            print(f"\nCheckpoint '{args.consumer}' at seq {events[-1]['seq']}")
+        print()
 
     elif args.command == "check-replies":
         from openclaw.execution.reply_checker import check_replies
@@ -158,7 +302,18 @@ def main():
         if result.get("error"):
             print(f"Error: {result['error']}")
         else:
-            print(f"Found {result['found']} new replies. (skipped {result.get('skipped', 0)} unmatched)")
+            print(f"Found {result['found']} new replies. (skipped {result.get('skipped', 0)} unmatched, "
+                  f"{result.get('duplicates', 0)} already recorded)")
+            if result.get("bounced"):
+                print(f"Suppressed {result['bounced']} hard-bounced addresses.")
+
+    elif args.command == "watch-replies":
+        from openclaw.execution.reply_checker import watch_replies
+        result = watch_replies()
+        if result.get("error"):
+            print(f"Error: {result['error']}")
+        else:
+            print(f"Found {result['found']} new replies while watching. (skipped {result['skipped']} unmatched)")
 
     elif args.command == "replies":
         from openclaw.persistence.database import get_replies
@@ -183,19 +338,41 @@ def main():
         _print_result("Boost", result)
 
     elif args.command == "pause":
-        from openclaw.persistence.database import update_lead
-        update_lead(args.lead_id, manual_override=True, lead_status="paused")
-        print(f"Paused lead {args.lead_id}")
+        from openclaw.persistence.database import get_lead, transition_lead
+        if transition_lead(args.lead_id, None, "paused", manual_override=True):
+            print(f"Paused lead {args.lead_id}")
+        else:
+            lead = get_lead(args.lead_id)
+            print(f"Cannot pause lead {args.lead_id} ({lead['lead_status'] if lead else 'not found'})")
 
     elif args.command == "unpause":
-        from openclaw.persistence.database import update_lead
-        update_lead(args.lead_id, manual_override=False, lead_status="qualified")
-        print(f"Unpaused lead {args.lead_id}")
+        from openclaw.persistence.database import get_lead, transition_lead
+        if transition_lead(args.lead_id, ["paused"], "qualified", manual_override=False):
+            print(f"Unpaused lead {args.lead_id}")
+        else:
+            lead = get_lead(args.lead_id)
+            print(f"Lead {args.lead_id} is not paused ({lead['lead_status'] if lead else 'not found'})")
 
     elif args.command == "dashboard":
         from openclaw.observability.dashboard import print_dashboard
         print_dashboard()
 
+    elif args.command == "runs":
+        from openclaw.persistence.database import get_agent_runs
+        runs = get_agent_runs(args.agent, args.limit)
+        if not runs:
+            print("\nNo agent runs recorded.\n")
+            return
+        print(f"\n{'Started':<19}  {'Agent':<11} {'OK':<3} {'Wall s':>8} {'CPU s':>7}  Slowest span")
+        print("-" * 80)
+        for r in runs:
+            slowest = max(r["spans"].items(), key=lambda kv: kv[1]["total_s"], default=None)
+            span = f"{slowest[0]} {slowest[1]['total_s']}s (p95 {slowest[1]['p95_ms']}ms)" if slowest else ""
+            cpu = "-" if r["cpu_s"] is None else r["cpu_s"]
+            print(f"{r['started_at'][:19]:<19}  {r['agent']:<11} {'y' if r['ok'] else 'n':<3} "
+                  f"{r['wall_s']:>8} {cpu:>7}  {span}")
+        print()
+
     elif args.command == "smoke-test":
         _cmd_smoke_test()
 
@@ -213,25 +390,43 @@ def main():
         _run_daily(args.category, args.metro)
 
     else:
-        parser.print_help()
+        print(f"Unknown command: {args.command}")
 
 
 # -------------------------------------------------------------------
 # approve — only drafts with status "draft"
 # -------------------------------------------------------------------
 
-def _cmd_approve(draft_id: str):
-    from openclaw.persistence.database import get_draft, update_draft, update_lead
-    draft = get_draft(draft_id)
-    if not draft:
-        print(f"Draft {draft_id} not found.")
+def _cmd_approve(args):
+    from openclaw.persistence.database import get_draft, approve_drafts
+    filters = {"tier": args.tier, "min_score": args.min_score,
+               "metro": args.metro, "followup": args.followup}
+    has_filter = any(v not in ("", None) for v in filters.values())
+
+    if args.draft_id:
+        draft = get_draft(args.draft_id)
+        if not draft:
+            print(f"Draft {args.draft_id} not found.")
+            return
+        if draft["status"] != "draft":
+            print(f"Cannot approve: draft {args.draft_id} has status '{draft['status']}' (must be 'draft').")
+            return
+    elif not (has_filter or args.all):
+        print("Give a draft_id, at least one filter (--tier/--min-score/--metro/--followup), or --all.")
         return
-    if draft["status"] != "draft":
-        print(f"Cannot approve: draft {draft_id} has status '{draft['status']}' (must be 'draft').")
+
+    drafts = approve_drafts([args.draft_id] if args.draft_id else None, dry_run=args.dry_run, **filters)
+    if args.draft_id and len(drafts) == 1 and not args.dry_run:
+        print(f"Approved: {drafts[0]['subject']} -> {drafts[0].get('email') or 'N/A'}")
         return
-    update_draft(draft_id, status="approved", error="")
-    update_lead(draft["lead_id"], lead_status="approved")
-    print(f"Approved: {draft['subject']} -> {draft.get('email', 'N/A')}")
+
+    for d in drafts:
+        print(f"  {d['id']:<14} {d['business_name'][:28]:<30} {d['tier'] or '-':<4} "
+              f"{d['qualification_score']:>3}  #{d['followup_number']}  {(d['email'] or 'N/A')[:30]}")
+    if args.dry_run:
+        print(f"\n{len(drafts)} drafts would be approved (dry run).")
+    else:
+        print(f"\nApproved {len(drafts)} drafts.")
 
 
 # -------------------------------------------------------------------
@@ -373,28 +568,18 @@ def _cmd_smoke_test():
 # -------------------------------------------------------------------
 
 def _run_daily(category: str, metro: str):
-    """Full daily cycle: prospect -> qualify -> build -> draft."""
+    """Full daily cycle: prospect -> qualify -> build -> draft -> follow-ups."""
     print("\n=== OPENCLAW DAILY RUN ===\n")
 
-    print("[1/4] Prospecting...")
-    from openclaw.agents.prospector import ProspectorAgent
-    r = ProspectorAgent().run(category=category, metro=metro)
-    _print_result("Prospector", r)
+    print("[1/2] Prospect -> qualify -> build -> draft (streaming)...")
+    from openclaw.pipeline import run_daily, format_summary
+    summary = run_daily(category, metro)
+    print(format_summary(summary))
 
-    print("[2/4] Qualifying...")
-    from openclaw.agents.qualifier import QualifierAgent
-    r = QualifierAgent().run()
-    _print_result("Qualifier", r)
-
-    print("[3/4] Building previews...")
-    from openclaw.agents.builder import BuilderAgent
-    r = BuilderAgent().run()
-    _print_result("Builder", r)
-
-    print("[4/4] Generating outreach drafts...")
-    from openclaw.agents.outreach import OutreachAgent
-    r = OutreachAgent().run()
-    _print_result("Outreach", r)
+    print("\n[2/2] Drafting due follow-ups...")
+    from openclaw.agents.cadence import CadenceAgent
+    r = CadenceAgent().run()
+    _print_result("Cadence", r)
 
     print("\n=== DAILY RUN COMPLETE ===")
     print("Next: python cli.py queue")
@@ -408,6 +593,11 @@ def _print_result(agent: str, result: dict):
         print(f"  {agent}: {r}")
     else:
         print(f"  {agent} ERROR: {result.get('error', 'unknown')}")
+    timing = result.get("timing")
+    if timing:
+        print(f"    {timing['wall_s']}s wall, {timing['cpu_s']}s cpu")
+        for name, s in sorted(timing["spans"].items(), key=lambda kv: -kv[1]["total_s"]):
+            print(f"    {name:<20} n={s['count']:<6} total {s['total_s']:>8}s  p95 {s['p95_ms']:>8}ms")
 
 
 if __name__ == "__main__":
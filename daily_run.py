@@ -31,25 +31,15 @@ def main():
     # Ensure DB exists
     init_db()
 
-    # Step 1: Prospect
-    from openclaw.agents.prospector import ProspectorAgent
-    r = ProspectorAgent().run(category=args.category, metro=args.metro)
-    log.info("Prospect: %s", r.get("result", r.get("error")))
-
-    # Step 2: Qualify
-    from openclaw.agents.qualifier import QualifierAgent
-    r = QualifierAgent().run()
-    log.info("Qualify: %s", r.get("result", r.get("error")))
-
-    # Step 3: Build previews
-    from openclaw.agents.builder import BuilderAgent
-    r = BuilderAgent().run()
-    log.info("Build: %s", r.get("result", r.get("error")))
-
-    # Step 4: Generate outreach drafts
-    from openclaw.agents.outreach import OutreachAgent
-    r = OutreachAgent().run()
-    log.info("Draft: %s", r.get("result", r.get("error")))
+    # Steps 1-4: prospect -> qualify -> build -> draft, streamed
+    from openclaw.pipeline import run_daily, format_summary
+    summary = run_daily(args.category, args.metro)
+    log.info("Pipeline:\n%s", format_summary(summary))
+
+    # Step 5: Follow-ups for sent leads that went quiet
+    from openclaw.agents.cadence import CadenceAgent
+    r = CadenceAgent().run()
+    log.info("Cadence: %s", r.get("result", r.get("error")))
 
     log.info("=== Daily run complete. Review queue: python cli.py queue ===")
 
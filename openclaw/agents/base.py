@@ -1,10 +1,27 @@
 """
-Base agent. Minimal: logging + error wrapping.
+Base agent. Minimal: logging + error wrapping + timing.
+
+run() measures wall and CPU time; inside an agent, `with self.span("name")`
+times one step (a Places call, a website check, a render). Spans are
+aggregated per name (count / total / p95) and returned under "timing" with
+the result. Each run is also saved to agent_runs for trend analysis.
+
+Log records inside run() carry agent and run_id; per-lead work wraps itself
+in `with self.lead_context(lead_id)` to add lead_id.
 """
 
+import json
 import logging
+import math
+import threading
+import time
 import traceback
+import uuid
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+
+from openclaw.observability.logging_setup import log_context
 
 
 class BaseAgent(ABC):
@@ -12,17 +29,85 @@ class BaseAgent(ABC):
 
     def __init__(self):
         self.log = logging.getLogger(f"openclaw.{self.name}")
+        self._spans = {}
+        self._spans_lock = threading.Lock()
 
     def run(self, **kwargs) -> dict:
+        run_id = uuid.uuid4().hex[:12]
+        with log_context(agent=self.name, run_id=run_id):
+            return self._run(run_id, **kwargs)
+
+    def _run(self, run_id: str, **kwargs) -> dict:
         self.log.info("[%s] starting", self.name)
+        self.reset_spans()
+        started_at = datetime.utcnow().isoformat()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
         try:
             result = self.execute(**kwargs)
-            self.log.info("[%s] done", self.name)
-            return {"ok": True, "result": result}
+            out = {"ok": True, "result": result}
         except Exception as e:
             self.log.error("[%s] failed: %s\n%s", self.name, e, traceback.format_exc())
-            return {"ok": False, "error": str(e)}
+            out = {"ok": False, "error": str(e)}
+        out["timing"] = {
+            "wall_s": round(time.perf_counter() - wall0, 3),
+            "cpu_s": round(time.process_time() - cpu0, 3),
+            "spans": self.span_stats(),
+        }
+        self.log.info("[%s] %s in %.2fs (cpu %.2fs)", self.name, "done" if out["ok"] else "failed",
+                      out["timing"]["wall_s"], out["timing"]["cpu_s"])
+        self.save_run(started_at, out, run_id)
+        return out
 
     @abstractmethod
     def execute(self, **kwargs):
         ...
+
+    def lead_context(self, lead_id: str):
+        """Tag log records inside the block with this agent and lead."""
+        return log_context(agent=self.name, lead_id=lead_id)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block under `name`. Safe to use from several threads."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._spans_lock:
+                self._spans.setdefault(name, []).append(elapsed)
+
+    def span_stats(self) -> dict:
+        """{span: {"count", "total_s", "p95_ms"}} for spans recorded since the last reset."""
+        with self._spans_lock:
+            spans = {name: sorted(durations) for name, durations in self._spans.items()}
+        return {
+            name: {
+                "count": len(d),
+                "total_s": round(sum(d), 3),
+                "p95_ms": round(1000 * d[max(0, math.ceil(0.95 * len(d)) - 1)], 1),
+            }
+            for name, d in spans.items()
+        }
+
+    def reset_spans(self):
+        with self._spans_lock:
+            self._spans = {}
+
+    def save_run(self, started_at: str, out: dict, run_id: str = ""):
+        """Store one run in agent_runs. Never lets bookkeeping fail the run."""
+        from openclaw.persistence.database import insert_agent_run
+        try:
+            insert_agent_run({
+                "id": run_id or uuid.uuid4().hex[:12],
+                "agent": self.name,
+                "started_at": started_at,
+                "wall_s": out["timing"]["wall_s"],
+                "cpu_s": out["timing"]["cpu_s"],
+                "ok": int(out["ok"]),
+                "error": out.get("error", ""),
+                "result": json.dumps(out.get("result"), default=str),
+                "spans": json.dumps(out["timing"]["spans"]),
+            })
+        except Exception as e:
+            self.log.warning("[%s] could not record run: %s", self.name, e)
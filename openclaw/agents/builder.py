@@ -31,41 +31,56 @@ COLORS = {
 class BuilderAgent(BaseAgent):
     name = "builder"
 
+    def __init__(self):
+        super().__init__()
+        self._creative = None
+
     def execute(self, lead_id: str = "", copy_package: dict = None, **kw) -> dict:
         if lead_id:
             leads = [l for l in [get_lead(lead_id)] if l]
         else:
             leads = get_leads_by_status("qualified")
 
-        creative = CreativeAgent()
         built = 0
         errors = 0
         for lead in leads:
             try:
-                if copy_package and lead_id:
-                    pkg = copy_package
-                else:
-                    pkg = creative._generate(lead)
-
-                html = self._render(lead, pkg)
-                slug = self._make_slug(lead["business_name"])
-
-                # Write to docs/preview/<slug>/index.html (GitHub Pages serves from /docs)
-                slug_dir = Path(config.PREVIEW_DIR) / "preview" / slug
-                slug_dir.mkdir(parents=True, exist_ok=True)
-                path = slug_dir / "index.html"
-                path.write_text(html, encoding="utf-8")
-
-                preview_url = f"{config.PREVIEW_HOST}/preview/{slug}/"
-                update_lead(lead["id"], preview_url=preview_url, preview_path=str(path))
+                self.build_lead(lead, copy_package if lead_id else None)
                 built += 1
-                self.log.info("  Built: %s -> %s", lead["business_name"], path)
             except Exception as e:
                 self.log.error("  Error building preview for %s: %s", lead.get("business_name", "?"), e)
                 errors += 1
 
         return {"built": built, "errors": errors}
 
+    def build_lead(self, lead: dict, copy_package: dict = None) -> dict:
+        """Render and write one preview site. Returns the lead with preview_url/preview_path set."""
+        with self.lead_context(lead["id"]):
+            return self._build(lead, copy_package)
+
+    def _build(self, lead: dict, copy_package: dict = None) -> dict:
+        if self._creative is None:
+            self._creative = CreativeAgent()
+        with self.span("copy"):
+            pkg = copy_package or self._creative._generate(lead)
+
+        with self.span("render"):
+            html = self._render(lead, pkg)
+        slug = self._make_slug(lead["business_name"])
+
+        # Write to docs/preview/<slug>/index.html (GitHub Pages serves from /docs)
+        slug_dir = Path(config.PREVIEW_DIR) / "preview" / slug
+        path = slug_dir / "index.html"
+        with self.span("write_preview"):
+            slug_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(html, encoding="utf-8")
+
+        preview_url = f"{config.PREVIEW_HOST}/preview/{slug}/"
+        with self.span("save"):
+            update_lead(lead["id"], preview_url=preview_url, preview_path=str(path))
+        self.log.info("  Built: %s -> %s", lead["business_name"], path)
+        return {**lead, "preview_url": preview_url, "preview_path": str(path)}
+
     def _render(self, lead: dict, pkg: dict) -> str:
         biz = html_mod.escape(lead["business_name"])
         phone = lead.get("phone", "")
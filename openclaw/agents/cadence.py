@@ -0,0 +1,63 @@
+"""
+Cadence — drafts the next follow-up for sent leads that went quiet.
+
+A lead in `sent` with no reply gets follow-up #n+1 once FOLLOWUP_DELAYS_DAYS[n]
+days have passed since its last send. Like every other draft it still needs
+human approval; the send scheduler then gives it a slot in the metro's
+business hours, spaced with the rest of that metro's sends.
+"""
+
+from datetime import datetime, timedelta
+
+from openclaw import config
+from openclaw.agents.outreach import OutreachAgent
+from openclaw.schemas import LeadStatus
+from openclaw.persistence.database import get_followup_candidates, insert_drafts
+from openclaw.persistence.suppression import SUPPRESSIONS
+
+# _generate_draft has templates for the initial email + two follow-ups
+MAX_FOLLOWUPS = 2
+
+
+class CadenceAgent(OutreachAgent):
+    name = "cadence"
+
+    def execute(self, now: datetime = None, **kw) -> dict:
+        delays = config.FOLLOWUP_DELAYS_DAYS[:MAX_FOLLOWUPS]
+        if not delays:
+            return {"drafted": 0, "skipped": 0, "errors": 0}
+        now = now or datetime.utcnow()
+
+        drafted = []
+        skipped = 0
+        errors = 0
+        # One pass over the book: everything quiet for at least the shortest delay
+        candidates = get_followup_candidates((now - timedelta(days=min(delays))).isoformat(), len(delays))
+        for lead in candidates:
+            followup = int(lead["last_followup"] or 0) + 1
+            if lead["has_pending"] or SUPPRESSIONS.blocked(lead):
+                skipped += 1
+                continue
+            due = datetime.fromisoformat(lead["last_sent_at"]) + timedelta(days=delays[followup - 1])
+            if due > now:
+                skipped += 1
+                continue
+            try:
+                with self.span("render_draft"):
+                    draft = self._generate_draft(lead, followup)
+                drafted.append((lead, draft))
+            except Exception as e:
+                with self.lead_context(lead["id"]):
+                    self.log.error("  Error drafting follow-up for %s: %s", lead.get("business_name", "?"), e)
+                errors += 1
+
+        with self.span("save_drafts"):
+            inserted = {d["id"] for d in insert_drafts([draft for _, draft in drafted],
+                                                       lead_status=LeadStatus.DRAFT_READY,
+                                                       from_states=[LeadStatus.SENT])}
+        skipped += len(drafted) - len(inserted)
+        drafted = [(lead, draft) for lead, draft in drafted if draft["id"] in inserted]
+        for lead, draft in drafted:
+            with self.lead_context(lead["id"]):
+                self.log.info("  Follow-up #%d drafted: %s", draft["followup_number"], lead["business_name"])
+        return {"drafted": len(drafted), "skipped": skipped, "errors": errors}
@@ -5,12 +5,13 @@ Human approves via CLI before anything is sent.
 """
 
 from openclaw import config
-from openclaw.schemas import _id, _now
+from openclaw.schemas import LeadStatus, _id, _now
 from openclaw.agents.base import BaseAgent
 from openclaw.persistence.database import (
-    get_leads_by_status, get_lead, update_lead,
-    insert_draft, get_lead_draft_count, draft_exists,
+    get_lead, get_lead_draft_count, draft_exists,
+    get_outreach_candidates, insert_drafts,
 )
+from openclaw.persistence.suppression import SUPPRESSIONS
 
 
 class OutreachAgent(BaseAgent):
@@ -18,43 +19,90 @@ class OutreachAgent(BaseAgent):
 
     def execute(self, lead_id: str = "", **kw) -> dict:
         if lead_id:
-            leads = [l for l in [get_lead(lead_id)] if l]
-        else:
-            # Get qualified leads that have a preview built (have preview_url)
-            qualified = get_leads_by_status("qualified")
-            leads = [l for l in qualified if l.get("preview_url")]
+            return self._draft_leads([l for l in [get_lead(lead_id)] if l])
+        drafted, skipped, errors = self._draft_candidates(get_outreach_candidates())
+        return {"drafted": len(drafted), "skipped": skipped, "errors": errors}
 
-        drafted = 0
+    def draft_for(self, lead_ids: list[str]) -> list[dict]:
+        """Batch-draft the given leads where eligible (pipeline path). Returns the drafts created."""
+        drafted, _, _ = self._draft_candidates(get_outreach_candidates(len(lead_ids), lead_ids))
+        return [draft for _, draft in drafted]
+
+    def _draft_candidates(self, candidates: list[dict]) -> tuple[list, int, int]:
+        """
+        Batch path: candidates come from one SELECT (draft counts joined in),
+        drafts are rendered in memory and written in one transaction.
+        Same decisions as _draft_leads. Returns ([(lead, draft)], skipped, errors).
+        """
+        drafted = []
         skipped = 0
         errors = 0
-        for lead in leads:
+        for lead in candidates:
+            followup = lead["draft_count"]  # 0 = initial, 1 = bump, 2 = close-the-loop
+            if followup >= 3 or lead["next_draft_exists"] or SUPPRESSIONS.blocked(lead):
+                skipped += 1
+                continue
             try:
-                # Skip paused leads
-                if lead.get("manual_override") or lead.get("lead_status") == "paused":
-                    skipped += 1
-                    continue
-
-                existing = get_lead_draft_count(lead["id"])
-                if existing >= 3:
-                    skipped += 1
-                    continue
-
-                followup = existing  # 0 = initial, 1 = bump, 2 = close-the-loop
-
-                # Dedup: don't create duplicate for same lead + followup_number
-                if draft_exists(lead["id"], followup):
-                    skipped += 1
-                    continue
-
-                draft = self._generate_draft(lead, followup)
-                insert_draft(draft)
-                update_lead(lead["id"], lead_status="draft_ready")
-                drafted += 1
-                self.log.info("  Drafted: %s (followup #%d)", lead["business_name"], followup)
+                with self.span("render_draft"):
+                    drafted.append((lead, self._generate_draft(lead, followup)))
             except Exception as e:
-                self.log.error("  Error drafting for %s: %s", lead.get("business_name", "?"), e)
+                with self.lead_context(lead["id"]):
+                    self.log.error("  Error drafting for %s: %s", lead.get("business_name", "?"), e)
                 errors += 1
 
+        # Leads that left 'qualified' since the SELECT (paused, replied...) lose the race and get no draft
+        with self.span("save_drafts"):
+            inserted = {d["id"] for d in insert_drafts([draft for _, draft in drafted],
+                                                       lead_status=LeadStatus.DRAFT_READY,
+                                                       from_states=[LeadStatus.QUALIFIED])}
+        skipped += len(drafted) - len(inserted)
+        drafted = [(lead, draft) for lead, draft in drafted if draft["id"] in inserted]
+        for lead, draft in drafted:
+            with self.lead_context(lead["id"]):
+                self.log.info("  Drafted: %s (followup #%d)", lead["business_name"], draft["followup_number"])
+        return drafted, skipped, errors
+
+    def _draft_leads(self, leads: list[dict]) -> dict:
+        """Per-lead path, used for a single explicit lead (boost, smoke test)."""
+        drafted = 0
+        skipped = 0
+        errors = 0
+        for lead in leads:
+            with self.lead_context(lead["id"]):
+                try:
+                    # Skip paused leads
+                    if lead.get("manual_override") or lead.get("lead_status") == "paused":
+                        skipped += 1
+                        continue
+
+                    # Do-not-contact: bounced address, opted-out business
+                    if SUPPRESSIONS.blocked(lead):
+                        skipped += 1
+                        continue
+
+                    existing = get_lead_draft_count(lead["id"])
+                    if existing >= 3:
+                        skipped += 1
+                        continue
+
+                    followup = existing  # 0 = initial, 1 = bump, 2 = close-the-loop
+
+                    # Dedup: don't create duplicate for same lead + followup_number
+                    if draft_exists(lead["id"], followup):
+                        skipped += 1
+                        continue
+
+                    draft = self._generate_draft(lead, followup)
+                    if not insert_drafts([draft], lead_status=LeadStatus.DRAFT_READY):
+                        self.log.info("  Skipped %s: status changed", lead["business_name"])
+                        skipped += 1
+                        continue
+                    drafted += 1
+                    self.log.info("  Drafted: %s (followup #%d)", lead["business_name"], followup)
+                except Exception as e:
+                    self.log.error("  Error drafting for %s: %s", lead.get("business_name", "?"), e)
+                    errors += 1
+
         return {"drafted": drafted, "skipped": skipped, "errors": errors}
 
     def _generate_draft(self, lead: dict, followup: int) -> dict:
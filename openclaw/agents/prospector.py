@@ -9,12 +9,12 @@ Writes leads to DB with lead_status=new.
 
 import re
 import time
-import requests
 
 from openclaw import config
 from openclaw.schemas import _id, _now
 from openclaw.agents.base import BaseAgent
 from openclaw.persistence.database import insert_lead, lead_exists
+from openclaw.persistence.suppression import SUPPRESSIONS
 
 SEARCH_TERMS = {
     "plumbing": "plumber",
@@ -52,44 +52,12 @@ class ProspectorAgent(BaseAgent):
 
         for place in raw:
             try:
-                biz_name = place.get("name", "").strip()
-                if not biz_name:
+                lead = self._lead_from_place(place, category, metro)
+                if lead is None:
                     skipped += 1
                     continue
-                if any(f in biz_name.lower() for f in FRANCHISE_KEYWORDS):
-                    skipped += 1
-                    continue
-
-                phone = self._clean_phone(place.get("formatted_phone_number", ""))
-                website = place.get("website", "")
-
-                if lead_exists(business_name=biz_name, metro=metro):
-                    skipped += 1
-                    continue
-
-                # Extract ONE short review excerpt if available
-                excerpt_data = self._extract_single_excerpt(place)
-
-                insert_lead({
-                    "id": _id(),
-                    "business_name": biz_name,
-                    "phone": phone,
-                    "category": category,
-                    "metro": metro,
-                    "rating": place.get("rating", 0.0),
-                    "review_count": place.get("user_ratings_total", 0),
-                    "has_website": int(bool(website)),
-                    "website_url": website,
-                    "gbp_link": place.get("url", ""),
-                    "source": "google_places",
-                    "lead_status": "new",
-                    "last_review_date": excerpt_data.get("last_review_date", ""),
-                    "review_excerpt": excerpt_data.get("review_excerpt", ""),
-                    "review_excerpt_author": excerpt_data.get("review_excerpt_author", ""),
-                    "review_excerpt_date": excerpt_data.get("review_excerpt_date", ""),
-                    "created_at": _now(),
-                    "updated_at": _now(),
-                })
+                with self.span("save_lead"):
+                    insert_lead(lead)
                 created += 1
             except Exception as e:
                 self.log.error("  Error processing place %s: %s", place.get("name", "?"), e)
@@ -98,6 +66,72 @@ class ProspectorAgent(BaseAgent):
         return {"category": category, "metro": metro, "raw": len(raw),
                 "created": created, "skipped": skipped, "errors": errors}
 
+    def iter_leads(self, category: str, metro: str):
+        """
+        Streaming form of execute for the pipeline runner: yields each new lead
+        as soon as its Places details are in and it has been saved.
+        """
+        if not category or not metro:
+            raise ValueError("category and metro required")
+
+        config.require_places()
+
+        self.log.info("Prospecting %s in %s", category, metro)
+        for place in self._iter_places(category, metro):
+            try:
+                lead = self._lead_from_place(place, category, metro)
+                if lead is None:
+                    continue
+                with self.span("save_lead"):
+                    insert_lead(lead)
+            except Exception as e:
+                self.log.error("  Error processing place %s: %s", place.get("name", "?"), e)
+                continue
+            yield lead
+
+    def _lead_from_place(self, place: dict, category: str, metro: str) -> dict | None:
+        """Lead row for a Places result, or None if it should be skipped."""
+        biz_name = place.get("name", "").strip()
+        if not biz_name:
+            return None
+        if any(f in biz_name.lower() for f in FRANCHISE_KEYWORDS):
+            return None
+
+        phone = self._clean_phone(place.get("formatted_phone_number", ""))
+        website = place.get("website", "")
+
+        with self.span("dedup_check"):
+            if lead_exists(business_name=biz_name, metro=metro):
+                return None
+
+        # Opted out / do-not-contact under an earlier lead id
+        if SUPPRESSIONS.blocked({"business_name": biz_name, "metro": metro, "phone": phone}):
+            return None
+
+        # Extract ONE short review excerpt if available
+        excerpt_data = self._extract_single_excerpt(place)
+
+        return {
+            "id": _id(),
+            "business_name": biz_name,
+            "phone": phone,
+            "category": category,
+            "metro": metro,
+            "rating": place.get("rating", 0.0),
+            "review_count": place.get("user_ratings_total", 0),
+            "has_website": int(bool(website)),
+            "website_url": website,
+            "gbp_link": place.get("url", ""),
+            "source": "google_places",
+            "lead_status": "new",
+            "last_review_date": excerpt_data.get("last_review_date", ""),
+            "review_excerpt": excerpt_data.get("review_excerpt", ""),
+            "review_excerpt_author": excerpt_data.get("review_excerpt_author", ""),
+            "review_excerpt_date": excerpt_data.get("review_excerpt_date", ""),
+            "created_at": _now(),
+            "updated_at": _now(),
+        }
+
     @staticmethod
     def _extract_single_excerpt(place: dict) -> dict:
         """
@@ -150,47 +184,56 @@ class ProspectorAgent(BaseAgent):
         }
 
     def _search_places(self, category: str, metro: str) -> list[dict]:
+        return list(self._iter_places(category, metro))
+
+    def _iter_places(self, category: str, metro: str):
+        """Yield up to PROSPECT_BATCH_SIZE places, each as soon as its details are fetched."""
+        import requests  # deferred: ~40ms at import, only needed when prospecting
         api_key = config.GOOGLE_PLACES_API_KEY
 
         query = f"{SEARCH_TERMS.get(category, category)} in {metro}"
-        url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+        url = f"{config.PLACES_API_BASE}/textsearch/json"
         params = {"query": query, "key": api_key}
-        all_places = []
+        count = 0
 
         for _ in range(3):
             try:
-                resp = requests.get(url, params=params, timeout=15)
-                resp.raise_for_status()
-                data = resp.json()
+                with self.span("places_search"):
+                    resp = requests.get(url, params=params, timeout=15)
+                    resp.raise_for_status()
+                    data = resp.json()
             except requests.RequestException as e:
                 self.log.error("Places API request failed: %s", e)
                 break
 
             for p in data.get("results", []):
+                if count >= config.PROSPECT_BATCH_SIZE:
+                    return
                 detail = self._get_details(p["place_id"], api_key)
                 if detail:
                     p.update(detail)
-                all_places.append(p)
+                count += 1
+                yield p
             token = data.get("next_page_token")
-            if not token or len(all_places) >= config.PROSPECT_BATCH_SIZE:
+            if not token or count >= config.PROSPECT_BATCH_SIZE:
                 break
             params = {"pagetoken": token, "key": api_key}
-            time.sleep(2)
-
-        return all_places[:config.PROSPECT_BATCH_SIZE]
+            time.sleep(config.PLACES_PAGE_DELAY)
 
     def _get_details(self, place_id: str, api_key: str) -> dict | None:
+        import requests
         # IMPORTANT: Request reviews field to get at most 1 short excerpt
-        url = "https://maps.googleapis.com/maps/api/place/details/json"
+        url = f"{config.PLACES_API_BASE}/details/json"
         params = {
             "place_id": place_id,
             "fields": "formatted_phone_number,website,url,reviews",
             "key": api_key,
         }
         try:
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            return resp.json().get("result", {})
+            with self.span("place_details"):
+                resp = requests.get(url, params=params, timeout=10)
+                resp.raise_for_status()
+                return resp.json().get("result", {})
         except Exception:
             return None
 
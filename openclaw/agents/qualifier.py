@@ -8,12 +8,16 @@ Disqualification filters:
   - no review in last 120 days (if last_review_date available)
 """
 
-import requests
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
 
+from openclaw import config
+from openclaw.schemas import LeadStatus
 from openclaw.agents.base import BaseAgent
-from openclaw.persistence.database import get_leads_by_status, update_lead, get_lead
+from openclaw.persistence.database import get_leads_by_status, transition_lead, get_lead
+
+# Re-scoring a qualified lead is fine; anything further along is left alone
+_QUALIFY_FROM = [LeadStatus.NEW, LeadStatus.QUALIFIED]
 
 AVG_TICKET = {
     "plumbing": 450, "hvac": 800, "electrical": 400, "roofing": 3500,
@@ -66,31 +70,48 @@ class QualifierAgent(BaseAgent):
         errors = 0
         for lead in leads:
             try:
-                # Disqualification filters
-                reason = self._check_disqualify(lead)
-                if reason:
-                    update_lead(lead["id"], lead_status="lost", human_notes=f"Disqualified: {reason}")
-                    self.log.info("  DQ: %s — %s", lead["business_name"], reason)
+                if self.qualify_lead(lead):
+                    qualified += 1
+                else:
                     disqualified += 1
-                    continue
-
-                score, tier = self._score(lead)
-                roi = self._estimate_roi(lead)
-                themes = self._extract_themes(lead)
-
-                update_lead(lead["id"],
-                    qualification_score=score, tier=tier,
-                    roi_estimate_monthly=roi, review_themes=themes,
-                    lead_status="qualified",
-                )
-                qualified += 1
-                self.log.info("  %s | score=%d tier=%s roi=$%d/mo", lead["business_name"], score, tier, roi)
             except Exception as e:
                 self.log.error("  Error qualifying %s: %s", lead.get("business_name", "?"), e)
                 errors += 1
 
         return {"qualified": qualified, "disqualified": disqualified, "errors": errors}
 
+    def qualify_lead(self, lead: dict) -> dict | None:
+        """
+        Score one lead and save the result. Returns the updated lead, or None if
+        disqualified or if its status moved on while it was being scored.
+        """
+        with self.lead_context(lead["id"]):
+            return self._qualify(lead)
+
+    def _qualify(self, lead: dict) -> dict | None:
+        reason = self._check_disqualify(lead)
+        if reason:
+            if transition_lead(lead["id"], _QUALIFY_FROM, LeadStatus.LOST, human_notes=f"Disqualified: {reason}"):
+                self.log.info("  DQ: %s — %s", lead["business_name"], reason)
+            return None
+
+        score, tier = self._score(lead)
+        roi = self._estimate_roi(lead)
+        themes = self._extract_themes(lead)
+
+        fields = {
+            "qualification_score": score, "tier": tier,
+            "roi_estimate_monthly": roi, "review_themes": themes,
+        }
+        with self.span("save"):
+            saved = transition_lead(lead["id"], _QUALIFY_FROM, LeadStatus.QUALIFIED, **fields)
+        if not saved:
+            self.log.info("  Skipped %s: status changed", lead["business_name"])
+            return None
+        fields["lead_status"] = LeadStatus.QUALIFIED.value
+        self.log.info("  %s | score=%d tier=%s roi=$%d/mo", lead["business_name"], score, tier, roi)
+        return {**lead, **fields}
+
     def _check_disqualify(self, lead: dict) -> str | None:
         """Return disqualification reason or None if OK."""
         if lead["rating"] < 4.4:
@@ -136,7 +157,8 @@ class QualifierAgent(BaseAgent):
         elif lead["review_count"] >= 10: s += 5
         if not lead["has_website"]: s += 25
         elif lead.get("website_url"):
-            ws = self._check_website(lead["website_url"])
+            with self.span("check_website"):
+                ws = self._check_website(lead["website_url"])
             if ws == "weak": s += 15
             elif ws == "modern": s -= 15
         if lead.get("email"): s += 10
@@ -154,8 +176,12 @@ class QualifierAgent(BaseAgent):
         return missed * avg
 
     def _check_website(self, url: str) -> str:
+        # Deferred: requests + bs4 are most of this module's import time and
+        # only website checks need them
+        import requests
+        from bs4 import BeautifulSoup
         try:
-            resp = requests.get(url, timeout=8, headers={"User-Agent": "Mozilla/5.0"})
+            resp = requests.get(_fetch_url(url), timeout=8, headers={"User-Agent": "Mozilla/5.0"})
             if resp.status_code != 200:
                 return "weak"
             html = resp.text.lower()
@@ -167,3 +193,12 @@ class QualifierAgent(BaseAgent):
             return "weak"
         except Exception:
             return "weak"
+
+
+def _fetch_url(url: str) -> str:
+    """The site's own URL, or its copy on the local website farm when WEBSITE_FARM_URL is set."""
+    if not config.WEBSITE_FARM_URL:
+        return url
+    parts = urlsplit(url if "//" in url else f"http://{url}")
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{config.WEBSITE_FARM_URL}/{parts.netloc.lower()}{parts.path or '/'}{query}"
@@ -3,32 +3,60 @@ Central configuration. Reads from .env.
 """
 
 import os
+import json
 from pathlib import Path
-from dotenv import load_dotenv
 
 _ROOT = Path(__file__).resolve().parent.parent
-load_dotenv(_ROOT / ".env")
+if (_ROOT / ".env").exists():
+    from dotenv import load_dotenv  # only paid for when there is a .env to read
+    load_dotenv(_ROOT / ".env")
 
 # Database
 DB_PATH = os.getenv("OPENCLAW_DB_PATH", str(_ROOT / "openclaw.db"))
 
 # Google Places
 GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY", "")
+# Point at a local stand-in (bench/standins.py) to prospect offline
+PLACES_API_BASE = os.getenv("PLACES_API_BASE", "https://maps.googleapis.com/maps/api/place").rstrip("/")
+PLACES_PAGE_DELAY = float(os.getenv("PLACES_PAGE_DELAY", "2"))  # a next_page_token takes a moment to go live
 
 # SMTP (outbound email)
 SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_SECURITY = os.getenv("SMTP_SECURITY", "starttls").lower()  # starttls | ssl | none (local sink)
 SMTP_USER = os.getenv("SMTP_USER", "")
 SMTP_PASS = os.getenv("SMTP_PASS", "")
+# Messages per connection before rolling to a new one (0 = until the server objects)
+SMTP_MAX_PER_CONNECTION = int(os.getenv("SMTP_MAX_PER_CONNECTION", "0"))
+# Several warmed sender identities: path to a JSON list of accounts, e.g.
+#   [{"user": "a@x.com", "pass": "...", "from_name": "Ann", "daily_limit": 40, "hourly_limit": 8}]
+# Missing keys fall back to the SMTP_* / FROM_* / OUTREACH_* values. Empty = single SMTP_USER account.
+# Replies come back via REPLY_TO_EMAIL; bounces go to each account, so forward them to that mailbox.
+SMTP_ACCOUNTS_FILE = os.getenv("SMTP_ACCOUNTS_FILE", "")
+# Minimum seconds between two sends to the same recipient domain
+SMTP_DOMAIN_INTERVAL = float(os.getenv("SMTP_DOMAIN_INTERVAL", "5"))
 
 # IMAP (reply checking)
 IMAP_HOST = os.getenv("IMAP_HOST", "imap.gmail.com")
+IMAP_SECURITY = os.getenv("IMAP_SECURITY", "ssl").lower()  # ssl | starttls | none (local stand-in)
+IMAP_PORT = int(os.getenv("IMAP_PORT", "993" if IMAP_SECURITY == "ssl" else "143"))
 IMAP_USER = os.getenv("IMAP_USER", "")
 IMAP_PASS = os.getenv("IMAP_PASS", "")
+IMAP_MAILBOX = os.getenv("IMAP_MAILBOX", "INBOX")
+IMAP_FETCH_BATCH = int(os.getenv("IMAP_FETCH_BATCH", "50"))
+IMAP_BODY_FETCH_BYTES = int(os.getenv("IMAP_BODY_FETCH_BYTES", "8192"))  # per matched reply
+IMAP_DSN_FETCH_BYTES = int(os.getenv("IMAP_DSN_FETCH_BYTES", "65536"))  # per bounce report
+IMAP_INITIAL_SYNC_DAYS = int(os.getenv("IMAP_INITIAL_SYNC_DAYS", "14"))  # first sync / UIDVALIDITY reset
+# watch-replies: re-issue IDLE before the server's ~29 min inactivity cutoff
+IMAP_IDLE_SECONDS = int(os.getenv("IMAP_IDLE_SECONDS", str(24 * 60)))
+IMAP_POLL_SECONDS = int(os.getenv("IMAP_POLL_SECONDS", "60"))  # servers without IDLE
+THREAD_INDEX_SIZE = int(os.getenv("THREAD_INDEX_SIZE", "10000"))  # recent sent Message-IDs kept in memory
 
 # Identity
 FROM_EMAIL = os.getenv("FROM_EMAIL", "")
 FROM_NAME = os.getenv("FROM_NAME", "")
+# Where replies go: the mailbox check-replies reads, so replies to any sender account are seen
+REPLY_TO_EMAIL = os.getenv("REPLY_TO_EMAIL", IMAP_USER if "@" in IMAP_USER else "")
 CALENDAR_LINK = os.getenv("CALENDAR_LINK", "")
 
 # Preview hosting (GitHub Pages serves from /docs)
@@ -38,11 +66,52 @@ PREVIEW_PORT = int(os.getenv("PREVIEW_PORT", "8111"))
 
 # Pipeline
 PROSPECT_BATCH_SIZE = int(os.getenv("PROSPECT_BATCH_SIZE", "50"))
+# Website checks fetch <WEBSITE_FARM_URL>/<host><path> instead of the live site (bench/standins.py)
+WEBSITE_FARM_URL = os.getenv("WEBSITE_FARM_URL", "").rstrip("/")
 OUTREACH_DAILY_LIMIT = int(os.getenv("OUTREACH_DAILY_LIMIT", "25"))
+OUTREACH_HOURLY_LIMIT = int(os.getenv("OUTREACH_HOURLY_LIMIT", "0"))  # per sender, 0 = no hourly cap
+# How often a long-running process picks up suppressions added elsewhere
+SUPPRESSION_REFRESH_SECONDS = int(os.getenv("SUPPRESSION_REFRESH_SECONDS", "60"))
+# Streaming daily run (openclaw/pipeline.py): queue bound between stages, workers per stage
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "32"))
+PIPELINE_QUALIFY_WORKERS = int(os.getenv("PIPELINE_QUALIFY_WORKERS", "8"))  # website checks are I/O-bound
+PIPELINE_BUILD_WORKERS = int(os.getenv("PIPELINE_BUILD_WORKERS", "2"))
+PIPELINE_DRAFT_BATCH = int(os.getenv("PIPELINE_DRAFT_BATCH", "25"))
+# Job queue workers (cli.py worker)
+JOB_CLAIM_BATCH = int(os.getenv("JOB_CLAIM_BATCH", "5"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "60"))
+JOB_POLL_SECONDS = int(os.getenv("JOB_POLL_SECONDS", "5"))  # idle wait between claims
+# Days of silence after each send before the next follow-up is drafted (one entry per follow-up)
+FOLLOWUP_DELAYS_DAYS = [int(d) for d in os.getenv("FOLLOWUP_DELAYS_DAYS", "3,7").split(",") if d.strip()]
+
+# Outbox (approved drafts waiting to be sent)
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "25"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "600"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "300"))
+
+# Send scheduler — sends land inside the recipient metro's business hours
+SEND_WINDOW_START_HOUR = int(os.getenv("SEND_WINDOW_START_HOUR", "9"))
+SEND_WINDOW_END_HOUR = int(os.getenv("SEND_WINDOW_END_HOUR", "16"))
+SEND_DAYS = [int(d) for d in os.getenv("SEND_DAYS", "0,1,2,3,4").split(",") if d.strip()]  # Mon=0
+SEND_DEFAULT_TZ = os.getenv("SEND_DEFAULT_TZ", "America/New_York")
+# Seconds between planned sends per metro (0 = spread OUTREACH_DAILY_LIMIT over the window)
+SEND_SPACING_SECONDS = int(os.getenv("SEND_SPACING_SECONDS", "0"))
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_DIR = os.getenv("LOG_DIR", str(_ROOT / "logs"))
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text | json (JSON lines, written off-thread)
+LOG_ROTATE = os.getenv("LOG_ROTATE", "size").lower()  # size | time
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))  # LOG_ROTATE=size
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")  # LOG_ROTATE=time, TimedRotatingFileHandler `when`
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+# Profiling (cli.py --profile / --profile-sql)
+PROFILE_DIR = os.getenv("PROFILE_DIR", str(Path(LOG_DIR) / "profiles"))
+PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", "5"))  # sampling-mode interval
 
 
 # ---------------------------------------------------------------------------
@@ -53,8 +122,40 @@ class ConfigError(RuntimeError):
     """Raised when required configuration is missing."""
 
 
+def smtp_accounts() -> list[dict]:
+    """Sender accounts with every key filled in. Raises ConfigError on a bad accounts file."""
+    defaults = {
+        "host": SMTP_HOST, "port": SMTP_PORT, "security": SMTP_SECURITY, "user": SMTP_USER, "pass": SMTP_PASS,
+        "from_email": FROM_EMAIL, "from_name": FROM_NAME, "reply_to": REPLY_TO_EMAIL,
+        "daily_limit": OUTREACH_DAILY_LIMIT, "hourly_limit": OUTREACH_HOURLY_LIMIT,
+    }
+    if not SMTP_ACCOUNTS_FILE:
+        return [defaults]
+    try:
+        raw = json.loads(Path(SMTP_ACCOUNTS_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"Cannot read SMTP_ACCOUNTS_FILE {SMTP_ACCOUNTS_FILE}: {e}")
+    if not isinstance(raw, list) or not raw:
+        raise ConfigError(f"SMTP_ACCOUNTS_FILE {SMTP_ACCOUNTS_FILE} must be a non-empty JSON list")
+    accounts = []
+    for entry in raw:
+        acct = {**defaults, **entry}
+        if "from_email" not in entry:
+            acct["from_email"] = acct["user"]
+        accounts.append(acct)
+    return accounts
+
+
 def require_smtp():
     """Call before any SMTP operation. Raises ConfigError with clear message."""
+    if SMTP_ACCOUNTS_FILE:
+        for i, acct in enumerate(smtp_accounts()):
+            missing = [k for k in ("user", "pass", "from_email", "from_name") if not acct.get(k)]
+            if missing:
+                raise ConfigError(
+                    f"SMTP account #{i} in {SMTP_ACCOUNTS_FILE} is missing: {', '.join(missing)}"
+                )
+        return
     missing = []
     if not SMTP_USER:
         missing.append("SMTP_USER  (e.g. your-outreach@gmail.com)")
@@ -95,6 +196,12 @@ def require_places():
 
 def has_smtp() -> bool:
     """Non-throwing check for SMTP readiness."""
+    if SMTP_ACCOUNTS_FILE:
+        try:
+            require_smtp()
+        except ConfigError:
+            return False
+        return True
     return bool(SMTP_USER and SMTP_PASS and FROM_EMAIL)
 
 
@@ -0,0 +1,77 @@
+"""
+Delivery status notification (bounce) parsing. RFC 3464 multipart/report only.
+
+A DSN comes from MAILER-DAEMON, so sender matching never ties it to a lead.
+What does: the returned copy of our original message (message/rfc822 or
+text/rfc822-headers part) carries the Message-ID we sent, and the
+message/delivery-status part names the failed recipient and why.
+"""
+
+import email
+import logging
+
+log = logging.getLogger("openclaw.bounces")
+
+
+def parse_dsn(raw: bytes) -> dict | None:
+    """
+    Parse a (possibly truncated) multipart/report message.
+    Returns {"message_id", "recipients": [{"email", "action", "status", "diagnostic"}]}
+    or None when it is not a delivery status report.
+    """
+    try:
+        msg = email.message_from_bytes(raw)
+    except Exception as e:
+        log.warning("Unreadable delivery report: %s", e)
+        return None
+    if msg.get_content_type() != "multipart/report":
+        return None
+
+    status_part = original = None
+    for part in msg.walk():
+        ctype = part.get_content_type()
+        if ctype == "message/delivery-status" and status_part is None:
+            status_part = part
+        elif ctype in ("message/rfc822", "text/rfc822-headers") and original is None:
+            original = part
+    if status_part is None:
+        return None
+
+    recipients = []
+    # First block holds per-message fields, the rest one block per recipient
+    for block in (status_part.get_payload() or [])[1:]:
+        if not hasattr(block, "get"):
+            continue
+        recipient = _address(block.get("Final-Recipient", "")) or _address(block.get("Original-Recipient", ""))
+        if not recipient:
+            continue
+        recipients.append({
+            "email": recipient,
+            "action": str(block.get("Action", "")).strip().lower(),
+            "status": str(block.get("Status", "")).strip(),
+            "diagnostic": " ".join(str(block.get("Diagnostic-Code", "")).split()),
+        })
+    return {"message_id": _original_message_id(original), "recipients": recipients}
+
+
+def is_hard_bounce(recipient: dict) -> bool:
+    """Permanent failure: Action failed with a 5.x.x status."""
+    return recipient["action"] == "failed" and recipient["status"].startswith("5")
+
+
+def _original_message_id(part) -> str:
+    if part is None:
+        return ""
+    if part.get_content_type() == "message/rfc822":
+        payload = part.get_payload()
+        headers = payload[0] if isinstance(payload, list) and payload else None
+    else:
+        text = part.get_payload(decode=True) or b""
+        headers = email.message_from_bytes(text)
+    return str(headers.get("Message-ID", "")).strip() if headers is not None else ""
+
+
+def _address(field) -> str:
+    """'rfc822; jane@example.com' -> 'jane@example.com'."""
+    value = str(field or "").split(";", 1)[-1].strip().strip("<>")
+    return value.lower() if "@" in value else ""
@@ -1,21 +1,150 @@
 """
 SMTP email sender. Only sends approved drafts. Plain text only.
+
+outreach_drafts doubles as a transactional outbox:
+
+  approved (queued) -> sending (leased: lease_owner, lease_expires) -> sent
+                                    |-> approved again, scheduled_for = now + backoff (transient error)
+                                    |-> failed (permanent error, or OUTBOX_MAX_ATTEMPTS reached)
+
+A sender that crashes mid-batch leaves its rows in `sending`; they become
+claimable again once the lease expires (as another attempt, up to
+OUTBOX_MAX_ATTEMPTS) and reuse the persisted Message-ID.
+
+A batch shares one authenticated connection (SMTPSession) instead of paying
+STARTTLS + AUTH per message. With several sender accounts configured
+(config.SMTP_ACCOUNTS_FILE), SenderPool runs one worker per account, each
+with its own connection and daily/hourly quota, and spaces out sends to the
+same recipient domain.
 """
 
+import os
+import re
+import time
+import random
+import socket
 import smtplib
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.utils import make_msgid
 
 from openclaw import config
-from openclaw.schemas import _now
-from openclaw.persistence.database import get_draft, update_draft, get_lead, update_lead
+from openclaw.schemas import LeadStatus, _id, _now
+from openclaw.execution.thread_index import remember_sent
+from openclaw.persistence.database import (
+    get_draft, update_draft, transition_lead, count_sent_by_sender,
+    claim_due_drafts, claim_draft, finish_lease, release_leases,
+)
+from openclaw.persistence.suppression import SUPPRESSIONS
 
 log = logging.getLogger("openclaw.email")
 
+# Replies that mean "this connection has sent enough, open a new one".
+_CAP_CODES = {421, 451, 452, 454}
+_CAP_PATTERN = re.compile(r"too many|limit|exceeded|try again later|closing connection", re.I)
+
+_MAX_BACKOFF_SECONDS = 6 * 3600
+
+
+class SMTPSession:
+    """
+    One authenticated SMTP connection reused for every message in a batch.
+
+    - Connects lazily on the first send.
+    - Reconnects transparently on SMTPServerDisconnected.
+    - Rolls to a fresh connection when the server reports a per-connection
+      message cap, and remembers that cap to roll proactively afterwards.
+    """
+
+    def __init__(self, account: dict = None, max_per_connection: int = 0):
+        self.account = account or config.smtp_accounts()[0]
+        self.max_per_connection = max_per_connection or config.SMTP_MAX_PER_CONNECTION
+        self._server = None
+        self._sent_on_conn = 0
+        self.connections = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, msg):
+        """Send one message, reconnecting or rolling the connection at most once."""
+        if self.max_per_connection and self._sent_on_conn >= self.max_per_connection:
+            self._roll("reached %d messages on this connection" % self._sent_on_conn)
+        if self._server is None:
+            self._connect()
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            log.info("SMTP server disconnected after %d messages, reconnecting", self._sent_on_conn)
+            self._drop()
+            self._connect()
+            self._server.send_message(msg)
+        except smtplib.SMTPResponseException as e:
+            if not _is_connection_cap(e):
+                raise
+            if self._sent_on_conn and not config.SMTP_MAX_PER_CONNECTION:
+                self.max_per_connection = self._sent_on_conn
+            self._roll("server cap after %d messages: %s %s" % (self._sent_on_conn, e.smtp_code, e.smtp_error))
+            self._connect()
+            self._server.send_message(msg)
+        self._sent_on_conn += 1
+
+    def close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
+
+    def _connect(self):
+        acct = self.account
+        security = acct.get("security", "starttls")
+        smtp_cls = smtplib.SMTP_SSL if security == "ssl" else smtplib.SMTP
+        server = smtp_cls(acct["host"], int(acct["port"]), timeout=30)
+        try:
+            if security == "starttls":
+                server.starttls()
+            server.login(acct["user"], acct["pass"])
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._sent_on_conn = 0
+        self.connections += 1
+
+    def _roll(self, reason: str):
+        log.info("Rolling SMTP connection: %s", reason)
+        self.close()
+
+    def _drop(self):
+        """Forget a dead connection without a QUIT round trip."""
+        try:
+            self._server.close()
+        except Exception:
+            pass
+        self._server = None
+
 
-def send_draft(draft_id: str) -> dict:
-    """Send a single approved draft. Returns {ok, message_id, error}."""
+def _is_connection_cap(e: smtplib.SMTPResponseException) -> bool:
+    text = e.smtp_error.decode("utf-8", "replace") if isinstance(e.smtp_error, bytes) else str(e.smtp_error)
+    return e.smtp_code == 421 or (e.smtp_code in _CAP_CODES and bool(_CAP_PATTERN.search(text)))
+
+
+def send_draft(draft_id: str, session: SMTPSession = None) -> dict:
+    """
+    Send a single approved draft now, ignoring its schedule. Returns {ok, message_id, error}.
+
+    Pass a session to reuse its connection; otherwise a one-off session is used.
+    """
     draft = get_draft(draft_id)
     if not draft:
         return {"ok": False, "error": f"Draft {draft_id} not found"}
@@ -24,55 +153,117 @@ def send_draft(draft_id: str) -> dict:
     if draft["status"] != "approved":
         return {"ok": False, "error": f"Draft {draft_id} is not approved (status={draft['status']})"}
 
-    to_email = draft.get("email", "")
-    if not to_email:
-        update_draft(draft_id, status="failed", error="No email address")
-        return {"ok": False, "error": "No email address for lead"}
-
     # Validate SMTP config with clear error
     try:
         config.require_smtp()
     except config.ConfigError as e:
-        error_msg = str(e)
-        update_draft(draft_id, status="failed", error=error_msg)
-        return {"ok": False, "error": error_msg}
+        return {"ok": False, "error": str(e)}
+
+    owner = _lease_owner()
+    if not claim_draft(draft_id, owner, config.OUTBOX_LEASE_SECONDS):
+        return {"ok": False, "error": f"Draft {draft_id} was claimed by another sender"}
+    draft["status"] = "sending"
+    if not _drop_suppressed([draft], owner):
+        return {"ok": False, "error": f"{draft.get('business_name')} is on the do-not-contact list; draft cancelled"}
+
+    if session is None:
+        with SMTPSession() as one_off:
+            return _deliver(draft, one_off, owner)
+    return _deliver(draft, session, owner)
 
-    # Build message with explicit Message-ID for reply threading
-    message_id = make_msgid(domain=config.FROM_EMAIL.split("@")[-1] if "@" in config.FROM_EMAIL else "openclaw.local")
+
+def _deliver(draft: dict, session: SMTPSession, owner: str) -> dict:
+    """Send one leased draft and record the outcome against the lease."""
+    draft_id = draft["id"]
+    to_email = draft.get("email", "")
+    if not to_email:
+        finish_lease(draft_id, owner, status="failed", error="No email address")
+        return {"ok": False, "error": "No email address for lead"}
+
+    sender = session.account
+    from_email = sender["from_email"]
+
+    # The Message-ID is persisted before the first attempt and reused on retries,
+    # so a resend after a crash threads (and dedups) as the same message.
+    message_id = draft.get("message_id") or make_msgid(
+        domain=from_email.split("@")[-1] if "@" in from_email else "openclaw.local"
+    )
+    if message_id != draft.get("message_id") or from_email != draft.get("sender_email"):
+        update_draft(draft_id, message_id=message_id, sender_email=from_email)
 
     msg = MIMEText(draft["body"], "plain", "utf-8")
     msg["Subject"] = draft["subject"]
-    msg["From"] = f"{config.FROM_NAME} <{config.FROM_EMAIL}>"
+    msg["From"] = f"{sender['from_name']} <{from_email}>"
     msg["To"] = to_email
-    msg["Reply-To"] = config.FROM_EMAIL
+    # Replies must land in the mailbox the reply checker syncs, whichever account sent
+    msg["Reply-To"] = sender.get("reply_to") or from_email
     msg["Message-ID"] = message_id
 
     try:
-        with smtplib.SMTP(config.SMTP_HOST, config.SMTP_PORT, timeout=30) as server:
-            server.starttls()
-            server.login(config.SMTP_USER, config.SMTP_PASS)
-            server.send_message(msg)
-
-        update_draft(draft_id, status="sent", sent_at=_now(), message_id=message_id, error="")
-        update_lead(draft["lead_id"], lead_status="sent")
-        log.info("Sent: %s -> %s [%s]", draft["subject"], to_email, message_id)
-        return {"ok": True, "message_id": message_id}
-
+        session.send(msg)
     except smtplib.SMTPAuthenticationError as e:
-        error_msg = f"SMTP auth failed — check SMTP_USER/SMTP_PASS: {e}"
-        update_draft(draft_id, status="failed", error=error_msg)
+        # Not the draft's fault: put it back untouched so it goes out once credentials are fixed
+        error_msg = f"SMTP auth failed for {sender['user']} — check SMTP_USER/SMTP_PASS: {e}"
+        finish_lease(draft_id, owner, status="approved", error=error_msg)
         log.error("Auth failed for %s: %s", draft_id, error_msg)
-        return {"ok": False, "error": error_msg}
-
+        return {"ok": False, "error": error_msg, "auth_failed": True}
     except Exception as e:
-        error_msg = str(e)
-        update_draft(draft_id, status="failed", error=error_msg)
-        log.error("Send failed for %s: %s", draft_id, error_msg)
-        return {"ok": False, "error": error_msg}
+        return _record_failure(draft, owner, e)
+
+    finish_lease(draft_id, owner, status="sent", sent_at=_now(), error="")
+    # No-op if the lead replied (or was paused) while this was in flight
+    transition_lead(draft["lead_id"], None, LeadStatus.SENT)
+    remember_sent(message_id, draft["lead_id"])
+    log.info("Sent: %s -> %s [%s]", draft["subject"], to_email, message_id)
+    return {"ok": True, "message_id": message_id}
+
+
+def _record_failure(draft: dict, owner: str, exc: Exception) -> dict:
+    """Transient errors go back to the queue with exponential backoff; the rest fail."""
+    attempts = int(draft.get("attempts") or 0) + 1
+    error_msg = str(exc) or exc.__class__.__name__
+    if _is_transient(exc) and attempts < config.OUTBOX_MAX_ATTEMPTS:
+        delay = min(config.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), _MAX_BACKOFF_SECONDS)
+        delay *= random.uniform(0.9, 1.1)
+        retry_at = (datetime.utcnow() + timedelta(seconds=delay)).isoformat()
+        finish_lease(draft["id"], owner, status="approved", attempts=attempts,
+                     scheduled_for=retry_at, error=error_msg)
+        log.warning("Send deferred for %s (attempt %d, retry at %s): %s",
+                    draft["id"], attempts, retry_at[:19], error_msg)
+        return {"ok": False, "error": error_msg, "retry_at": retry_at}
+
+    finish_lease(draft["id"], owner, status="failed", attempts=attempts, error=error_msg)
+    log.error("Send failed for %s: %s", draft["id"], error_msg)
+    return {"ok": False, "error": error_msg}
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    # Disconnects, refused connections, timeouts, DNS hiccups
+    return isinstance(exc, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+def _lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{_id()[:6]}"
 
 
 def send_approved(limit: int = 25) -> dict:
-    """Send all approved drafts up to limit. Returns summary."""
+    """Send approved drafts that are due, up to limit. Returns summary."""
+    return drain_outbox(limit=limit)
+
+
+def drain_outbox(limit: int = 25, batch_size: int = 0) -> dict:
+    """
+    Lease due drafts in batches and send them across the sender accounts.
+
+    Retries wait out their backoff in scheduled_for, so each batch is fresh
+    sends plus whatever retries are already due. Stops at `limit` drafts,
+    when nothing is due, or when sender quotas run out.
+    """
     # Pre-check SMTP config before starting the batch
     try:
         config.require_smtp()
@@ -80,18 +271,171 @@ def send_approved(limit: int = 25) -> dict:
         log.error("Cannot send: %s", e)
         return {"sent": 0, "failed": 0, "total": 0, "error": str(e)}
 
-    from openclaw.persistence.database import get_drafts_by_status
+    batch_size = batch_size or config.OUTBOX_BATCH_SIZE
+    pool = SenderPool(config.smtp_accounts())
+    summary = {"sent": 0, "failed": 0, "retrying": 0, "total": 0, "connections": 0, "deferred": 0,
+               "suppressed": 0}
+    by_sender = {}
+
+    while summary["total"] < limit:
+        owner = _lease_owner()
+        batch = claim_due_drafts(owner, min(batch_size, limit - summary["total"]),
+                                 config.OUTBOX_LEASE_SECONDS, config.OUTBOX_MAX_ATTEMPTS)
+        if not batch:
+            break
+        sendable = _drop_suppressed(batch, owner)
+        summary["suppressed"] += len(batch) - len(sendable)
+        summary["total"] += len(batch) - len(sendable)
+        try:
+            result = pool.send(sendable, owner) if sendable else {}
+        finally:
+            release_leases(owner)
+        if not result:
+            continue
+        for key in ("sent", "failed", "retrying", "total", "connections", "deferred"):
+            summary[key] += result[key]
+        for sender, n in result.get("by_sender", {}).items():
+            by_sender[sender] = by_sender.get(sender, 0) + n
+        if result["deferred"] or result["stopped"]:
+            break
 
-    drafts = get_drafts_by_status("approved", limit=limit)
-    sent = 0
-    failed = 0
+    if by_sender:
+        summary["by_sender"] = by_sender
+    return summary
 
-    for draft in drafts:
-        result = send_draft(draft["id"])
-        if result["ok"]:
-            sent += 1
+
+def _drop_suppressed(drafts: list[dict], owner: str) -> list[dict]:
+    """Cancel leased drafts to do-not-contact leads (bounced, opted out); return the rest."""
+    keep = []
+    for d in drafts:
+        kind = SUPPRESSIONS.blocked(d)
+        if kind:
+            finish_lease(d["id"], owner, status="cancelled", error=f"Suppressed ({kind})")
+            log.info("Skipped suppressed %s %s (draft %s)", kind, d.get("email"), d["id"])
         else:
-            failed += 1
-            log.warning("  Failed: %s — %s", draft.get("subject", ""), result.get("error", ""))
+            keep.append(d)
+    return keep
+
+
+# ---------------------------------------------------------------------------
+# Multi-account sending
+# ---------------------------------------------------------------------------
+
+class SenderQuota:
+    """Daily/hourly send budget for one account, seeded from sent drafts in the DB."""
+
+    def __init__(self, account: dict):
+        self.daily_limit = int(account.get("daily_limit") or 0)
+        self.hourly_limit = int(account.get("hourly_limit") or 0)
+        now = datetime.utcnow()
+        email_addr = account["from_email"]
+        self.used_today = count_sent_by_sender(email_addr, (now - timedelta(days=1)).isoformat())
+        self.used_hour = count_sent_by_sender(email_addr, (now - timedelta(hours=1)).isoformat())
+
+    def exhausted(self) -> bool:
+        if self.daily_limit and self.used_today >= self.daily_limit:
+            return True
+        return bool(self.hourly_limit and self.used_hour >= self.hourly_limit)
+
+    def consume(self):
+        self.used_today += 1
+        self.used_hour += 1
+
+
+class DomainThrottle:
+    """
+    Hands out pending drafts so two sends to the same recipient domain are at
+    least `interval` seconds apart. Workers block only when every remaining
+    draft targets a domain that is still cooling down.
+    """
+
+    def __init__(self, drafts: list[dict], interval: float):
+        self.interval = interval
+        self._pending = deque(drafts)
+        self._next_ok = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def take(self) -> dict | None:
+        with self._cond:
+            while self._pending and not self._closed:
+                now = time.monotonic()
+                earliest = None
+                for i, draft in enumerate(self._pending):
+                    domain = _domain(draft.get("email", ""))
+                    ready_at = self._next_ok.get(domain, 0.0)
+                    if ready_at <= now:
+                        del self._pending[i]
+                        self._next_ok[domain] = now + self.interval
+                        return draft
+                    earliest = ready_at if earliest is None else min(earliest, ready_at)
+                self._cond.wait(earliest - now)
+            return None
+
+    def close(self):
+        """Stop handing out drafts (e.g. after an auth failure)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def remaining(self) -> int:
+        return len(self._pending)
+
+
+class SenderPool:
+    """One worker thread + SMTPSession + quota per sender account."""
+
+    def __init__(self, accounts: list[dict], domain_interval: float = None):
+        self.accounts = accounts
+        self.domain_interval = config.SMTP_DOMAIN_INTERVAL if domain_interval is None else domain_interval
+
+    def send(self, drafts: list[dict], owner: str) -> dict:
+        """Send drafts leased to `owner`. Undispatched drafts are left for the caller to release."""
+        throttle = DomainThrottle(drafts, self.domain_interval)
+        with ThreadPoolExecutor(max_workers=len(self.accounts), thread_name_prefix="smtp") as pool:
+            results = list(pool.map(lambda acct: self._work(acct, throttle, owner), self.accounts))
+
+        summary = {
+            "sent": sum(r["sent"] for r in results),
+            "failed": sum(r["failed"] for r in results),
+            "retrying": sum(r["retrying"] for r in results),
+            "total": len(drafts),
+            "connections": sum(r["connections"] for r in results),
+            "deferred": throttle.remaining(),
+            "stopped": any(r["auth_failed"] for r in results),
+        }
+        if len(self.accounts) > 1:
+            summary["by_sender"] = {r["sender"]: r["sent"] for r in results}
+        return summary
+
+    def _work(self, account: dict, throttle: DomainThrottle, owner: str) -> dict:
+        quota = SenderQuota(account)
+        stats = {"sender": account["from_email"], "sent": 0, "failed": 0, "retrying": 0,
+                 "connections": 0, "auth_failed": False}
+        with SMTPSession(account) as session:
+            while not quota.exhausted():
+                draft = throttle.take()
+                if draft is None:
+                    break
+                result = _deliver(draft, session, owner)
+                if result["ok"]:
+                    quota.consume()
+                    stats["sent"] += 1
+                    continue
+                stats["retrying" if result.get("retry_at") else "failed"] += 1
+                log.warning("  Failed: %s — %s", draft.get("subject", ""), result.get("error", ""))
+                if result.get("auth_failed"):
+                    # Every further login would fail the same way (and count against rate limits)
+                    stats["auth_failed"] = True
+                    if len(self.accounts) == 1:
+                        throttle.close()
+                    break
+            if quota.exhausted():
+                log.info("Sender %s reached its quota (%d today, %d this hour)",
+                         account["from_email"], quota.used_today, quota.used_hour)
+            stats["connections"] = session.connections
+        return stats
+
 
-    return {"sent": sent, "failed": failed, "total": len(drafts)}
+def _domain(email_addr: str) -> str:
+    return email_addr.rsplit("@", 1)[-1].lower() if "@" in email_addr else ""
@@ -0,0 +1,450 @@
+"""
+IMAP helpers for the reply checker: UID-based incremental sync and a
+two-phase fetch.
+
+Everything here is read-only on the server: mailboxes are opened with
+EXAMINE and bodies fetched with BODY.PEEK, so \\Seen flags stay untouched
+and a human reading the inbox cannot hide replies from the sync.
+
+Phase one (fetch_headers) pulls only the threading headers plus
+BODYSTRUCTURE for a batch of UIDs. Phase two (fetch_text_parts) pulls the
+first text part, byte-limited, and only for messages that matched a lead.
+Attachments are never downloaded.
+"""
+
+import base64
+import binascii
+import imaplib
+import logging
+import quopri
+import re
+import socket
+import time
+from datetime import datetime, timedelta
+
+from openclaw import config
+
+log = logging.getLogger("openclaw.imap")
+
+HEADER_FIELDS = "FROM DATE IN-REPLY-TO REFERENCES SUBJECT MESSAGE-ID"
+_LITERAL_RE = re.compile(rb"\{\d+\}$")
+
+
+def connect() -> imaplib.IMAP4:
+    """Open an authenticated IMAP connection. Raises imaplib.IMAP4.error / OSError."""
+    if config.IMAP_SECURITY == "ssl":
+        mail = imaplib.IMAP4_SSL(config.IMAP_HOST, config.IMAP_PORT)
+    else:
+        mail = imaplib.IMAP4(config.IMAP_HOST, config.IMAP_PORT)
+        if config.IMAP_SECURITY == "starttls":
+            mail.starttls()
+    mail.login(config.IMAP_USER, config.IMAP_PASS)
+    return mail
+
+
+def sync_key(mailbox: str) -> str:
+    """imap_sync_state key: one row per account + mailbox."""
+    return f"{config.IMAP_USER}/{mailbox}"
+
+
+def examine(mail: imaplib.IMAP4, mailbox: str) -> int:
+    """Open mailbox read-only and return its UIDVALIDITY."""
+    typ, data = mail.select(_quote(mailbox), readonly=True)
+    if typ != "OK":
+        raise imaplib.IMAP4.error(f"EXAMINE {mailbox} failed: {data}")
+    _, values = mail.response("UIDVALIDITY")
+    if not values or values[0] is None:
+        raise imaplib.IMAP4.error(f"Server did not report UIDVALIDITY for {mailbox}")
+    return int(values[0])
+
+
+def uids_after(mail: imaplib.IMAP4, last_uid: int) -> list[int]:
+    """UIDs strictly greater than last_uid."""
+    # "n:*" always matches the highest UID even when it is < n, so filter.
+    typ, data = mail.uid("SEARCH", None, f"UID {last_uid + 1}:*")
+    if typ != "OK":
+        raise imaplib.IMAP4.error(f"UID SEARCH failed: {data}")
+    return sorted(u for u in _parse_uids(data) if u > last_uid)
+
+
+def highest_uid(mail: imaplib.IMAP4, mailbox: str) -> int:
+    """UIDNEXT - 1: the highest UID the mailbox has assigned so far (0 if none)."""
+    try:
+        typ, data = mail.status(_quote(mailbox), "(UIDNEXT)")
+    except imaplib.IMAP4.error:
+        typ, data = "NO", []
+    match = re.search(rb"UIDNEXT (\d+)", b" ".join(d for d in data if isinstance(d, bytes))) if typ == "OK" else None
+    if match:
+        return int(match.group(1)) - 1
+    # No usable STATUS: the UID of the last message ("*"), if there is one
+    try:
+        typ, data = mail.uid("FETCH", "*", "(UID)")
+    except imaplib.IMAP4.error:
+        return 0
+    if typ != "OK":
+        return 0
+    return max((int(entry["UID"]) for entry in parse_fetch(data) if "UID" in entry), default=0)
+
+
+def uids_since(mail: imaplib.IMAP4, days: int) -> list[int]:
+    """UIDs of messages received in the last `days` days (first sync)."""
+    since = (datetime.utcnow() - timedelta(days=days)).strftime("%d-%b-%Y")
+    typ, data = mail.uid("SEARCH", None, f"SINCE {since}")
+    if typ != "OK":
+        raise imaplib.IMAP4.error(f"UID SEARCH failed: {data}")
+    return sorted(_parse_uids(data))
+
+
+def fetch_headers(mail: imaplib.IMAP4, uids: list[int], batch_size: int = 0):
+    """
+    Phase one. Yield (uid_chunk, [{"uid", "headers", "bodystructure"}]) per batch,
+    one UID FETCH per batch.
+    """
+    batch_size = batch_size or config.IMAP_FETCH_BATCH
+    items = f"(UID BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})])"
+    for i in range(0, len(uids), batch_size):
+        chunk = uids[i:i + batch_size]
+        typ, data = mail.uid("FETCH", uid_set(chunk), items)
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"UID FETCH failed: {data}")
+        messages = []
+        for entry in parse_fetch(data):
+            if "UID" not in entry:
+                continue
+            messages.append({
+                "uid": int(entry["UID"]),
+                "headers": _section(entry, "BODY[HEADER") or b"",
+                "bodystructure": entry.get("BODYSTRUCTURE"),
+            })
+        messages.sort(key=lambda m: m["uid"])
+        yield chunk, messages
+
+
+def fetch_text_parts(mail: imaplib.IMAP4, wanted: dict, max_bytes: int = 0) -> dict:
+    """
+    Phase two. wanted = {uid: part} with parts from find_text_part().
+    Fetches at most max_bytes of each part (one command per distinct section)
+    and returns {uid: decoded text}.
+    """
+    max_bytes = max_bytes or config.IMAP_BODY_FETCH_BYTES
+    by_section = {}
+    for uid, part in wanted.items():
+        by_section.setdefault(part["section"], []).append(uid)
+
+    texts = {}
+    for section, uids in by_section.items():
+        typ, data = mail.uid("FETCH", uid_set(uids), f"(UID BODY.PEEK[{section}]<0.{max_bytes}>)")
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"UID FETCH failed: {data}")
+        for entry in parse_fetch(data):
+            uid = int(entry.get("UID", 0))
+            if uid not in wanted:
+                continue
+            raw = _section(entry, f"BODY[{section}]") or b""
+            part = wanted[uid]
+            texts[uid] = decode_part(raw, part["encoding"], part["charset"])
+    return texts
+
+
+def fetch_messages(mail: imaplib.IMAP4, uids: list[int], max_bytes: int) -> dict:
+    """{uid: first max_bytes of the raw message}, one UID FETCH for all uids."""
+    if not uids:
+        return {}
+    typ, data = mail.uid("FETCH", uid_set(uids), f"(UID BODY.PEEK[]<0.{max_bytes}>)")
+    if typ != "OK":
+        raise imaplib.IMAP4.error(f"UID FETCH failed: {data}")
+    raw = {}
+    for entry in parse_fetch(data):
+        if "UID" in entry:
+            raw[int(entry["UID"])] = _section(entry, "BODY[]") or b""
+    return raw
+
+
+def is_delivery_report(bodystructure) -> bool:
+    """True for a multipart/report BODYSTRUCTURE carrying delivery status (a DSN / bounce)."""
+    if not isinstance(bodystructure, list) or not bodystructure or not isinstance(bodystructure[0], list):
+        return False
+    # Child parts come first, then the multipart subtype and its parameters
+    i = next((i for i, n in enumerate(bodystructure) if not isinstance(n, list)), len(bodystructure))
+    if i >= len(bodystructure) or _lower(bodystructure[i]) != "report":
+        return False
+    params = _params(bodystructure[i + 1]) if i + 1 < len(bodystructure) else {}
+    return _lower(params.get("report-type", "delivery-status")) == "delivery-status"
+
+
+def find_text_part(bodystructure) -> dict | None:
+    """
+    First text/plain leaf of a BODYSTRUCTURE (falls back to the first text/*).
+    Returns {"section", "encoding", "charset", "size"} or None.
+    """
+    leaves = list(_leaves(bodystructure, ""))
+    for want_plain in (True, False):
+        for section, node in leaves:
+            mtype = _lower(node[0])
+            subtype = _lower(node[1])
+            if mtype != "text" or (want_plain and subtype != "plain"):
+                continue
+            params = _params(node[2]) if len(node) > 2 else {}
+            return {
+                "section": section,
+                "encoding": _lower(node[5]) if len(node) > 5 else "7bit",
+                "charset": params.get("charset", ""),
+                "size": _int(node[6]) if len(node) > 6 else 0,
+            }
+    return None
+
+
+def decode_part(raw: bytes, encoding: str, charset: str) -> str:
+    """Decode a (possibly truncated) body part, never crash."""
+    try:
+        if encoding == "base64":
+            compact = b"".join(raw.split())
+            data = base64.b64decode(compact[:len(compact) // 4 * 4])
+        elif encoding == "quoted-printable":
+            # A partial fetch can cut an escape sequence in half
+            data = quopri.decodestring(re.sub(rb"=[0-9A-Fa-f]?$", b"", raw))
+        else:
+            data = raw
+    except (binascii.Error, ValueError):
+        data = raw
+    try:
+        return data.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def parse_fetch(data) -> list[dict]:
+    """
+    Parse imaplib FETCH response data into one dict per message, e.g.
+    {"UID": "5", "BODYSTRUCTURE": [...], "BODY[HEADER.FIELDS (FROM)]": b"..."}.
+    Parenthesized lists become Python lists, NIL becomes None, literals stay bytes.
+    """
+    chunks = []
+    for item in data or []:
+        if isinstance(item, tuple):
+            chunks.append(_LITERAL_RE.sub(b"", item[0].rstrip()))
+            chunks.append(_Literal(item[1]))
+        elif isinstance(item, bytes):
+            chunks.append(item)
+
+    messages = []
+    for node in _parse_tokens(chunks):
+        if not isinstance(node, list):
+            continue  # message sequence number
+        entry = {}
+        for i in range(0, len(node) - 1, 2):
+            key = node[i]
+            if isinstance(key, str):
+                entry[key.upper()] = node[i + 1]
+        messages.append(entry)
+    return messages
+
+
+class _Literal:
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _parse_tokens(chunks) -> list:
+    stack = [[]]
+    for chunk in chunks:
+        if isinstance(chunk, _Literal):
+            stack[-1].append(chunk.data)
+            continue
+        i, n = 0, len(chunk)
+        while i < n:
+            c = chunk[i:i + 1]
+            if c in (b" ", b"\r", b"\n"):
+                i += 1
+            elif c == b"(":
+                stack.append([])
+                i += 1
+            elif c == b")":
+                if len(stack) > 1:
+                    done = stack.pop()
+                    stack[-1].append(done)
+                i += 1
+            elif c == b'"':
+                j = i + 1
+                buf = bytearray()
+                while j < n and chunk[j:j + 1] != b'"':
+                    if chunk[j:j + 1] == b"\\":
+                        j += 1
+                    buf += chunk[j:j + 1]
+                    j += 1
+                stack[-1].append(buf.decode("utf-8", errors="replace"))
+                i = j + 1
+            else:
+                # Atom; section specs like BODY[HEADER.FIELDS (FROM)]<0> stay one token
+                j = i
+                depth = 0
+                while j < n:
+                    ch = chunk[j:j + 1]
+                    if ch == b"[":
+                        depth += 1
+                    elif ch == b"]":
+                        depth -= 1
+                    elif depth == 0 and ch in (b" ", b"(", b")"):
+                        break
+                    j += 1
+                atom = chunk[i:j].decode("utf-8", errors="replace")
+                stack[-1].append(None if atom.upper() == "NIL" else atom)
+                i = j
+    while len(stack) > 1:  # tolerate a truncated response
+        done = stack.pop()
+        stack[-1].append(done)
+    return stack[0]
+
+
+def _leaves(node, section: str):
+    """Yield (section, leaf) for every non-multipart part, in IMAP part numbering."""
+    if not isinstance(node, list) or not node:
+        return
+    if isinstance(node[0], list):
+        idx = 0
+        for child in node:
+            if not isinstance(child, list):
+                break  # multipart subtype + extension data
+            idx += 1
+            yield from _leaves(child, f"{section}.{idx}" if section else str(idx))
+        return
+    yield section or "1", node
+
+
+def _section(entry: dict, prefix: str):
+    for key, value in entry.items():
+        if key.startswith(prefix):
+            return value if isinstance(value, bytes) else (value or "").encode()
+    return None
+
+
+def _params(node) -> dict:
+    if not isinstance(node, list):
+        return {}
+    return {_lower(node[i]): node[i + 1] for i in range(0, len(node) - 1, 2) if isinstance(node[i], str)}
+
+
+def _lower(value) -> str:
+    return value.lower() if isinstance(value, str) else ""
+
+
+def _int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def supports_idle(mail: imaplib.IMAP4) -> bool:
+    typ, data = mail.capability()
+    return typ == "OK" and bool(data) and b"IDLE" in (data[0] or b"").upper().split()
+
+
+def idle(mail: imaplib.IMAP4, timeout: float, stop=None, poll: float = 1.0) -> bool:
+    """
+    RFC 2177 IDLE until the server announces new mail (EXISTS), `timeout`
+    seconds pass, or `stop` (a threading.Event) is set. Returns True on new mail.
+
+    imaplib (< 3.14) has no IDLE, so this talks to the socket directly with its
+    own line buffer and leaves imaplib's reader untouched; the tagged reply to
+    DONE is consumed here too.
+    """
+    sock = mail.socket()
+    tag = mail._new_tag()
+    mail.tagged_commands.pop(tag, None)  # we read the completion ourselves
+    reader = _LineReader(sock)
+    old_timeout = sock.gettimeout()
+    sock.settimeout(poll)
+    new_mail = False
+    try:
+        mail.send(tag + b" IDLE\r\n")
+        line = reader.readline(deadline=time.monotonic() + 30)
+        if not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not (stop is not None and stop.is_set()):
+            line = reader.readline(deadline=min(deadline, time.monotonic() + poll))
+            if not line:
+                continue
+            if line.startswith(b"* BYE"):
+                raise imaplib.IMAP4.abort(f"Server closed connection: {line!r}")
+            if line.startswith(b"*") and line.rstrip().upper().endswith(b"EXISTS"):
+                new_mail = True
+                break
+
+        mail.send(b"DONE\r\n")
+        done_by = time.monotonic() + 30
+        while True:
+            line = reader.readline(deadline=done_by)
+            if line.startswith(tag):
+                if b" OK" not in line.upper():
+                    raise imaplib.IMAP4.error(f"IDLE failed: {line!r}")
+                break
+            if not line and time.monotonic() >= done_by:
+                raise imaplib.IMAP4.abort("No response to DONE")
+            if line.startswith(b"*") and line.rstrip().upper().endswith(b"EXISTS"):
+                new_mail = True
+    finally:
+        sock.settimeout(old_timeout)
+    return new_mail
+
+
+class _LineReader:
+    """CRLF line reader straight off the socket, with a deadline."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buf = b""
+
+    def readline(self, deadline: float) -> bytes:
+        """A full line, or b"" if the deadline passed first."""
+        while b"\n" not in self.buf:
+            if time.monotonic() >= deadline:
+                return b""
+            try:
+                data = self.sock.recv(4096)
+            except (socket.timeout, TimeoutError):
+                continue
+            if not data:
+                raise imaplib.IMAP4.abort("Connection closed during IDLE")
+            self.buf += data
+        line, self.buf = self.buf.split(b"\n", 1)
+        return line + b"\n"
+
+
+def uid_set(uids: list[int]) -> str:
+    """[1, 2, 3, 7, 9, 10] -> '1:3,7,9:10'."""
+    parts = []
+    start = prev = None
+    for u in sorted(set(uids)):
+        if start is None:
+            start = prev = u
+        elif u == prev + 1:
+            prev = u
+        else:
+            parts.append(f"{start}:{prev}" if prev != start else str(start))
+            start = prev = u
+    if start is not None:
+        parts.append(f"{start}:{prev}" if prev != start else str(start))
+    return ",".join(parts)
+
+
+def safe_logout(mail):
+    """Logout from IMAP, never crash."""
+    try:
+        mail.logout()
+    except Exception:
+        pass
+
+
+def _parse_uids(data) -> list[int]:
+    if not data or not data[0]:
+        return []
+    return [int(x) for x in data[0].split()]
+
+
+def _quote(mailbox: str) -> str:
+    return mailbox if mailbox.isalnum() else '"' + mailbox.replace('"', '\\"') + '"'
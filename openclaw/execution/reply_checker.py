@@ -1,5 +1,21 @@
 """
-IMAP reply checker. Polls inbox for replies, matches to leads, classifies intent.
+IMAP reply checker. Syncs the inbox incrementally, matches replies to leads,
+classifies intent.
+
+Sync is by UID, not the \\Seen flag: imap_sync_state keeps UIDVALIDITY and the
+last processed UID per mailbox, and each run asks only for UID n+1:*.
+Each batch is fetched in two phases: threading headers + BODYSTRUCTURE for
+all messages, then a byte-limited text part only for messages matching a lead.
+Delivery status notifications (bounces) are parsed instead of matched: a hard
+bounce suppresses the address and cancels the lead's unsent drafts. An
+explicit opt-out ("unsubscribe", "remove me", a bare "STOP") puts the lead's
+email, phone and business on the do-not-contact list; other negative replies
+are left in `replies` for a human to handle.
+Replies are keyed on their inbound Message-ID, so re-reading mail that was
+already processed (crash before the UID mark moved, mail marked unread) is a
+no-op rather than a duplicate.
+
+check_replies does one sync and exits; watch_replies stays connected in IDLE.
 
 Matching priority:
   1. In-Reply-To / References headers → message_id stored on outreach_drafts
@@ -7,17 +23,25 @@ Matching priority:
 """
 
 import email
+import hashlib
 import imaplib
 import logging
+import random
 import re
+import signal
+import threading
 from email.header import decode_header
 
 from openclaw import config
 from openclaw.schemas import _id, _now
+from openclaw.execution import imap_client
+from openclaw.execution.bounces import parse_dsn, is_hard_bounce
+from openclaw.execution.thread_index import resolve_message_ids
 from openclaw.persistence.database import (
-    insert_reply, get_lead_id_by_email, get_lead_id_by_message_thread,
-    update_lead,
+    ingest_replies, get_lead_ids_by_emails, parse_message_ids,
+    get_imap_state, save_imap_state, record_bounces, get_lead,
 )
+from openclaw.persistence.suppression import SUPPRESSIONS
 
 log = logging.getLogger("openclaw.replies")
 
@@ -33,19 +57,23 @@ QUESTION_KEYWORDS = ["how much", "price", "cost", "what's included", "how does",
 OOO_KEYWORDS = ["out of office", "auto-reply", "away from", "on vacation",
                  "limited access", "currently unavailable", "automatic reply",
                  "i am currently out"]
+# Explicit opt-outs only: these suppress permanently, so no substring matches
+OPT_OUT = re.compile(r"\b(?:unsubscribe|remove me|take me off|do not contact)\b|^\W*stop\W*$",
+                     re.IGNORECASE | re.MULTILINE)
+_QUOTE_HEADER = re.compile(r"^\s*(?:On\b.*\bwrote:|-+\s*Original Message\s*-+)\s*$", re.IGNORECASE | re.MULTILINE)
 
 
 def check_replies() -> dict:
-    """Poll IMAP inbox for replies. Returns summary."""
+    """Sync new mail since the last run (by UID) and record replies. Returns summary."""
     try:
         config.require_imap()
     except config.ConfigError as e:
         return {"error": str(e), "found": 0}
 
+    mailbox = config.IMAP_MAILBOX
     try:
-        mail = imaplib.IMAP4_SSL(config.IMAP_HOST)
-        mail.login(config.IMAP_USER, config.IMAP_PASS)
-        mail.select("INBOX")
+        mail = imap_client.connect()
+        uidvalidity = imap_client.examine(mail, mailbox)
     except imaplib.IMAP4.error as e:
         log.error("IMAP auth failed — check IMAP_USER/IMAP_PASS: %s", e)
         return {"error": f"IMAP auth failed: {e}", "found": 0}
@@ -53,66 +81,260 @@ def check_replies() -> dict:
         log.error("IMAP connection failed: %s", e)
         return {"error": str(e), "found": 0}
 
-    # Search for recent unseen messages
     try:
-        _, message_ids = mail.search(None, "UNSEEN")
-        ids = message_ids[0].split() if message_ids[0] else []
+        return _sync_mailbox(mail, mailbox, uidvalidity)
+    finally:
+        imap_client.safe_logout(mail)
+
+
+def watch_replies(stop: threading.Event = None) -> dict:
+    """
+    Long-running: keep one IMAP connection in IDLE and sync within seconds of
+    new mail. Re-IDLEs every IMAP_IDLE_SECONDS, reconnects with exponential
+    backoff, and falls back to polling if the server has no IDLE.
+    Runs until `stop` is set (SIGINT/SIGTERM set it when run from the main thread).
+    """
+    try:
+        config.require_imap()
+    except config.ConfigError as e:
+        return {"error": str(e), "found": 0}
+
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+    mailbox = config.IMAP_MAILBOX
+    totals = {"found": 0, "skipped": 0, "bounced": 0, "reconnects": 0}
+    backoff = 1.0
+    while not stop.is_set():
+        mail = None
+        try:
+            mail = imap_client.connect()
+            uidvalidity = imap_client.examine(mail, mailbox)
+            can_idle = imap_client.supports_idle(mail)
+            log.info("Watching %s (%s)", mailbox, "IDLE" if can_idle else f"polling every {config.IMAP_POLL_SECONDS}s")
+            backoff = 1.0
+
+            new_mail = True  # catch up on anything that arrived while disconnected
+            while not stop.is_set():
+                if new_mail:
+                    result = _sync_mailbox(mail, mailbox, uidvalidity)
+                    if result.get("error"):
+                        raise imaplib.IMAP4.abort(result["error"])
+                    totals["found"] += result["found"]
+                    totals["skipped"] += result["skipped"]
+                    totals["bounced"] += result["bounced"]
+                if can_idle:
+                    new_mail = imap_client.idle(mail, config.IMAP_IDLE_SECONDS, stop)
+                else:
+                    stop.wait(config.IMAP_POLL_SECONDS)
+                    mail.noop()
+                    new_mail = True
+        except (imaplib.IMAP4.error, imaplib.IMAP4.abort, OSError) as e:
+            totals["reconnects"] += 1
+            wait = backoff * random.uniform(0.8, 1.2)
+            log.warning("IMAP watch error: %s — reconnecting in %.0fs", e, wait)
+            stop.wait(wait)
+            backoff = min(backoff * 2, 300.0)
+        finally:
+            if mail is not None:
+                imap_client.safe_logout(mail)
+
+    log.info("Reply watcher stopped: %s", totals)
+    return totals
+
+
+def _sync_mailbox(mail, mailbox: str, uidvalidity: int) -> dict:
+    """Process every message with a UID above the stored high-water mark."""
+    key = imap_client.sync_key(mailbox)
+    state = get_imap_state(key)
+    floor = 0
+
+    try:
+        if state and state["uidvalidity"] == uidvalidity:
+            last_uid = state["last_uid"]
+            uids = imap_client.uids_after(mail, last_uid)
+        else:
+            if state:
+                log.warning("UIDVALIDITY changed for %s (%s -> %s); resyncing last %d days",
+                            mailbox, state["uidvalidity"], uidvalidity, config.IMAP_INITIAL_SYNC_DAYS)
+            last_uid = 0
+            # Mail older than the window is never wanted: start the mark at the newest UID, even
+            # if the window is empty. Read before the search so nothing arriving in between is lost.
+            floor = imap_client.highest_uid(mail, mailbox)
+            uids = imap_client.uids_since(mail, config.IMAP_INITIAL_SYNC_DAYS)
     except Exception as e:
         log.error("IMAP search failed: %s", e)
-        _safe_logout(mail)
         return {"error": str(e), "found": 0}
 
     found = 0
     skipped = 0
-    for msg_id in ids:
-        try:
-            _, data = mail.fetch(msg_id, "(RFC822)")
-            if not data or not data[0] or not isinstance(data[0], tuple):
-                skipped += 1
-                continue
-            msg = email.message_from_bytes(data[0][1])
-
-            from_email = _extract_email(msg.get("From", ""))
-            subject = _safe_decode_header(msg.get("Subject", ""))
-            body = _extract_body(msg)
-            in_reply_to = msg.get("In-Reply-To", "").strip()
-            references = msg.get("References", "").strip()
-
-            # Match to a lead: try message threading first, then email
-            lead_id = get_lead_id_by_message_thread(in_reply_to, references)
-            if not lead_id:
-                lead_id = get_lead_id_by_email(from_email)
-            if not lead_id:
-                skipped += 1
-                continue
-
-            # Classify
-            reply_type = _classify(subject + " " + body)
-
-            insert_reply({
-                "id": _id(),
-                "lead_id": lead_id,
-                "from_email": from_email,
-                "subject": subject[:200],
-                "in_reply_to": in_reply_to[:200],
-                "raw_body": body[:2000],
-                "reply_type": reply_type,
-                "created_at": _now(),
-            })
-
-            # Update lead status + cancel pending drafts
-            update_lead(lead_id, lead_status="replied")
-            _cancel_pending_drafts(lead_id)
-
-            found += 1
-            log.info("Reply from %s: type=%s subj=%s", from_email, reply_type, subject[:60])
-
-        except Exception as e:
-            log.error("Error processing message %s: %s", msg_id, e)
-            skipped += 1
-
-    _safe_logout(mail)
-    return {"found": found, "skipped": skipped}
+    duplicates = 0
+    bounced = 0
+    try:
+        for chunk, headers in imap_client.fetch_headers(mail, uids):
+            # Phase one: match on headers only, one batched lookup for the whole chunk
+            parsed = []
+            reports = [item for item in headers if imap_client.is_delivery_report(item["bodystructure"])]
+            if reports:
+                bounced += _process_bounces(mail, reports)
+            for item in headers:
+                if item in reports:
+                    continue
+                try:
+                    parsed.append((item, email.message_from_bytes(item["headers"])))
+                except Exception as e:
+                    log.error("Error reading headers of UID %s: %s", item["uid"], e)
+                    skipped += 1
+            matched = []
+            for (item, msg), lead_id in zip(parsed, _match_leads([m for _, m in parsed])):
+                if lead_id:
+                    matched.append((item, msg, lead_id))
+                else:
+                    skipped += 1
+
+            # Phase two: text part of matched messages only, byte-limited
+            wanted = {}
+            for item, _, _ in matched:
+                part = imap_client.find_text_part(item["bodystructure"])
+                if part:
+                    wanted[item["uid"]] = part
+            bodies = imap_client.fetch_text_parts(mail, wanted) if wanted else {}
+
+            records = []
+            for item, msg, lead_id in matched:
+                try:
+                    records.append(_build_reply(msg, lead_id, bodies.get(item["uid"], "")))
+                except Exception as e:
+                    log.error("Error processing message UID %s: %s", item["uid"], e)
+                    skipped += 1
+            new = ingest_replies(records)
+            for r in new:
+                log.info("Reply from %s: type=%s subj=%s", r["from_email"], r["reply_type"], r["subject"][:60])
+            found += len(new)
+            _suppress_opt_outs([r for r in new if r["reply_type"] == "negative"])
+            duplicates += len(records) - len(new)
+            # Advance the high-water mark past the whole batch, even UIDs that vanished (expunged)
+            last_uid = max(last_uid, max(chunk))
+            save_imap_state(key, uidvalidity, last_uid)
+    except Exception as e:
+        log.error("IMAP fetch failed: %s", e)
+        return {"error": str(e), "found": found, "skipped": skipped, "duplicates": duplicates,
+                "bounced": bounced}
+
+    if not state or state["uidvalidity"] != uidvalidity:
+        save_imap_state(key, uidvalidity, max(last_uid, floor))
+    return {"found": found, "skipped": skipped, "duplicates": duplicates, "bounced": bounced}
+
+
+def _process_bounces(mail, reports: list) -> int:
+    """Suppress hard-bounced addresses from a batch of DSNs. Returns newly suppressed count."""
+    raw = imap_client.fetch_messages(mail, [r["uid"] for r in reports], config.IMAP_DSN_FETCH_BYTES)
+    failed = []
+    for uid, data in raw.items():
+        report = parse_dsn(data)
+        if not report:
+            continue
+        for rcpt in report["recipients"]:
+            if is_hard_bounce(rcpt):
+                failed.append((report["message_id"], rcpt))
+    if not failed:
+        return 0
+
+    # Our original Message-ID ties the bounce to its lead; fall back to the address
+    by_thread = resolve_message_ids([mid for mid, _ in failed if mid])
+    by_email = get_lead_ids_by_emails([rcpt["email"] for _, rcpt in failed])
+    bounces = []
+    for mid, rcpt in failed:
+        lead_id = by_thread.get(mid) or by_email.get(rcpt["email"])
+        bounces.append({
+            "email": rcpt["email"],
+            "lead_id": lead_id,
+            "reason": f"{rcpt['status']} {rcpt['diagnostic']}".strip(),
+        })
+        log.info("Hard bounce: %s (%s) lead=%s", rcpt["email"], rcpt["status"], lead_id or "?")
+    return record_bounces(bounces)
+
+
+def _suppress_opt_outs(replies: list[dict]):
+    """
+    Negative replies that opt out: never contact that business again, under any
+    lead id. Softer ones ("not right now") only stop this lead's drafts, like
+    any reply, and wait for a human in `replies`.
+    """
+    for r in replies:
+        if not _is_opt_out(r["raw_body"]):
+            log.info("Negative reply from %s, no opt-out: left for review", r["from_email"])
+            continue
+        lead = get_lead(r["lead_id"])
+        if lead:
+            SUPPRESSIONS.suppress_lead(lead, reason=f"Opt-out reply: {r['subject'][:80]}",
+                                       source="reply", emails=[r["from_email"]])
+            log.info("Do-not-contact: %s (opt-out reply)", lead.get("business_name", r["lead_id"]))
+
+
+def _is_opt_out(body: str) -> bool:
+    """Explicit opt-out in the reply's own text, ignoring the quoted message below it."""
+    quote = _QUOTE_HEADER.search(body)
+    if quote:
+        body = body[:quote.start()]
+    own = "\n".join(line for line in body.splitlines() if not line.lstrip().startswith(">"))
+    return bool(OPT_OUT.search(own))
+
+
+def _match_leads(msgs: list) -> list:
+    """
+    Lead id (or None) per message: message threading first, then sender address.
+    The whole batch costs at most one Message-ID query and one email query.
+    """
+    thread_ids = [
+        parse_message_ids(str(m.get("In-Reply-To", ""))) + parse_message_ids(str(m.get("References", "")))
+        for m in msgs
+    ]
+    by_thread = resolve_message_ids([mid for ids in thread_ids for mid in ids])
+    senders = [_extract_email(str(m.get("From", ""))) for m in msgs]
+    unthreaded = [
+        sender for ids, sender in zip(thread_ids, senders)
+        if not any(mid in by_thread for mid in ids)
+    ]
+    by_email = get_lead_ids_by_emails(unthreaded) if unthreaded else {}
+
+    leads = []
+    for ids, sender in zip(thread_ids, senders):
+        # In-Reply-To first (most reliable), then References in header order
+        lead_id = next((by_thread[mid] for mid in ids if mid in by_thread), None)
+        leads.append(lead_id or by_email.get(sender))
+    return leads
+
+
+def _build_reply(msg, lead_id: str, body: str) -> dict:
+    """Reply row for a matched message, keyed on its inbound Message-ID."""
+    from_email = _extract_email(msg.get("From", ""))
+    subject = _safe_decode_header(msg.get("Subject", ""))
+    in_reply_to = msg.get("In-Reply-To", "").strip()
+
+    return {
+        "id": _id(),
+        "lead_id": lead_id,
+        "from_email": from_email,
+        "subject": subject[:200],
+        "in_reply_to": in_reply_to[:200],
+        "raw_body": body[:2000],
+        "reply_type": _classify(subject + " " + body),
+        "message_id": _inbound_message_id(msg),
+        "created_at": _now(),
+    }
+
+
+def _inbound_message_id(msg) -> str:
+    """The message's own Message-ID, or a stable stand-in derived from its headers."""
+    ids = parse_message_ids(str(msg.get("Message-ID", "")))
+    if ids:
+        return ids[0][:200]
+    # Some autoresponders omit Message-ID; hash what identifies the message instead
+    key = "\n".join(str(msg.get(h, "")) for h in ("From", "Date", "Subject", "In-Reply-To"))
+    return "<" + hashlib.sha1(key.encode("utf-8", "replace")).hexdigest() + "@openclaw.invalid>"
 
 
 def _classify(text: str) -> str:
@@ -152,42 +374,3 @@ def _safe_decode_header(header) -> str:
         return " ".join(decoded)
     except Exception:
         return str(header)
-
-
-def _extract_body(msg) -> str:
-    """Extract plain text body from email, never crash."""
-    try:
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_content_type() == "text/plain":
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        charset = part.get_content_charset() or "utf-8"
-                        return payload.decode(charset, errors="replace")
-        else:
-            payload = msg.get_payload(decode=True)
-            if payload:
-                charset = msg.get_content_charset() or "utf-8"
-                return payload.decode(charset, errors="replace")
-    except Exception as e:
-        log.warning("Could not extract email body: %s", e)
-    return ""
-
-
-def _cancel_pending_drafts(lead_id: str):
-    """Cancel any unsent drafts for this lead."""
-    from openclaw.persistence.database import get_db
-    with get_db() as db:
-        db.execute(
-            "UPDATE outreach_drafts SET status='cancelled' "
-            "WHERE lead_id=? AND status IN ('draft', 'approved')",
-            (lead_id,),
-        )
-
-
-def _safe_logout(mail):
-    """Logout from IMAP, never crash."""
-    try:
-        mail.logout()
-    except Exception:
-        pass
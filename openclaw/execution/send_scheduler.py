@@ -0,0 +1,193 @@
+"""
+Send scheduler. Long-running loop that sends approved drafts when they are due.
+
+  1. Plan: approved drafts without a send time get scheduled_for slots spaced
+     across the business-hours window of the lead's metro (its local timezone).
+  2. Send: due drafts go through the outbox (email_sender.drain_outbox), after
+     reserving capacity from an atomic per-day counter so OUTREACH_DAILY_LIMIT
+     holds even with several schedulers sharing the DB.
+  3. Sleep until the next draft is due (one indexed MIN() query), never a
+     tight poll. A newly approved draft is picked up at the next wake-up,
+     at most MAX_SLEEP_SECONDS later.
+"""
+
+import logging
+import random
+import re
+import signal
+import threading
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from openclaw import config
+from openclaw.persistence.database import (
+    get_unscheduled_approved, get_last_scheduled_by_metro, set_draft_schedules,
+    next_outbox_due, reserve_sends, release_sends,
+)
+
+log = logging.getLogger("openclaw.send_scheduler")
+
+MAX_SLEEP_SECONDS = 300
+
+# Primary timezone per US state / DC. Good enough for "business hours".
+STATE_TZ = {
+    "AL": "America/Chicago", "AK": "America/Anchorage", "AZ": "America/Phoenix",
+    "AR": "America/Chicago", "CA": "America/Los_Angeles", "CO": "America/Denver",
+    "CT": "America/New_York", "DE": "America/New_York", "DC": "America/New_York",
+    "FL": "America/New_York", "GA": "America/New_York", "HI": "Pacific/Honolulu",
+    "ID": "America/Boise", "IL": "America/Chicago", "IN": "America/Indiana/Indianapolis",
+    "IA": "America/Chicago", "KS": "America/Chicago", "KY": "America/New_York",
+    "LA": "America/Chicago", "ME": "America/New_York", "MD": "America/New_York",
+    "MA": "America/New_York", "MI": "America/Detroit", "MN": "America/Chicago",
+    "MS": "America/Chicago", "MO": "America/Chicago", "MT": "America/Denver",
+    "NE": "America/Chicago", "NV": "America/Los_Angeles", "NH": "America/New_York",
+    "NJ": "America/New_York", "NM": "America/Denver", "NY": "America/New_York",
+    "NC": "America/New_York", "ND": "America/Chicago", "OH": "America/New_York",
+    "OK": "America/Chicago", "OR": "America/Los_Angeles", "PA": "America/New_York",
+    "RI": "America/New_York", "SC": "America/New_York", "SD": "America/Chicago",
+    "TN": "America/Chicago", "TX": "America/Chicago", "UT": "America/Denver",
+    "VT": "America/New_York", "VA": "America/New_York", "WA": "America/Los_Angeles",
+    "WV": "America/New_York", "WI": "America/Chicago", "WY": "America/Denver",
+}
+
+
+def metro_timezone(metro: str) -> ZoneInfo:
+    """'Denver CO' / 'Denver, CO' -> America/Denver. Falls back to SEND_DEFAULT_TZ."""
+    match = re.search(r"\b([A-Z]{2})\s*$", (metro or "").strip())
+    name = STATE_TZ.get(match.group(1)) if match else None
+    try:
+        return ZoneInfo(name or config.SEND_DEFAULT_TZ)
+    except ZoneInfoNotFoundError:
+        return ZoneInfo("UTC")
+
+
+def next_business_slot(when: datetime, tz: ZoneInfo) -> datetime:
+    """Earliest instant >= when (naive UTC) inside the send window in tz. Returns naive UTC."""
+    local = when.replace(tzinfo=timezone.utc).astimezone(tz)
+    start_h, end_h = config.SEND_WINDOW_START_HOUR, config.SEND_WINDOW_END_HOUR
+    days = set(config.SEND_DAYS) or set(range(7))
+    for _ in range(8):
+        opens = local.replace(hour=start_h, minute=0, second=0, microsecond=0)
+        closes = local.replace(hour=end_h, minute=0, second=0, microsecond=0)
+        if local.weekday() in days and local < closes:
+            slot = max(local, opens)
+            return slot.astimezone(timezone.utc).replace(tzinfo=None)
+        local = (local + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return when
+
+
+def _spacing_seconds() -> float:
+    if config.SEND_SPACING_SECONDS:
+        return config.SEND_SPACING_SECONDS
+    window = max(1, config.SEND_WINDOW_END_HOUR - config.SEND_WINDOW_START_HOUR) * 3600
+    return window / max(1, config.OUTREACH_DAILY_LIMIT)
+
+
+def plan_schedule(now: datetime = None) -> int:
+    """Give every unplanned approved draft a send slot. Returns how many were planned."""
+    now = now or datetime.utcnow()
+    drafts = get_unscheduled_approved()
+    if not drafts:
+        return 0
+
+    spacing = _spacing_seconds()
+    cursors = {}
+    for metro, last in get_last_scheduled_by_metro().items():
+        cursors[metro] = datetime.fromisoformat(last) + timedelta(seconds=spacing)
+
+    schedule = []
+    for d in drafts:
+        metro = d.get("metro", "")
+        tz = metro_timezone(metro)
+        cursor = max(cursors.get(metro, now), now)
+        slot = next_business_slot(cursor, tz)
+        # Jitter so sends don't land on a visibly regular grid
+        slot += timedelta(seconds=random.uniform(0, spacing * 0.2))
+        schedule.append((d["id"], slot.isoformat()))
+        cursors[metro] = slot + timedelta(seconds=spacing)
+
+    set_draft_schedules(schedule)
+    log.info("Planned %d drafts across %d metros", len(schedule), len({d.get("metro") for d in drafts}))
+    return len(schedule)
+
+
+def send_due(now: datetime = None) -> dict:
+    """Reserve daily capacity, send whatever is due, then hand back what went unused."""
+    from openclaw.execution.email_sender import drain_outbox
+
+    now = now or datetime.utcnow()
+    day = now.date().isoformat()
+    granted = reserve_sends(day, config.OUTBOX_BATCH_SIZE, config.OUTREACH_DAILY_LIMIT)
+    if not granted:
+        return {"sent": 0, "limit_reached": True}
+    result = {}
+    try:
+        result = drain_outbox(limit=granted)
+    finally:
+        release_sends(day, granted - result.get("sent", 0))
+    return result
+
+
+def _seconds_until_next(now: datetime) -> float:
+    due = next_outbox_due()
+    if due is None:
+        return MAX_SLEEP_SECONDS
+    if not due:
+        return 0.0
+    wait = (datetime.fromisoformat(due) - now).total_seconds()
+    return max(0.0, min(wait, MAX_SLEEP_SECONDS))
+
+
+def _seconds_until_tomorrow(now: datetime) -> float:
+    tomorrow = datetime(now.year, now.month, now.day) + timedelta(days=1)
+    return (tomorrow - now).total_seconds()
+
+
+def run_scheduler(stop: threading.Event = None, once: bool = False) -> dict:
+    """
+    Plan + send loop. Runs until `stop` is set (SIGINT/SIGTERM set it when run
+    from the main thread). once=True does a single plan/send pass.
+    """
+    try:
+        config.require_smtp()
+    except config.ConfigError as e:
+        log.error("Cannot send: %s", e)
+        return {"sent": 0, "error": str(e)}
+
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+    totals = {"planned": 0, "sent": 0, "failed": 0, "retrying": 0}
+    log.info("Send scheduler started (window %02d:00-%02d:00, limit %d/day)",
+             config.SEND_WINDOW_START_HOUR, config.SEND_WINDOW_END_HOUR, config.OUTREACH_DAILY_LIMIT)
+
+    while not stop.is_set():
+        totals["planned"] += plan_schedule()
+        now = datetime.utcnow()
+
+        result = send_due(now)
+        for key in ("sent", "failed", "retrying"):
+            totals[key] += result.get(key, 0)
+        if result.get("error"):
+            totals["error"] = result["error"]
+            break
+
+        if once:
+            break
+
+        now = datetime.utcnow()
+        if result.get("limit_reached"):
+            wait = _seconds_until_tomorrow(now)
+            log.info("Daily limit of %d reached; sleeping until tomorrow", config.OUTREACH_DAILY_LIMIT)
+        elif result.get("total") or result.get("deferred"):
+            # Still draining (or sender quotas hit): go again right away / after a short pause
+            wait = 1.0 if not result.get("deferred") else MAX_SLEEP_SECONDS
+        else:
+            wait = _seconds_until_next(now)
+        # Floor of 1s: whatever next_outbox_due reports, never a busy loop
+        stop.wait(max(wait, 1.0))
+
+    log.info("Send scheduler stopped: %s", totals)
+    return totals
@@ -0,0 +1,83 @@
+"""
+Message-ID -> lead index for reply threading.
+
+An in-process LRU of recently sent Message-IDs sits in front of
+outreach_drafts.message_id. It is primed once from the DB with the most
+recent sends and fed by the sender as messages go out, so most replies
+resolve without touching SQLite. Misses for a whole fetch batch go to the
+DB in a single IN (...) query.
+"""
+
+import threading
+from collections import OrderedDict
+
+from openclaw import config
+from openclaw.persistence.database import (
+    get_lead_ids_by_message_ids, get_recent_sent_message_ids,
+)
+
+
+class ThreadIndex:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._map = OrderedDict()
+        self._lock = threading.Lock()
+        self._primed = False
+        self.hits = 0
+        self.misses = 0
+
+    def remember(self, message_id: str, lead_id: str):
+        if not message_id or not lead_id:
+            return
+        with self._lock:
+            self._put(message_id, lead_id)
+
+    def resolve(self, message_ids: list[str]) -> dict:
+        """{message_id: lead_id} for every id that belongs to a sent draft."""
+        self._prime()
+        found = {}
+        missing = []
+        with self._lock:
+            for mid in dict.fromkeys(message_ids):
+                lead_id = self._map.get(mid)
+                if lead_id is None:
+                    missing.append(mid)
+                    continue
+                self._map.move_to_end(mid)
+                found[mid] = lead_id
+        self.hits += len(found)
+        self.misses += len(missing)
+        if missing:
+            from_db = get_lead_ids_by_message_ids(missing)
+            with self._lock:
+                for mid, lead_id in from_db.items():
+                    self._put(mid, lead_id)
+            found.update(from_db)
+        return found
+
+    def _prime(self):
+        if self._primed:
+            return
+        recent = get_recent_sent_message_ids(self.capacity)
+        with self._lock:
+            for mid, lead_id in recent:
+                self._put(mid, lead_id)
+            self._primed = True
+
+    def _put(self, message_id: str, lead_id: str):
+        self._map[message_id] = lead_id
+        self._map.move_to_end(message_id)
+        while len(self._map) > self.capacity:
+            self._map.popitem(last=False)
+
+
+_INDEX = ThreadIndex(config.THREAD_INDEX_SIZE)
+
+
+def remember_sent(message_id: str, lead_id: str):
+    """Called by the sender after a successful send."""
+    _INDEX.remember(message_id, lead_id)
+
+
+def resolve_message_ids(message_ids: list[str]) -> dict:
+    return _INDEX.resolve(message_ids)
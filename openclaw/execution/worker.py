@@ -0,0 +1,179 @@
+"""
+Job worker. Pulls per-lead agent work from the jobs table so several
+processes (or machines sharing the DB file) can drain a backlog in parallel.
+
+  jobs: queued -> running (leased: lease_owner, lease_expires) -> done
+                       |-> queued again, run_after = now + backoff (error)
+                       |-> failed (JOB_MAX_ATTEMPTS reached)
+
+A worker that dies mid-job leaves it `running`; once the lease expires any
+worker reclaims it, as another attempt. Each finished stage queues the next
+one for its lead:
+
+  prospect {category, metro} -> qualify {lead_id} -> build {lead_id} -> draft {lead_id}
+"""
+
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+from datetime import datetime, timedelta
+
+from openclaw import config
+from openclaw.schemas import _id
+from openclaw.observability.logging_setup import log_context
+from openclaw.persistence.database import (
+    enqueue_jobs, claim_jobs, finish_job, release_jobs, get_lead,
+)
+
+log = logging.getLogger("openclaw.worker")
+
+KINDS = ("prospect", "qualify", "build", "draft")
+
+_MAX_BACKOFF_SECONDS = 3600
+
+
+def lead_job(kind: str, lead_id: str) -> dict:
+    return {"kind": kind, "payload": {"lead_id": lead_id}, "dedup_key": lead_id}
+
+
+class Handlers:
+    """One agent instance per worker process, created on first use."""
+
+    def __init__(self):
+        self._agents = {}
+
+    def _agent(self, name: str):
+        if name not in self._agents:
+            if name == "prospector":
+                from openclaw.agents.prospector import ProspectorAgent as cls
+            elif name == "qualifier":
+                from openclaw.agents.qualifier import QualifierAgent as cls
+            elif name == "builder":
+                from openclaw.agents.builder import BuilderAgent as cls
+            else:
+                from openclaw.agents.outreach import OutreachAgent as cls
+            self._agents[name] = cls()
+        return self._agents[name]
+
+    def run(self, job: dict) -> str:
+        """Execute one job and queue its follow-on work. Returns a short outcome."""
+        kind, payload = job["kind"], job["payload"]
+        if kind == "prospect":
+            count = 0
+            # Queue each lead as it lands so other workers can start qualifying right away
+            for lead in self._agent("prospector").iter_leads(payload["category"], payload["metro"]):
+                enqueue_jobs([lead_job("qualify", lead["id"])])
+                count += 1
+            return f"{count} leads"
+
+        lead = get_lead(payload.get("lead_id", ""))
+        if not lead:
+            return "lead gone"
+        if kind == "qualify":
+            if lead["lead_status"] != "new":
+                return f"skipped ({lead['lead_status']})"
+            if not self._agent("qualifier").qualify_lead(lead):
+                return "not qualified"
+            enqueue_jobs([lead_job("build", lead["id"])])
+            return "qualified"
+        if kind == "build":
+            if lead["lead_status"] != "qualified":
+                return f"skipped ({lead['lead_status']})"
+            self._agent("builder").build_lead(lead)
+            enqueue_jobs([lead_job("draft", lead["id"])])
+            return "built"
+        if kind == "draft":
+            drafts = self._agent("outreach").draft_for([lead["id"]])
+            return "drafted" if drafts else "not eligible"
+        raise ValueError(f"Unknown job kind: {kind}")
+
+
+def enqueue(kind: str, lead_id: str = "", category: str = "", metro: str = "") -> int:
+    """Queue one job, or for lead kinds without a lead_id, the whole backlog for that stage."""
+    from openclaw.persistence.database import get_leads_by_status, get_outreach_candidates
+
+    if kind not in KINDS:
+        raise ValueError(f"Unknown job kind: {kind} (expected one of {', '.join(KINDS)})")
+    if kind == "prospect":
+        if not category or not metro:
+            raise ValueError("prospect jobs need --category and --metro")
+        return enqueue_jobs([{"kind": "prospect", "payload": {"category": category, "metro": metro},
+                              "dedup_key": f"{category}|{metro}"}])
+    if lead_id:
+        return enqueue_jobs([lead_job(kind, lead_id)])
+    if kind == "qualify":
+        leads = get_leads_by_status("new", limit=100000)
+    elif kind == "build":
+        leads = [l for l in get_leads_by_status("qualified", limit=100000) if not l.get("preview_url")]
+    else:
+        leads = get_outreach_candidates(limit=100000)
+    return enqueue_jobs([lead_job(kind, l["id"]) for l in leads])
+
+
+def run_worker(kinds: list[str], stop: threading.Event = None, once: bool = False) -> dict:
+    """
+    Claim and run jobs of `kinds` until `stop` is set (SIGINT/SIGTERM set it
+    when run from the main thread). once=True exits when nothing is due.
+    """
+    unknown = set(kinds) - set(KINDS)
+    if unknown:
+        return {"error": f"Unknown job kind(s): {', '.join(sorted(unknown))}", "done": 0}
+
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+    handlers = Handlers()
+    totals = {"done": 0, "retrying": 0, "failed": 0}
+    log.info("Worker started for %s", ", ".join(kinds))
+    while not stop.is_set():
+        owner = _lease_owner()
+        jobs = claim_jobs(owner, kinds, config.JOB_CLAIM_BATCH, config.JOB_LEASE_SECONDS,
+                          config.JOB_MAX_ATTEMPTS)
+        if not jobs:
+            if once:
+                break
+            stop.wait(config.JOB_POLL_SECONDS)
+            continue
+        try:
+            for job in jobs:
+                if stop.is_set():
+                    break
+                with log_context(run_id=job["id"], lead_id=job["payload"].get("lead_id", "")):
+                    totals[_run_job(handlers, job, owner)] += 1
+        finally:
+            # Jobs claimed but not started when stopping go straight back to the queue
+            release_jobs(owner)
+
+    log.info("Worker stopped: %s", totals)
+    return totals
+
+
+def _run_job(handlers: Handlers, job: dict, owner: str) -> str:
+    try:
+        outcome = handlers.run(job)
+    except Exception as e:
+        attempts = int(job.get("attempts") or 0) + 1
+        error_msg = str(e) or e.__class__.__name__
+        if attempts < config.JOB_MAX_ATTEMPTS:
+            delay = min(config.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), _MAX_BACKOFF_SECONDS)
+            retry_at = (datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.9, 1.1))).isoformat()
+            finish_job(job["id"], owner, status="queued", attempts=attempts, run_after=retry_at, error=error_msg)
+            log.warning("Job %s %s failed (attempt %d, retry at %s): %s",
+                        job["kind"], job["id"], attempts, retry_at[:19], error_msg)
+            return "retrying"
+        finish_job(job["id"], owner, status="failed", attempts=attempts, error=error_msg)
+        log.error("Job %s %s failed: %s", job["kind"], job["id"], error_msg)
+        return "failed"
+
+    finish_job(job["id"], owner, status="done", error="")
+    log.info("Job %s %s: %s", job["kind"], job["id"], outcome)
+    return "done"
+
+
+def _lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{_id()[:6]}"
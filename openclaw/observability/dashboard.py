@@ -6,7 +6,7 @@ from openclaw.persistence.database import (
     count_leads_by_status, count_drafts_by_status,
     get_reply_count, get_positive_reply_count,
     get_conversion_stats, get_total_roi_pipeline,
-    get_closed_revenue,
+    get_closed_revenue, get_stage_timings,
 )
 
 
@@ -18,6 +18,7 @@ def print_dashboard():
     conv = get_conversion_stats()
     roi_pipeline = get_total_roi_pipeline()
     closed_rev = get_closed_revenue()
+    timings = get_stage_timings()
 
     total_leads = sum(leads.values())
     new = leads.get("new", 0)
@@ -33,6 +34,7 @@ def print_dashboard():
     # Drafts by status
     d_draft = drafts.get("draft", 0)
     d_approved = drafts.get("approved", 0)
+    d_sending = drafts.get("sending", 0)
     d_sent = drafts.get("sent", 0)
     d_failed = drafts.get("failed", 0)
     d_cancelled = drafts.get("cancelled", 0)
@@ -66,9 +68,18 @@ def print_dashboard():
     print(f"  Est pipeline ROI   ${roi_pipeline:>7,}/mo  (qualified+draft_ready+approved+sent)")
     print(f"  Closed revenue     ${closed_rev:>7,.0f}")
     print()
+    print("  STAGE TIMING (hours in previous status)")
+    for status in ("qualified", "draft_ready", "approved", "sent", "replied", "won"):
+        t = timings.get(status)
+        if t:
+            print(f"  -> {status:<15} avg {t['avg_hours']:>7}  max {t['max_hours']:>7}  (n={t['count']})")
+    if not timings:
+        print("  No status changes recorded yet")
+    print()
     print("  DRAFT QUEUE")
     print(f"    Pending approval {d_draft:>5}")
     print(f"    Approved         {d_approved:>5}")
+    print(f"    Sending          {d_sending:>5}")
     print(f"    Sent             {d_sent:>5}")
     print(f"    Failed           {d_failed:>5}")
     print(f"    Cancelled        {d_cancelled:>5}")
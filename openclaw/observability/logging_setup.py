@@ -1,25 +1,159 @@
 """
 Logging setup. File + console output.
+
+LOG_FORMAT=text (default): plain lines, written synchronously.
+LOG_FORMAT=json: the file gets one JSON object per line; the console stays
+plain text. Records go through a QueueHandler and are written by a
+QueueListener thread, so disk and terminal I/O stay off the hot loops.
+
+Either way the file rotates (LOG_ROTATE: size or time), and records carry
+agent / lead_id / run_id from log_context() — contextvars, so concurrent
+pipeline threads each log their own lead.
+
+Setup is cheap: the log directory, the file and logging.handlers are only
+touched when the first record is written, so commands that don't log
+(dashboard, queue) skip them.
 """
 
+import atexit
+import contextvars
+import json
 import logging
-from pathlib import Path
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
 from openclaw import config
 
+CONTEXT_FIELDS = ("agent", "lead_id", "run_id")
+
+_context = contextvars.ContextVar("openclaw_log_context", default={})
+_listener = None
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields (agent, lead_id, run_id) to every record logged inside the block."""
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the current log_context onto the record. Must run in the thread that
+    logs (on the QueueHandler in JSON mode): the context lives in contextvars,
+    which the listener thread doesn't see.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = _context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, ctx.get(field, ""))
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, "")
+            if value:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
 
 def setup_logging():
-    log_dir = Path(config.LOG_DIR)
-    log_dir.mkdir(exist_ok=True)
-
-    fmt = "%(asctime)s %(levelname)-8s %(name)s  %(message)s"
-    datefmt = "%Y-%m-%d %H:%M:%S"
-
-    logging.basicConfig(
-        level=getattr(logging, config.LOG_LEVEL.upper(), logging.INFO),
-        format=fmt,
-        datefmt=datefmt,
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(log_dir / "openclaw.log"),
-        ],
-    )
+    root = logging.getLogger()
+    if root.handlers:
+        return  # already configured
+
+    text = logging.Formatter("%(asctime)s %(levelname)-8s %(name)s  %(message)s", "%Y-%m-%d %H:%M:%S")
+    console = logging.StreamHandler()
+    console.setFormatter(text)
+    logfile = _LazyFileHandler(os.path.join(config.LOG_DIR, "openclaw.log"))
+    logfile.setFormatter(JsonFormatter() if config.LOG_FORMAT == "json" else text)
+
+    root.setLevel(getattr(logging, config.LOG_LEVEL.upper(), logging.INFO))
+    if config.LOG_FORMAT == "json":
+        _start_listener(root, console, logfile)
+    else:
+        for h in (console, logfile):
+            h.addFilter(ContextFilter())
+            root.addHandler(h)
+
+
+class _LazyFileHandler(logging.Handler):
+    """Rotating file handler that creates LOG_DIR and opens the file on the first record."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._handler = None
+
+    def emit(self, record: logging.LogRecord):
+        if self._handler is None:
+            from logging import handlers
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if config.LOG_ROTATE == "time":
+                self._handler = handlers.TimedRotatingFileHandler(
+                    self.path, when=config.LOG_ROTATE_WHEN, backupCount=config.LOG_BACKUP_COUNT,
+                    encoding="utf-8")
+            else:
+                self._handler = handlers.RotatingFileHandler(
+                    self.path, maxBytes=config.LOG_MAX_BYTES, backupCount=config.LOG_BACKUP_COUNT,
+                    encoding="utf-8")
+            self._handler.setFormatter(self.formatter)
+        # Serialized by this handler's lock (held by handle())
+        self._handler.emit(record)
+
+    def close(self):
+        if self._handler is not None:
+            self._handler.close()
+        super().close()
+
+
+def _start_listener(root: logging.Logger, *outputs: logging.Handler):
+    global _listener
+    import queue
+    from logging import handlers
+
+    class _QueueHandler(handlers.QueueHandler):
+        """Merges args and renders tracebacks before queueing, but leaves formatting to the listener."""
+
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            record.message = record.getMessage()
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.msg = record.message
+            record.args = None
+            record.exc_info = None
+            return record
+
+    records = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(ContextFilter())
+    root.addHandler(handler)
+    _listener = handlers.QueueListener(records, *outputs, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_stop_listener)
+
+
+def _stop_listener():
+    """Flush whatever is still queued (runs at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,191 @@
+"""
+In-process metrics with Prometheus text exposition. Stdlib only.
+
+Counters and histograms are striped: each thread is pinned to one of a few
+stripes, each with its own lock, so concurrent request threads almost never
+contend. Scrapes merge the stripes.
+"""
+
+import itertools
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRIPES = 8
+_next_stripe = itertools.count()
+_local = threading.local()
+
+
+def _stripe() -> int:
+    idx = getattr(_local, "stripe", None)
+    if idx is None:
+        idx = next(_next_stripe) % _STRIPES
+        _local.stripe = idx
+    return idx
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._stripes = [(threading.Lock(), {}) for _ in range(_STRIPES)]
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter: inc() only. For values that go down, use Gauge."""
+
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1):
+        lock, data = self._stripes[_stripe()]
+        with lock:
+            data[label_values] = data.get(label_values, 0) + amount
+
+    def values(self) -> dict:
+        merged = {}
+        for lock, data in self._stripes:
+            with lock:
+                items = list(data.items())
+            for key, v in items:
+                merged[key] = merged.get(key, 0) + v
+        return merged
+
+    def total(self) -> float:
+        return sum(self.values().values())
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, v in sorted(self.values().items()):
+            lines.append(f"{self.name}{_fmt_labels(self.labels, key)} {_fmt_value(v)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Up/down gauge (e.g. in-flight requests). Use inc()/dec()."""
+
+    kind = "gauge"
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values):
+        # Find the first bucket the value fits; counts are made cumulative at render time.
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        lock, data = self._stripes[_stripe()]
+        with lock:
+            entry = data.get(label_values)
+            if entry is None:
+                entry = data[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][idx] += 1
+            entry[1] += value
+
+    def render(self) -> list[str]:
+        merged = {}
+        for lock, data in self._stripes:
+            with lock:
+                items = [(k, (list(v[0]), v[1])) for k, v in data.items()]
+            for key, (counts, total) in items:
+                m = merged.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                m[0] = [a + b for a, b in zip(m[0], counts)]
+                m[1] += total
+
+        lines = self._header()
+        for key, (counts, total) in sorted(merged.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = f'le="{_fmt_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, key)} {_fmt_value(total)}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class _CallbackGauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, fn):
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+
+    def render(self) -> list[str]:
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_fmt_value(value)}",
+        ]
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders them for a scrape."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._metrics = []
+
+    def counter(self, name: str, help_text: str, labels: tuple = ()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: tuple = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: tuple = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def gauge_fn(self, name: str, help_text: str, fn):
+        """Gauge evaluated at scrape time (uptime, cache sizes, ...)."""
+        return self._add(_CallbackGauge(name, help_text, fn))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
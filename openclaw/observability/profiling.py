@@ -0,0 +1,320 @@
+"""
+Profiling for CLI commands (cli.py --profile / --profile-sql). Stdlib only.
+
+  cprofile  deterministic, main thread only; writes a .prof for pstats/snakeviz
+  sample    wall-clock stack sampling of every thread (pipeline workers
+            included); writes collapsed stacks (.folded) for flamegraph tools
+  sql       every statement run through get_db, timed, with its call site;
+            reports the slowest and most frequent — N+1 loops stand out as
+            one cheap query with a huge count from a single line
+
+Files go to PROFILE_DIR; a top-N summary is printed to stderr.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from openclaw import config
+
+_DB_MODULE = os.path.join("persistence", "database.py")
+
+
+@contextmanager
+def profile_command(command: str, mode: str = "", sql: bool = False, top: int = 20):
+    """Profile the enclosed block as `command` with the given mode(s)."""
+    if not mode and not sql:
+        yield
+        return
+
+    out_dir = Path(config.PROFILE_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / f"{command}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+    sql_profiler = SqlProfiler() if sql else None
+    if sql_profiler:
+        sql_profiler.install()
+    profiler = cProfile.Profile() if mode == "cprofile" else None
+    sampler = Sampler(config.PROFILE_SAMPLE_MS / 1000) if mode == "sample" else None
+    if sampler:
+        sampler.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            path = stem.with_suffix(".prof")
+            profiler.dump_stats(path)
+            _report(f"cProfile: {path}", _cprofile_summary(profiler, top))
+        if sampler:
+            sampler.stop()
+            path = stem.with_suffix(".folded")
+            sampler.write_folded(path)
+            _report(f"Sampling profile: {path}", sampler.summary(top))
+        if sql_profiler:
+            sql_profiler.uninstall()
+            path = Path(f"{stem}-sql.json")
+            path.write_text(json.dumps(sql_profiler.stats(), indent=2))
+            _report(f"SQL profile: {path}", sql_profiler.summary(top))
+
+
+def _report(title: str, body: str):
+    print(f"\n=== {title}\n{body}", file=sys.stderr)
+
+
+def _cprofile_summary(profiler: cProfile.Profile, top: int) -> str:
+    buf = io.StringIO()
+    pstats.Stats(profiler, stream=buf).strip_dirs().sort_stats("cumulative").print_stats(top)
+    return buf.getvalue().strip()
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+class Sampler:
+    """Samples every thread's stack each `interval` seconds from a background thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, path: Path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def summary(self, top: int) -> str:
+        total = sum(self.stacks.values())
+        if not total:
+            return "no samples"
+        inclusive, own = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack[1:]):
+                inclusive[frame] += count
+        lines = [f"{self.samples} samples every {self.interval * 1000:.0f}ms, "
+                 f"{total} thread-stacks (wall clock, idle waits included)",
+                 f"{'incl %':>7} {'self %':>7}  function"]
+        for frame, count in inclusive.most_common(top):
+            lines.append(f"{100 * count / total:>7.1f} {100 * own[frame] / total:>7.1f}  {frame}")
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# SQL
+# ---------------------------------------------------------------------------
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def _normalize(sql: str) -> str:
+    return _IN_LIST.sub("(?, ...)", " ".join(sql.split()))
+
+
+def _call_site() -> str:
+    """'db_function <- caller.py:line' for the statement being executed."""
+    db_func = ""
+    frame = sys._getframe(2)  # skip this function and the connection wrapper
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.endswith(_DB_MODULE):
+            db_func = db_func or frame.f_code.co_name
+        elif not filename.endswith("contextlib.py"):
+            site = f"{os.path.basename(filename)}:{frame.f_lineno}"
+            return f"{db_func} <- {site}" if db_func else site
+        frame = frame.f_back
+    return db_func
+
+
+class _TimedCursor:
+    """
+    Cursor from a profiled execute(). SQLite steps through most of a SELECT's
+    rows while they are fetched, so the clock keeps running through fetches
+    and iteration; the total is recorded once the rows run out, the cursor is
+    closed, or it is dropped.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, elapsed: float, done):
+        self._cursor = cursor
+        self._elapsed = elapsed
+        self._done = done
+        if cursor.description is None:  # no result rows (INSERT, UPDATE, ...)
+            self._finish()
+
+    def _timed(self, fn, *args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._elapsed += time.perf_counter() - t0
+
+    def _finish(self):
+        if self._done:
+            done, self._done = self._done, None
+            done(self._elapsed)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is None:
+            self._finish()
+        return row
+
+    def fetchmany(self, size: int = None):
+        size = self._cursor.arraysize if size is None else size
+        rows = self._timed(self._cursor.fetchmany, size)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return self._timed(next, self._cursor)
+        except StopIteration:
+            self._finish()
+            raise
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __del__(self):
+        self._finish()
+
+
+class SqlProfiler:
+    """
+    Times every execute/executemany/executescript on connections opened by
+    get_db. A query's time includes fetching its rows (see _TimedCursor).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def install(self):
+        from openclaw.persistence import database
+        database.set_connection_factory(self._connection_class())
+
+    def uninstall(self):
+        from openclaw.persistence import database
+        database.set_connection_factory(sqlite3.Connection)
+
+    def record(self, sql: str, elapsed: float, site: str, rows: int = 1):
+        key = _normalize(sql)
+        with self._lock:
+            s = self._stats.setdefault(key, {"count": 0, "rows": 0, "total_s": 0.0, "max_s": 0.0,
+                                             "sites": Counter()})
+            s["count"] += 1
+            s["rows"] += rows
+            s["total_s"] += elapsed
+            s["max_s"] = max(s["max_s"], elapsed)
+            s["sites"][site] += 1
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            items = [(sql, dict(s, sites=Counter(s["sites"]))) for sql, s in self._stats.items()]
+        return sorted(
+            ({"sql": sql, "count": s["count"], "rows": s["rows"], "total_s": round(s["total_s"], 4),
+              "max_ms": round(1000 * s["max_s"], 2), "sites": dict(s["sites"].most_common())}
+             for sql, s in items),
+            key=lambda s: -s["total_s"],
+        )
+
+    def summary(self, top: int) -> str:
+        stats = self.stats()
+        if not stats:
+            return "no statements"
+        total = sum(s["total_s"] for s in stats)
+        lines = [f"{sum(s['count'] for s in stats)} statements, {len(stats)} distinct, {total:.3f}s total"]
+        for title, ranked in (("Slowest (total time)", stats),
+                              ("Most frequent", sorted(stats, key=lambda s: -s["count"]))):
+            lines.append(f"\n{title}:")
+            lines.append(f"{'count':>7} {'total s':>8} {'max ms':>8}  statement / top call site")
+            for s in ranked[:top]:
+                site = next(iter(s["sites"]), "")
+                lines.append(f"{s['count']:>7} {s['total_s']:>8.3f} {s['max_ms']:>8.2f}  {s['sql'][:100]}")
+                lines.append(f"{'':>26}  {site} ({s['sites'].get(site, 0)}x)")
+        return "\n".join(lines)
+
+    def _connection_class(self):
+        profiler = self
+
+        class ProfiledConnection(sqlite3.Connection):
+            def execute(self, sql, parameters=()):
+                site = _call_site()
+                t0 = time.perf_counter()
+                try:
+                    cursor = super().execute(sql, parameters)
+                except Exception:
+                    profiler.record(sql, time.perf_counter() - t0, site)
+                    raise
+                return _TimedCursor(cursor, time.perf_counter() - t0,
+                                    lambda elapsed: profiler.record(sql, elapsed, site))
+
+            def executemany(self, sql, seq_of_parameters):
+                rows = list(seq_of_parameters)
+                t0 = time.perf_counter()
+                try:
+                    return super().executemany(sql, rows)
+                finally:
+                    profiler.record(sql, time.perf_counter() - t0, _call_site(), rows=len(rows))
+
+            def executescript(self, sql_script):
+                t0 = time.perf_counter()
+                try:
+                    return super().executescript(sql_script)
+                finally:
+                    profiler.record("<script>", time.perf_counter() - t0, _call_site())
+
+        return ProfiledConnection
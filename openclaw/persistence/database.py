@@ -1,15 +1,22 @@
 """
-SQLite persistence. 4 tables: leads, outreach_drafts, replies, conversions.
+SQLite persistence. Core tables: leads, outreach_drafts, replies, conversions;
+plus bookkeeping for the sender (send_counters), reply sync (imap_sync_state),
+the do-not-contact list (suppressions), the worker queue (jobs), lead
+status history (lead_events, written by triggers) and agent timings
+(agent_runs).
 Simple functions, no ORM.
 """
 
 import json
 import logging
+import re
 import sqlite3
+import uuid
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from openclaw import config
+from openclaw.schemas import LEAD_TRANSITIONS, LeadStatus, lead_sources
 
 log = logging.getLogger("openclaw.db")
 
@@ -57,6 +64,10 @@ CREATE TABLE IF NOT EXISTS outreach_drafts (
     scheduled_for   TEXT DEFAULT '',
     sent_at         TEXT DEFAULT '',
     message_id      TEXT DEFAULT '',
+    sender_email    TEXT DEFAULT '',
+    attempts        INTEGER DEFAULT 0,
+    lease_owner     TEXT DEFAULT '',
+    lease_expires   TEXT DEFAULT '',
     error           TEXT DEFAULT '',
     created_at      TEXT DEFAULT ''
 );
@@ -72,9 +83,94 @@ CREATE TABLE IF NOT EXISTS replies (
     in_reply_to     TEXT DEFAULT '',
     raw_body        TEXT DEFAULT '',
     reply_type      TEXT DEFAULT 'other',
+    message_id      TEXT DEFAULT '',
     created_at      TEXT DEFAULT ''
 );
 
+CREATE TABLE IF NOT EXISTS imap_sync_state (
+    mailbox     TEXT PRIMARY KEY,
+    uidvalidity INTEGER DEFAULT 0,
+    last_uid    INTEGER DEFAULT 0,
+    updated_at  TEXT DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS suppressions (
+    kind        TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    reason      TEXT DEFAULT '',
+    source      TEXT DEFAULT '',
+    created_at  TEXT DEFAULT '',
+    PRIMARY KEY (kind, value)
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id              TEXT PRIMARY KEY,
+    kind            TEXT NOT NULL,
+    payload         TEXT DEFAULT '{}',
+    dedup_key       TEXT DEFAULT '',
+    status          TEXT DEFAULT 'queued',
+    lease_owner     TEXT DEFAULT '',
+    lease_expires   TEXT DEFAULT '',
+    attempts        INTEGER DEFAULT 0,
+    run_after       TEXT DEFAULT '',
+    error           TEXT DEFAULT '',
+    created_at      TEXT DEFAULT '',
+    updated_at      TEXT DEFAULT ''
+);
+
+-- Append-only status history. Triggers write it in the same transaction as the
+-- change itself, whoever makes it; seq only ever grows (AUTOINCREMENT never reuses).
+CREATE TABLE IF NOT EXISTS lead_events (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    lead_id     TEXT NOT NULL,
+    from_status TEXT DEFAULT '',
+    to_status   TEXT NOT NULL,
+    created_at  TEXT DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_lead_events_lead ON lead_events(lead_id, seq);
+
+CREATE TRIGGER IF NOT EXISTS trg_lead_events_insert AFTER INSERT ON leads
+BEGIN
+    INSERT INTO lead_events (lead_id, from_status, to_status, created_at)
+    VALUES (NEW.id, '', NEW.lead_status,
+            COALESCE(NULLIF(NEW.created_at, ''), strftime('%Y-%m-%dT%H:%M:%f', 'now')));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_lead_events_status AFTER UPDATE OF lead_status ON leads
+WHEN OLD.lead_status IS NOT NEW.lead_status
+BEGIN
+    INSERT INTO lead_events (lead_id, from_status, to_status, created_at)
+    VALUES (NEW.id, OLD.lead_status, NEW.lead_status,
+            COALESCE(NULLIF(NEW.updated_at, ''), strftime('%Y-%m-%dT%H:%M:%f', 'now')));
+END;
+
+-- Last seq each events_since consumer has processed
+CREATE TABLE IF NOT EXISTS event_checkpoints (
+    consumer    TEXT PRIMARY KEY,
+    seq         INTEGER DEFAULT 0,
+    updated_at  TEXT DEFAULT ''
+);
+
+-- One row per BaseAgent.run (or per agent in a pipeline run, cpu_s NULL);
+-- spans = {name: {count, total_s, p95_ms}}
+CREATE TABLE IF NOT EXISTS agent_runs (
+    id          TEXT PRIMARY KEY,
+    agent       TEXT NOT NULL,
+    started_at  TEXT DEFAULT '',
+    wall_s      REAL DEFAULT 0.0,
+    cpu_s       REAL,
+    ok          INTEGER DEFAULT 1,
+    error       TEXT DEFAULT '',
+    result      TEXT DEFAULT '',
+    spans       TEXT DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_agent_runs_agent ON agent_runs(agent, started_at);
+
+CREATE TABLE IF NOT EXISTS send_counters (
+    day         TEXT PRIMARY KEY,
+    sent        INTEGER DEFAULT 0
+);
+
 CREATE TABLE IF NOT EXISTS conversions (
     id          TEXT PRIMARY KEY,
     lead_id     TEXT REFERENCES leads(id),
@@ -85,9 +181,18 @@ CREATE TABLE IF NOT EXISTS conversions (
 """
 
 
+# Connection class get_db opens; observability.profiling swaps in a timing subclass for --profile-sql
+_connection_factory = sqlite3.Connection
+
+
+def set_connection_factory(factory):
+    global _connection_factory
+    _connection_factory = factory
+
+
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(config.DB_PATH)
+    conn = sqlite3.connect(config.DB_PATH, factory=_connection_factory)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     try:
@@ -112,10 +217,15 @@ def _ensure_columns():
     migrations = [
         ("replies", "subject", "TEXT DEFAULT ''"),
         ("replies", "in_reply_to", "TEXT DEFAULT ''"),
+        ("replies", "message_id", "TEXT DEFAULT ''"),
         ("leads", "last_review_date", "TEXT DEFAULT ''"),
         ("leads", "review_excerpt", "TEXT DEFAULT ''"),
         ("leads", "review_excerpt_author", "TEXT DEFAULT ''"),
         ("leads", "review_excerpt_date", "TEXT DEFAULT ''"),
+        ("outreach_drafts", "sender_email", "TEXT DEFAULT ''"),
+        ("outreach_drafts", "attempts", "INTEGER DEFAULT 0"),
+        ("outreach_drafts", "lease_owner", "TEXT DEFAULT ''"),
+        ("outreach_drafts", "lease_expires", "TEXT DEFAULT ''"),
     ]
     with get_db() as db:
         for table, col, col_type in migrations:
@@ -124,6 +234,30 @@ def _ensure_columns():
                 log.info("Added column %s.%s", table, col)
             except sqlite3.OperationalError:
                 pass  # column already exists
+        # Indexes on migrated columns can only be created once the columns exist
+        for stmt in _INDEXES:
+            db.execute(stmt)
+
+
+# Bound parameters per IN (...) query, well under SQLite's variable limit
+_IN_CHUNK = 500
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_drafts_message_id ON outreach_drafts(message_id)",
+    "CREATE INDEX IF NOT EXISTS idx_drafts_lead_followup ON outreach_drafts(lead_id, followup_number)",
+    "CREATE INDEX IF NOT EXISTS idx_drafts_lead_sent ON outreach_drafts(lead_id, sent_at)",
+    "CREATE INDEX IF NOT EXISTS idx_replies_lead ON replies(lead_id)",
+    "CREATE INDEX IF NOT EXISTS idx_leads_email ON leads(email)",
+    "CREATE INDEX IF NOT EXISTS idx_drafts_status_sched ON outreach_drafts(status, scheduled_for)",
+    "CREATE INDEX IF NOT EXISTS idx_drafts_sender_sent ON outreach_drafts(sender_email, sent_at)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, kind, run_after)",
+    # One live job per (kind, lead): re-enqueueing the backlog is a no-op
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs(kind, dedup_key) "
+    "WHERE dedup_key != '' AND status IN ('queued', 'running')",
+    # Inbound Message-ID: a re-synced message is ignored, not stored twice.
+    # Partial so pre-migration rows (message_id '') don't collide.
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_replies_message_id ON replies(message_id) WHERE message_id != ''",
+]
 
 
 def db_exists() -> bool:
@@ -151,18 +285,62 @@ def insert_lead(lead: dict):
 
 
 def update_lead(lead_id: str, **kwargs):
+    """Update lead fields. Status changes go through transition_lead."""
+    if "lead_status" in kwargs:
+        raise ValueError("update_lead cannot change lead_status; use transition_lead")
+    kwargs = _lead_fields(kwargs)
     kwargs["updated_at"] = datetime.utcnow().isoformat()
-    if "has_website" in kwargs and isinstance(kwargs["has_website"], bool):
-        kwargs["has_website"] = int(kwargs["has_website"])
-    if "manual_override" in kwargs and isinstance(kwargs["manual_override"], bool):
-        kwargs["manual_override"] = int(kwargs["manual_override"])
-    if "review_themes" in kwargs and isinstance(kwargs["review_themes"], list):
-        kwargs["review_themes"] = json.dumps(kwargs["review_themes"])
     sets = ", ".join(f"{k}=?" for k in kwargs)
     with get_db() as db:
         db.execute(f"UPDATE leads SET {sets} WHERE id=?", list(kwargs.values()) + [lead_id])
 
 
+def transition_lead(lead_id: str, from_states: list[str] | None, to_state: str, **fields) -> bool:
+    """
+    Compare-and-set: move the lead to to_state (and write fields) only if it is
+    still in one of from_states. from_states=None means every status allowed
+    to reach to_state. Returns False if another writer got there first.
+    """
+    sources = _transition_sources(from_states, to_state)
+    with get_db() as db:
+        return _transition(db, lead_id, sources, to_state, _lead_fields(fields))
+
+
+def _lead_fields(fields: dict) -> dict:
+    fields = dict(fields)
+    if isinstance(fields.get("has_website"), bool):
+        fields["has_website"] = int(fields["has_website"])
+    if isinstance(fields.get("manual_override"), bool):
+        fields["manual_override"] = int(fields["manual_override"])
+    if isinstance(fields.get("review_themes"), list):
+        fields["review_themes"] = json.dumps(fields["review_themes"])
+    return fields
+
+
+def _transition_sources(from_states: list[str] | None, to_state: str) -> list[str]:
+    """Validate from_states -> to_state against LEAD_TRANSITIONS."""
+    to_state = LeadStatus(to_state)
+    if from_states is None:
+        return lead_sources(to_state)
+    sources = []
+    for state in map(LeadStatus, from_states):
+        if state != to_state and to_state not in LEAD_TRANSITIONS[state]:
+            raise ValueError(f"Lead status {state.value} -> {to_state.value} is not an allowed transition")
+        sources.append(state.value)
+    return sources
+
+
+def _transition(db, lead_id: str, sources: list[str], to_state: str, fields: dict = None) -> bool:
+    fields = {**(fields or {}), "lead_status": LeadStatus(to_state).value,
+              "updated_at": datetime.utcnow().isoformat()}
+    cur = db.execute(
+        f"UPDATE leads SET {', '.join(f'{k}=?' for k in fields)} "
+        f"WHERE id=? AND lead_status IN ({', '.join('?' * len(sources))})",
+        list(fields.values()) + [lead_id] + sources,
+    )
+    return cur.rowcount == 1
+
+
 def get_lead(lead_id: str) -> dict | None:
     with get_db() as db:
         row = db.execute("SELECT * FROM leads WHERE id=?", (lead_id,)).fetchone()
@@ -247,7 +425,7 @@ def update_draft(draft_id: str, **kwargs):
 def get_draft(draft_id: str) -> dict | None:
     with get_db() as db:
         row = db.execute(
-            "SELECT d.*, l.business_name, l.owner_name, l.email, l.metro "
+            "SELECT d.*, l.business_name, l.owner_name, l.email, l.phone, l.metro "
             "FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
             "WHERE d.id=?",
             (draft_id,),
@@ -283,6 +461,296 @@ def draft_exists(lead_id: str, followup_number: int) -> bool:
         return row is not None
 
 
+def approve_drafts(draft_ids: list[str] = None, tier: str = "", min_score: int = None,
+                   metro: str = "", followup: int = None, dry_run: bool = False) -> list[dict]:
+    """
+    Approve every draft still in 'draft' status that matches the filters, and
+    mark its lead approved (where the lead's status allows it), in one
+    transaction. Returns the drafts approved (or, with dry_run, the ones that
+    would be).
+    """
+    where = ["d.status='draft'"]
+    params = []
+    if draft_ids:
+        where.append(f"d.id IN ({', '.join('?' * len(draft_ids))})")
+        params.extend(draft_ids)
+    if tier:
+        where.append("l.tier=?")
+        params.append(tier)
+    if min_score is not None:
+        where.append("l.qualification_score >= ?")
+        params.append(min_score)
+    if metro:
+        where.append("l.metro=?")
+        params.append(metro)
+    if followup is not None:
+        where.append("d.followup_number=?")
+        params.append(followup)
+
+    sources = lead_sources(LeadStatus.APPROVED)
+    with get_db() as db:
+        # IMMEDIATE: nobody can approve/cancel these drafts between the SELECT and the UPDATE
+        db.execute("BEGIN IMMEDIATE")
+        rows = db.execute(
+            "SELECT d.id, d.lead_id, d.subject, d.followup_number, "
+            "l.business_name, l.email, l.metro, l.tier, l.qualification_score "
+            "FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
+            f"WHERE {' AND '.join(where)} ORDER BY l.qualification_score DESC, d.created_at",
+            params,
+        ).fetchall()
+        drafts = [dict(r) for r in rows]
+        if dry_run or not drafts:
+            return drafts
+        db.executemany(
+            "UPDATE outreach_drafts SET status='approved', error='' WHERE id=? AND status='draft'",
+            [(d["id"],) for d in drafts],
+        )
+        for lead_id in dict.fromkeys(d["lead_id"] for d in drafts):
+            _transition(db, lead_id, sources, LeadStatus.APPROVED)
+    return drafts
+
+
+def get_outreach_candidates(limit: int = 200, lead_ids: list[str] = None) -> list[dict]:
+    """
+    Qualified, non-paused leads with a preview (optionally only lead_ids),
+    best first, in one query.
+    Each row carries what the draft decision needs: draft_count (all drafts
+    ever) and next_draft_exists (a live draft for followup #draft_count
+    already exists).
+    """
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT l.*, "
+            "  (SELECT COUNT(*) FROM outreach_drafts d WHERE d.lead_id = l.id) AS draft_count, "
+            "  EXISTS (SELECT 1 FROM outreach_drafts d WHERE d.lead_id = l.id "
+            "          AND d.followup_number = (SELECT COUNT(*) FROM outreach_drafts c WHERE c.lead_id = l.id) "
+            "          AND d.status NOT IN ('cancelled', 'failed')) AS next_draft_exists "
+            "FROM leads l "
+            "WHERE l.lead_status='qualified' AND l.manual_override=0 AND l.preview_url != '' "
+            + (f"AND l.id IN ({', '.join('?' * len(lead_ids))}) " if lead_ids else "")
+            + "ORDER BY l.qualification_score DESC LIMIT ?",
+            list(lead_ids or []) + [limit],
+        ).fetchall()
+        return [_lead_row(r) for r in rows]
+
+
+def get_followup_candidates(sent_before: str, max_followup: int, limit: int = 5000) -> list[dict]:
+    """
+    Sent leads with no reply whose last send is older than sent_before and
+    whose sequence has not reached max_followup, in one pass over the book.
+    Each row adds last_sent_at, last_followup (highest sent followup_number),
+    draft_count and has_pending (an unsent draft is already queued).
+    """
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT l.*, s.last_sent_at, s.last_followup, "
+            "  (SELECT COUNT(*) FROM outreach_drafts c WHERE c.lead_id = l.id) AS draft_count, "
+            "  EXISTS (SELECT 1 FROM outreach_drafts p WHERE p.lead_id = l.id "
+            "          AND p.status IN ('draft', 'approved', 'sending')) AS has_pending "
+            "FROM (SELECT lead_id, MAX(sent_at) AS last_sent_at, MAX(followup_number) AS last_followup "
+            "      FROM outreach_drafts WHERE status='sent' AND sent_at != '' GROUP BY lead_id) s "
+            "JOIN leads l ON l.id = s.lead_id "
+            "WHERE l.lead_status='sent' AND l.manual_override=0 "
+            "  AND s.last_sent_at <= ? AND s.last_followup < ? "
+            "  AND NOT EXISTS (SELECT 1 FROM replies r WHERE r.lead_id = l.id) "
+            "ORDER BY s.last_sent_at LIMIT ?",
+            (sent_before, max_followup, limit),
+        ).fetchall()
+        return [_lead_row(r) for r in rows]
+
+
+def insert_drafts(drafts: list[dict], lead_status: str = "", from_states: list[str] = None) -> list[dict]:
+    """
+    Insert drafts in one transaction. With lead_status, each lead is moved
+    there first (compare-and-set from from_states, see transition_lead) and
+    a draft whose lead lost that race is not inserted. Returns the drafts
+    inserted.
+    """
+    if not drafts:
+        return []
+    cols = list(drafts[0].keys())
+    sql = f"INSERT INTO outreach_drafts ({', '.join(cols)}) VALUES ({', '.join(['?'] * len(cols))})"
+    with get_db() as db:
+        if lead_status:
+            sources = _transition_sources(from_states, lead_status)
+            drafts = [d for d in drafts if _transition(db, d["lead_id"], sources, lead_status)]
+        db.executemany(sql, [[d[c] for c in cols] for d in drafts])
+    return drafts
+
+
+# ---------------------------------------------------------------------------
+# Outbox — approved (queued) -> sending (leased) -> sent | failed
+# ---------------------------------------------------------------------------
+
+# Drafts whose lead row is gone can never be sent (claims join leads), so they are never due
+_DUE = (
+    "((status='approved' AND (scheduled_for='' OR scheduled_for<=?)) "
+    "OR (status='sending' AND lease_expires<? AND attempts + 1 < ?)) "
+    "AND EXISTS (SELECT 1 FROM leads l WHERE l.id = outreach_drafts.lead_id)"
+)
+
+
+def claim_due_drafts(owner: str, limit: int, lease_seconds: int, max_attempts: int) -> list[dict]:
+    """
+    Atomically lease up to `limit` due drafts to `owner` and return them.
+
+    Due = approved with scheduled_for in the past (or unset), or a send whose
+    lease expired (crashed worker). First attempts go before retries.
+    Reclaiming an expired lease counts as an attempt; a draft that would
+    reach max_attempts that way fails instead of being sent yet again.
+    """
+    now = datetime.utcnow()
+    now_s = now.isoformat()
+    expires = (now + timedelta(seconds=lease_seconds)).isoformat()
+    with get_db() as db:
+        failed = db.execute(
+            "UPDATE outreach_drafts SET status='failed', attempts = attempts + 1, lease_owner='', "
+            "lease_expires='', error='Sender died mid-send (lease expired) on its last attempt' "
+            "WHERE status='sending' AND lease_expires<? AND attempts + 1 >= ?",
+            (now_s, max_attempts),
+        ).rowcount
+        if failed:
+            log.warning("Failed %d drafts whose sender died on their last attempt", failed)
+        db.execute(
+            "UPDATE outreach_drafts SET attempts = attempts + (status='sending'), "
+            "status='sending', lease_owner=?, lease_expires=? "
+            f"WHERE id IN (SELECT id FROM outreach_drafts WHERE {_DUE} "
+            "ORDER BY attempts, scheduled_for, created_at LIMIT ?)",
+            (owner, expires, now_s, now_s, max_attempts, limit),
+        )
+        rows = db.execute(
+            "SELECT d.*, l.business_name, l.owner_name, l.email, l.phone, l.metro "
+            "FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
+            "WHERE d.status='sending' AND d.lease_owner=? "
+            "ORDER BY d.attempts, d.scheduled_for, d.created_at",
+            (owner,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def claim_draft(draft_id: str, owner: str, lease_seconds: int) -> bool:
+    """Lease one approved draft regardless of its schedule (manual sends)."""
+    expires = (datetime.utcnow() + timedelta(seconds=lease_seconds)).isoformat()
+    with get_db() as db:
+        cur = db.execute(
+            "UPDATE outreach_drafts SET status='sending', lease_owner=?, lease_expires=? "
+            "WHERE id=? AND status='approved'",
+            (owner, expires, draft_id),
+        )
+        return cur.rowcount == 1
+
+
+def finish_lease(draft_id: str, owner: str, **kwargs) -> bool:
+    """Update a leased draft only if `owner` still holds the lease. Clears the lease."""
+    kwargs.setdefault("lease_owner", "")
+    kwargs.setdefault("lease_expires", "")
+    sets = ", ".join(f"{k}=?" for k in kwargs)
+    with get_db() as db:
+        cur = db.execute(
+            f"UPDATE outreach_drafts SET {sets} WHERE id=? AND status='sending' AND lease_owner=?",
+            list(kwargs.values()) + [draft_id, owner],
+        )
+        return cur.rowcount == 1
+
+
+def release_leases(owner: str) -> int:
+    """Return drafts leased by `owner` but never attempted to the queue."""
+    with get_db() as db:
+        return db.execute(
+            "UPDATE outreach_drafts SET status='approved', lease_owner='', lease_expires='' "
+            "WHERE status='sending' AND lease_owner=?",
+            (owner,),
+        ).rowcount
+
+
+def get_unscheduled_approved(limit: int = 500) -> list[dict]:
+    """Approved drafts nobody has given a send time yet, oldest first."""
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT d.id, d.lead_id, d.created_at, l.metro "
+            "FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
+            "WHERE d.status='approved' AND d.scheduled_for='' "
+            "ORDER BY d.created_at LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def get_last_scheduled_by_metro() -> dict:
+    """Latest planned send time per metro among queued drafts."""
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT l.metro, MAX(d.scheduled_for) as last "
+            "FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
+            "WHERE d.status='approved' AND d.scheduled_for != '' GROUP BY l.metro"
+        ).fetchall()
+        return {r["metro"]: r["last"] for r in rows}
+
+
+def set_draft_schedules(schedule: list[tuple[str, str]]):
+    """Bulk-set scheduled_for for drafts still approved and unplanned. schedule = [(draft_id, iso)]."""
+    with get_db() as db:
+        db.executemany(
+            "UPDATE outreach_drafts SET scheduled_for=? "
+            "WHERE id=? AND status='approved' AND scheduled_for=''",
+            [(when, draft_id) for draft_id, when in schedule],
+        )
+
+
+def next_outbox_due() -> str | None:
+    """
+    Earliest time any queued or leased draft becomes claimable ('' = due now).
+    Only drafts claim_due_drafts could take count: a draft whose lead is gone
+    must not keep the scheduler awake.
+    """
+    with get_db() as db:
+        row = db.execute(
+            "SELECT MIN(d.scheduled_for) as t FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
+            "WHERE d.status='approved'"
+        ).fetchone()
+        lease = db.execute(
+            "SELECT MIN(d.lease_expires) as t FROM outreach_drafts d JOIN leads l ON d.lead_id = l.id "
+            "WHERE d.status='sending'"
+        ).fetchone()
+    times = [t for t in (row["t"], lease["t"]) if t is not None]
+    return min(times) if times else None
+
+
+def reserve_sends(day: str, wanted: int, limit: int) -> int:
+    """
+    Atomically take up to `wanted` sends from the day's budget. Returns how many
+    were granted. BEGIN IMMEDIATE serializes concurrent schedulers on the DB file.
+    """
+    with get_db() as db:
+        db.execute("BEGIN IMMEDIATE")
+        db.execute("INSERT OR IGNORE INTO send_counters (day, sent) VALUES (?, 0)", (day,))
+        used = db.execute("SELECT sent FROM send_counters WHERE day=?", (day,)).fetchone()["sent"]
+        granted = max(0, min(wanted, limit - used))
+        if granted:
+            db.execute("UPDATE send_counters SET sent = sent + ? WHERE day=?", (granted, day))
+        return granted
+
+
+def release_sends(day: str, count: int):
+    """Give back reserved sends that did not go out."""
+    if count <= 0:
+        return
+    with get_db() as db:
+        db.execute(
+            "UPDATE send_counters SET sent = MAX(0, sent - ?) WHERE day=?", (count, day)
+        )
+
+
+def count_sent_by_sender(sender_email: str, since: str) -> int:
+    """Drafts sent from one sender account since an ISO timestamp (for quotas)."""
+    with get_db() as db:
+        return db.execute(
+            "SELECT COUNT(*) as c FROM outreach_drafts "
+            "WHERE sender_email=? AND sent_at>=? AND status='sent'",
+            (sender_email, since),
+        ).fetchone()["c"]
+
+
 def get_sent_message_ids_for_lead(lead_id: str) -> list[str]:
     """Get all message_ids for sent drafts to a lead (for reply threading)."""
     with get_db() as db:
@@ -306,6 +774,43 @@ def insert_reply(reply: dict):
         db.execute(f"INSERT INTO replies ({cols}) VALUES ({vals})", list(d.values()))
 
 
+def ingest_replies(replies: list[dict]) -> list[dict]:
+    """
+    Store a batch of replies keyed on their inbound message_id. Messages seen
+    before are ignored; only newly stored replies cancel their lead's unsent
+    drafts and mark it replied (unless it is already won, lost or paused).
+    One transaction for the whole batch.
+    Returns the replies that were new.
+    """
+    if not replies:
+        return []
+    cols = list(replies[0].keys())
+    sql = (f"INSERT OR IGNORE INTO replies ({', '.join(cols)}) "
+           f"VALUES ({', '.join(['?'] * len(cols))})")
+    sources = lead_sources(LeadStatus.REPLIED)
+    with get_db() as db:
+        db.executemany(sql, [[r[c] for c in cols] for r in replies])
+        # Fresh ids only exist for rows that were actually inserted
+        ids = [r["id"] for r in replies]
+        stored = set()
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            rows = db.execute(
+                f"SELECT id FROM replies WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            stored.update(row["id"] for row in rows)
+        new = [r for r in replies if r["id"] in stored]
+        lead_ids = [(lead_id,) for lead_id in dict.fromkeys(r["lead_id"] for r in new)]
+        for (lead_id,) in lead_ids:
+            _transition(db, lead_id, sources, LeadStatus.REPLIED)
+        db.executemany(
+            "UPDATE outreach_drafts SET status='cancelled' "
+            "WHERE lead_id=? AND status IN ('draft', 'approved')",
+            lead_ids,
+        )
+    return new
+
+
 def get_replies(limit: int = 50) -> list[dict]:
     with get_db() as db:
         rows = db.execute(
@@ -325,33 +830,320 @@ def get_lead_id_by_email(email: str) -> str | None:
 
 def get_lead_id_by_message_thread(in_reply_to: str = "", references: str = "") -> str | None:
     """Match a reply to a lead via In-Reply-To or References headers."""
-    if not in_reply_to and not references:
+    ids = parse_message_ids(in_reply_to) + parse_message_ids(references)
+    if not ids:
         return None
-    with get_db() as db:
-        # Check In-Reply-To first (most reliable)
-        if in_reply_to:
-            row = db.execute(
-                "SELECT lead_id FROM outreach_drafts "
-                "WHERE message_id=? AND status='sent' LIMIT 1",
-                (in_reply_to.strip(),),
-            ).fetchone()
-            if row:
-                return row["lead_id"]
-        # Check References header (space-separated message IDs)
-        if references:
-            for ref in references.split():
-                ref = ref.strip().strip("<>")
-                if ref:
-                    row = db.execute(
-                        "SELECT lead_id FROM outreach_drafts "
-                        "WHERE message_id=? AND status='sent' LIMIT 1",
-                        (ref,),
-                    ).fetchone()
-                    if row:
-                        return row["lead_id"]
+    found = get_lead_ids_by_message_ids(ids)
+    # In-Reply-To first (most reliable), then References in header order
+    for mid in ids:
+        if mid in found:
+            return found[mid]
     return None
 
 
+def get_lead_ids_by_message_ids(message_ids: list[str]) -> dict:
+    """{message_id: lead_id} for sent drafts, resolved with chunked IN (...) queries."""
+    ids = list(dict.fromkeys(m for m in message_ids if m))
+    found = {}
+    with get_db() as db:
+        for i in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[i:i + _IN_CHUNK]
+            rows = db.execute(
+                "SELECT message_id, lead_id FROM outreach_drafts "
+                f"WHERE message_id IN ({', '.join('?' * len(chunk))}) AND status='sent'",
+                chunk,
+            ).fetchall()
+            found.update({r["message_id"]: r["lead_id"] for r in rows})
+    return found
+
+
+def get_lead_ids_by_emails(emails: list[str]) -> dict:
+    """{email: lead_id} in one indexed IN (...) query per chunk."""
+    wanted = list(dict.fromkeys(e for e in emails if e))
+    found = {}
+    with get_db() as db:
+        for i in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[i:i + _IN_CHUNK]
+            rows = db.execute(
+                f"SELECT email, id FROM leads WHERE email IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for r in rows:
+                found.setdefault(r["email"], r["id"])
+    return found
+
+
+def get_recent_sent_message_ids(limit: int) -> list[tuple[str, str]]:
+    """[(message_id, lead_id)] for the most recently sent drafts, oldest first."""
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT message_id, lead_id FROM outreach_drafts "
+            "WHERE status='sent' AND message_id != '' ORDER BY sent_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [(r["message_id"], r["lead_id"]) for r in reversed(rows)]
+
+
+def parse_message_ids(header: str) -> list[str]:
+    """'<a@x> <b@y>' (or bare ids) -> ['<a@x>', '<b@y>'], the form stored in message_id."""
+    if not header:
+        return []
+    ids = re.findall(r"<[^<>\s]+>", header)
+    if not ids:
+        ids = [f"<{tok.strip('<>')}>" for tok in header.split() if tok.strip("<>")]
+    return ids
+
+
+def get_imap_state(mailbox: str) -> dict | None:
+    with get_db() as db:
+        row = db.execute("SELECT * FROM imap_sync_state WHERE mailbox=?", (mailbox,)).fetchone()
+        return dict(row) if row else None
+
+
+def save_imap_state(mailbox: str, uidvalidity: int, last_uid: int):
+    with get_db() as db:
+        db.execute(
+            "INSERT INTO imap_sync_state (mailbox, uidvalidity, last_uid, updated_at) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT(mailbox) DO UPDATE SET "
+            "uidvalidity=excluded.uidvalidity, last_uid=excluded.last_uid, updated_at=excluded.updated_at",
+            (mailbox, uidvalidity, last_uid, datetime.utcnow().isoformat()),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Suppressions
+# ---------------------------------------------------------------------------
+
+def add_suppressions(entries: list[dict]) -> int:
+    """Insert {kind, value, reason, source} rows, ignoring ones already present. Returns new count."""
+    now = datetime.utcnow().isoformat()
+    rows = [(e["kind"], e["value"].strip().lower(), e.get("reason", "")[:200], e.get("source", ""), now)
+            for e in entries if e.get("value", "").strip()]
+    if not rows:
+        return 0
+    with get_db() as db:
+        before = db.total_changes
+        db.executemany(
+            "INSERT OR IGNORE INTO suppressions (kind, value, reason, source, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return db.total_changes - before
+
+
+def get_suppressions_after(rowid: int) -> list[tuple[int, str, str]]:
+    """(rowid, kind, value) of every suppression added after rowid, for the in-memory index."""
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT rowid, kind, value FROM suppressions WHERE rowid > ? ORDER BY rowid", (rowid,)
+        ).fetchall()
+        return [(r[0], r["kind"], r["value"]) for r in rows]
+
+
+def record_bounces(bounces: list[dict]) -> int:
+    """
+    Suppress hard-bounced addresses ({email, lead_id, reason}) and cancel the
+    unsent drafts of their leads, in one transaction. Returns newly suppressed count.
+    """
+    if not bounces:
+        return 0
+    now = datetime.utcnow().isoformat()
+    with get_db() as db:
+        before = db.total_changes
+        db.executemany(
+            "INSERT OR IGNORE INTO suppressions (kind, value, reason, source, created_at) "
+            "VALUES ('email', ?, ?, 'bounce', ?)",
+            [(b["email"].strip().lower(), b.get("reason", "")[:200], now) for b in bounces if b.get("email")],
+        )
+        added = db.total_changes - before
+        db.executemany(
+            "UPDATE outreach_drafts SET status='cancelled', error='Address bounced' "
+            "WHERE lead_id=? AND status IN ('draft', 'approved')",
+            [(lead_id,) for lead_id in dict.fromkeys(b["lead_id"] for b in bounces if b.get("lead_id"))],
+        )
+    return added
+
+
+# ---------------------------------------------------------------------------
+# Jobs — queued -> running (leased) -> done | failed
+# ---------------------------------------------------------------------------
+
+def enqueue_jobs(jobs: list[dict]) -> int:
+    """
+    Queue {kind, payload, dedup_key?, run_after?} jobs in one transaction.
+    A job whose (kind, dedup_key) is already queued or running is skipped.
+    Returns how many were queued.
+    """
+    now = datetime.utcnow().isoformat()
+    rows = [(uuid.uuid4().hex[:12], j["kind"], json.dumps(j.get("payload", {})), j.get("dedup_key", ""),
+             j.get("run_after", ""), now, now) for j in jobs]
+    if not rows:
+        return 0
+    with get_db() as db:
+        before = db.total_changes
+        db.executemany(
+            "INSERT OR IGNORE INTO jobs (id, kind, payload, dedup_key, run_after, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return db.total_changes - before
+
+
+def claim_jobs(owner: str, kinds: list[str], limit: int, lease_seconds: int, max_attempts: int) -> list[dict]:
+    """
+    Atomically lease up to `limit` due jobs of the given kinds to `owner`.
+    Due = queued and past run_after, or running with an expired lease (the
+    worker died). Reclaiming an expired lease counts as an attempt; a job
+    that would reach max_attempts that way fails instead, so a job that
+    kills its worker is not retried forever.
+    """
+    now = datetime.utcnow()
+    now_s = now.isoformat()
+    expires = (now + timedelta(seconds=lease_seconds)).isoformat()
+    marks = ", ".join("?" * len(kinds))
+    with get_db() as db:
+        failed = db.execute(
+            "UPDATE jobs SET status='failed', attempts = attempts + 1, lease_owner='', lease_expires='', "
+            "error='Worker died mid-job (lease expired) on its last attempt', updated_at=? "
+            f"WHERE kind IN ({marks}) AND status='running' AND lease_expires<? AND attempts + 1 >= ?",
+            [now_s] + list(kinds) + [now_s, max_attempts],
+        ).rowcount
+        if failed:
+            log.warning("Failed %d jobs whose worker died on their last attempt", failed)
+        db.execute(
+            "UPDATE jobs SET attempts = attempts + (status='running'), "
+            "status='running', lease_owner=?, lease_expires=?, updated_at=? "
+            f"WHERE id IN (SELECT id FROM jobs WHERE kind IN ({marks}) AND "
+            "((status='queued' AND run_after<=?) OR (status='running' AND lease_expires<? AND attempts + 1 < ?)) "
+            "ORDER BY run_after, created_at LIMIT ?)",
+            [owner, expires, now_s] + list(kinds) + [now_s, now_s, max_attempts, limit],
+        )
+        rows = db.execute(
+            "SELECT * FROM jobs WHERE status='running' AND lease_owner=? ORDER BY run_after, created_at",
+            (owner,),
+        ).fetchall()
+    jobs = []
+    for r in rows:
+        job = dict(r)
+        try:
+            job["payload"] = json.loads(job["payload"] or "{}")
+        except json.JSONDecodeError:
+            job["payload"] = {}
+        jobs.append(job)
+    return jobs
+
+
+def finish_job(job_id: str, owner: str, **kwargs) -> bool:
+    """Update a leased job only if `owner` still holds the lease. Clears the lease."""
+    kwargs.setdefault("lease_owner", "")
+    kwargs.setdefault("lease_expires", "")
+    kwargs["updated_at"] = datetime.utcnow().isoformat()
+    sets = ", ".join(f"{k}=?" for k in kwargs)
+    with get_db() as db:
+        cur = db.execute(
+            f"UPDATE jobs SET {sets} WHERE id=? AND status='running' AND lease_owner=?",
+            list(kwargs.values()) + [job_id, owner],
+        )
+        return cur.rowcount == 1
+
+
+def release_jobs(owner: str) -> int:
+    """Put jobs leased by `owner` but not started back in the queue."""
+    with get_db() as db:
+        return db.execute(
+            "UPDATE jobs SET status='queued', lease_owner='', lease_expires='' "
+            "WHERE status='running' AND lease_owner=?",
+            (owner,),
+        ).rowcount
+
+
+def count_jobs_by_status() -> dict:
+    """{kind: {status: count}}."""
+    with get_db() as db:
+        rows = db.execute("SELECT kind, status, COUNT(*) AS cnt FROM jobs GROUP BY kind, status").fetchall()
+    counts = {}
+    for r in rows:
+        counts.setdefault(r["kind"], {})[r["status"]] = r["cnt"]
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Lead events — status history, consumed incrementally by seq
+# ---------------------------------------------------------------------------
+
+def events_since(seq: int, limit: int = 1000, to_status: str = "") -> list[dict]:
+    """Status changes after seq, oldest first (optionally only moves into to_status)."""
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT seq, lead_id, from_status, to_status, created_at FROM lead_events "
+            "WHERE seq > ? " + ("AND to_status=? " if to_status else "") + "ORDER BY seq LIMIT ?",
+            [seq] + ([to_status] if to_status else []) + [limit],
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def get_checkpoint(consumer: str) -> int:
+    with get_db() as db:
+        row = db.execute("SELECT seq FROM event_checkpoints WHERE consumer=?", (consumer,)).fetchone()
+        return row["seq"] if row else 0
+
+
+def save_checkpoint(consumer: str, seq: int):
+    """Advance a consumer's checkpoint (never moves it backwards)."""
+    with get_db() as db:
+        db.execute(
+            "INSERT INTO event_checkpoints (consumer, seq, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(consumer) DO UPDATE SET seq=MAX(seq, excluded.seq), updated_at=excluded.updated_at",
+            (consumer, seq, datetime.utcnow().isoformat()),
+        )
+
+
+def get_stage_timings(since: str = "") -> dict:
+    """
+    Time spent in the previous status before each move, per target status:
+    {to_status: {"count", "avg_hours", "max_hours"}}. since limits it to
+    moves at or after that timestamp.
+    """
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT to_status, COUNT(*) AS n, AVG(hours) AS avg_hours, MAX(hours) AS max_hours FROM ("
+            "  SELECT to_status, created_at, (julianday(created_at) - julianday("
+            "    LAG(created_at) OVER (PARTITION BY lead_id ORDER BY seq))) * 24 AS hours "
+            "  FROM lead_events) "
+            "WHERE hours IS NOT NULL AND created_at >= ? GROUP BY to_status",
+            (since,),
+        ).fetchall()
+        return {r["to_status"]: {"count": r["n"], "avg_hours": round(r["avg_hours"], 1),
+                                 "max_hours": round(r["max_hours"], 1)} for r in rows}
+
+
+# ---------------------------------------------------------------------------
+# Agent runs
+# ---------------------------------------------------------------------------
+
+def insert_agent_run(run: dict):
+    d = {"id": uuid.uuid4().hex[:12], **run}  # id doubles as the run_id in logs
+    with get_db() as db:
+        db.execute(f"INSERT INTO agent_runs ({', '.join(d)}) VALUES ({', '.join('?' * len(d))})",
+                   list(d.values()))
+
+
+def get_agent_runs(agent: str = "", limit: int = 20) -> list[dict]:
+    """Most recent runs first, spans parsed."""
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT * FROM agent_runs " + ("WHERE agent=? " if agent else "")
+            + "ORDER BY started_at DESC LIMIT ?",
+            ([agent] if agent else []) + [limit],
+        ).fetchall()
+    runs = []
+    for r in rows:
+        run = dict(r)
+        run["spans"] = json.loads(run["spans"] or "{}")
+        runs.append(run)
+    return runs
+
+
 # ---------------------------------------------------------------------------
 # Conversions
 # ---------------------------------------------------------------------------
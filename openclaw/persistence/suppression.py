@@ -0,0 +1,95 @@
+"""
+Do-not-contact index.
+
+The suppressions table is keyed by (kind, value) with three kinds:
+  email     lower-cased address (hard bounces, opt-outs)
+  phone     last 10 digits
+  business  normalized "name|metro", so a re-prospected business under a new
+            lead id is still caught
+
+Lookups on the hot paths (prospecting, drafting, sending) hit an in-memory set
+loaded on first use. It picks up rows added by other processes (e.g. the reply
+watcher) incrementally by rowid, at most every SUPPRESSION_REFRESH_SECONDS.
+"""
+
+import re
+import threading
+import time
+
+from openclaw import config
+from openclaw.persistence.database import add_suppressions, get_suppressions_after
+
+_BUSINESS_NOISE = re.compile(r"\b(llc|inc|co|corp|corporation|company|ltd|the)\b")
+
+
+def normalize_email(value: str) -> str:
+    return (value or "").strip().lower()
+
+
+def normalize_phone(value: str) -> str:
+    digits = re.sub(r"\D", "", value or "")
+    return digits[-10:] if len(digits) >= 10 else ""
+
+
+def business_key(name: str, metro: str) -> str:
+    """'Ace Plumbing & Drain, LLC' + 'Denver CO' -> 'ace plumbing drain|denver co'."""
+    name = _BUSINESS_NOISE.sub(" ", re.sub(r"[^a-z0-9]+", " ", (name or "").lower()))
+    metro = re.sub(r"[^a-z0-9]+", " ", (metro or "").lower())
+    name, metro = " ".join(name.split()), " ".join(metro.split())
+    return f"{name}|{metro}" if name and metro else ""
+
+
+def lead_keys(lead: dict) -> list[tuple[str, str]]:
+    """Every (kind, value) a lead or draft row can be suppressed under."""
+    keys = [
+        ("email", normalize_email(lead.get("email", ""))),
+        ("phone", normalize_phone(lead.get("phone", ""))),
+        ("business", business_key(lead.get("business_name", ""), lead.get("metro", ""))),
+    ]
+    return [(kind, value) for kind, value in keys if value]
+
+
+class SuppressionIndex:
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._keys = set()
+        self._last_rowid = 0
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def blocked(self, lead: dict) -> str:
+        """The kind that matched ('email' / 'phone' / 'business'), or '' if the lead may be contacted."""
+        self._refresh()
+        for key in lead_keys(lead):
+            if key in self._keys:
+                return key[0]
+        return ""
+
+    def contains(self, kind: str, value: str) -> bool:
+        self._refresh()
+        return (kind, value) in self._keys
+
+    def suppress_lead(self, lead: dict, reason: str, source: str, emails: list[str] = ()) -> int:
+        """Suppress every key of a lead (plus any extra addresses). Returns new entry count."""
+        keys = set(lead_keys(lead)) | {("email", normalize_email(e)) for e in emails if normalize_email(e)}
+        added = add_suppressions([
+            {"kind": kind, "value": value, "reason": reason, "source": source} for kind, value in keys
+        ])
+        with self._lock:
+            self._keys.update(keys)
+        return added
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+                return
+            for rowid, kind, value in get_suppressions_after(self._last_rowid):
+                self._keys.add((kind, value))
+                self._last_rowid = max(self._last_rowid, rowid)
+            self._checked_at = now
+
+
+SUPPRESSIONS = SuppressionIndex(config.SUPPRESSION_REFRESH_SECONDS)
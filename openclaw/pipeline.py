@@ -0,0 +1,278 @@
+"""
+Streaming pipeline runner for the daily run.
+
+    prospect -> qualify -> build -> draft
+
+Stages are connected by bounded queues: a lead moves on as soon as the
+previous stage is done with it, and a slow stage blocks its producers
+(backpressure) instead of letting work pile up in memory. Each stage has its
+own pool of worker threads — the work is I/O-bound (Places API, website
+checks, preview writes, SQLite) — and a stage can take items in batches.
+
+The summary reports, per stage: items in/out, drops, errors, busy time,
+throughput and how long items waited in the stage's input queue; run_daily
+adds each agent's spans.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable
+
+from openclaw import config
+from openclaw.observability.logging_setup import log_context
+
+log = logging.getLogger("openclaw.pipeline")
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """
+    fn(item) -> item for the next stage, or None to drop it.
+    With batch > 0, fn(list of up to `batch` items) -> list of items instead.
+    """
+    name: str
+    fn: Callable
+    workers: int = 1
+    batch: int = 0
+
+
+class _StageRun:
+    def __init__(self, stage: Stage, queue_size: int):
+        self.stage = stage
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.producers = 0
+        self.active_workers = stage.workers
+        self.stats = {"in": 0, "out": 0, "dropped": 0, "errors": 0, "busy": 0.0,
+                      "wait": 0.0, "wait_max": 0.0, "started": None, "finished": None}
+
+    def put(self, item):
+        self.inbox.put((time.monotonic(), item))
+
+    def producer_done(self):
+        """Once every producer is done, wake each worker with a sentinel."""
+        with self.lock:
+            self.producers -= 1
+            last = self.producers == 0
+        if last:
+            for _ in range(self.stage.workers):
+                self.inbox.put((time.monotonic(), _DONE))
+
+    def record(self, key: str, amount: float = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def record_wait(self, enqueued: float):
+        waited = time.monotonic() - enqueued
+        with self.lock:
+            self.stats["wait"] += waited
+            self.stats["wait_max"] = max(self.stats["wait_max"], waited)
+
+
+class Pipeline:
+    def __init__(self, stages: list[Stage], queue_size: int = 0):
+        self.stages = stages
+        self.queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+
+    def run(self, source: Iterable, source_name: str = "source", seeds: dict = None) -> dict:
+        """
+        Feed `source` into the first stage and run until every stage drains.
+        seeds = {stage_name: iterable} injects backlog items straight into a
+        later stage. Returns the per-stage summary.
+        """
+        seeds = seeds or {}
+        runs = [_StageRun(stage, self.queue_size) for stage in self.stages]
+        by_name = {r.stage.name: r for r in runs}
+        unknown = set(seeds) - set(by_name)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stage(s): {', '.join(sorted(unknown))}")
+
+        # Producers per stage: the previous stage (or the source) plus any seed feeders
+        for r in runs:
+            r.producers = 1 + (1 if r.stage.name in seeds else 0)
+
+        started = time.monotonic()
+        source_stats = {"out": 0, "errors": 0, "started": started, "finished": None}
+        threads = [_thread(f"pipe-{source_name}", self._feed, source, runs[0], source_stats)]
+        for name, items in seeds.items():
+            threads.append(_thread(f"pipe-seed-{name}", self._feed, items, by_name[name], None))
+        for i, r in enumerate(runs):
+            downstream = runs[i + 1] if i + 1 < len(runs) else None
+            for n in range(r.stage.workers):
+                threads.append(_thread(f"pipe-{r.stage.name}-{n}", self._work, r, downstream))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        elapsed = time.monotonic() - started
+        summary = {"elapsed_s": round(elapsed, 2), "stages": {source_name: _source_summary(source_stats)}}
+        for r in runs:
+            summary["stages"][r.stage.name] = _stage_summary(r)
+        return summary
+
+    @staticmethod
+    def _feed(items: Iterable, target: _StageRun, stats: dict | None):
+        try:
+            for item in items:
+                target.put(item)
+                if stats is not None:
+                    stats["out"] += 1
+        except Exception as e:
+            log.error("Pipeline source for %s failed: %s", target.stage.name, e)
+            if stats is not None:
+                stats["errors"] += 1
+        finally:
+            if stats is not None:
+                stats["finished"] = time.monotonic()
+            target.producer_done()
+
+    @staticmethod
+    def _work(run: _StageRun, downstream: _StageRun | None):
+        stage = run.stage
+        done = False
+        while not done:
+            enqueued, item = run.inbox.get()
+            if item is _DONE:
+                break
+            run.record_wait(enqueued)
+            batch = [item]
+            # Batch stages take whatever else is already waiting, up to the batch size
+            while stage.batch and len(batch) < stage.batch:
+                try:
+                    enqueued, item = run.inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                run.record_wait(enqueued)
+                batch.append(item)
+
+            with run.lock:
+                if run.stats["started"] is None:
+                    run.stats["started"] = time.monotonic()
+            t0 = time.monotonic()
+            try:
+                out = stage.fn(batch) if stage.batch else [stage.fn(batch[0])]
+                out = [o for o in out or [] if o is not None]
+                run.record("dropped", max(0, len(batch) - len(out)))
+            except Exception as e:
+                log.error("Pipeline stage %s failed on %d item(s): %s", stage.name, len(batch), e)
+                run.record("errors", len(batch))
+                out = []
+            run.record("busy", time.monotonic() - t0)
+            run.record("in", len(batch))
+            run.record("out", len(out))
+            if downstream is not None:
+                for o in out:
+                    downstream.put(o)
+
+        with run.lock:
+            run.active_workers -= 1
+            last = run.active_workers == 0
+            if last:
+                run.stats["finished"] = time.monotonic()
+        if last and downstream is not None:
+            downstream.producer_done()
+
+
+def _thread(name: str, target: Callable, *args) -> threading.Thread:
+    """Daemon thread that starts in a copy of the caller's context, so log fields like run_id carry over."""
+    return threading.Thread(target=contextvars.copy_context().run, args=(target, *args), name=name, daemon=True)
+
+
+def _source_summary(stats: dict) -> dict:
+    wall = (stats["finished"] or stats["started"]) - stats["started"]
+    return {"out": stats["out"], "errors": stats["errors"], "wall_s": round(wall, 2),
+            "per_s": round(stats["out"] / wall, 2) if wall > 0 else 0.0}
+
+
+def _stage_summary(run: _StageRun) -> dict:
+    s = run.stats
+    wall = (s["finished"] - s["started"]) if s["started"] is not None and s["finished"] else 0.0
+    return {
+        "workers": run.stage.workers,
+        "in": s["in"],
+        "out": s["out"],
+        "dropped": s["dropped"],
+        "errors": s["errors"],
+        "busy_s": round(s["busy"], 2),
+        "wall_s": round(wall, 2),
+        "per_s": round(s["in"] / wall, 2) if wall > 0 else 0.0,
+        "wait_avg_ms": round(1000 * s["wait"] / s["in"], 1) if s["in"] else 0.0,
+        "wait_max_ms": round(1000 * s["wait_max"], 1),
+    }
+
+
+def run_daily(category: str, metro: str) -> dict:
+    """
+    The daily run as one streaming pipeline. Backlog from earlier runs joins
+    at the stage it is waiting for: new leads at qualify, qualified leads
+    without a preview at build, leads with a preview but no draft at draft.
+    """
+    from openclaw.agents.prospector import ProspectorAgent
+    from openclaw.agents.qualifier import QualifierAgent
+    from openclaw.agents.builder import BuilderAgent
+    from openclaw.agents.outreach import OutreachAgent
+    from openclaw.persistence.database import get_leads_by_status, get_outreach_candidates
+
+    prospector = ProspectorAgent()
+    qualifier = QualifierAgent()
+    builder = BuilderAgent()
+    outreach = OutreachAgent()
+    stages = [
+        Stage("qualify", qualifier.qualify_lead, workers=config.PIPELINE_QUALIFY_WORKERS),
+        Stage("build", builder.build_lead, workers=config.PIPELINE_BUILD_WORKERS),
+        Stage("draft", lambda leads: outreach.draft_for([l["id"] for l in leads]),
+              batch=config.PIPELINE_DRAFT_BATCH),
+    ]
+    seeds = {
+        "qualify": get_leads_by_status("new"),
+        "build": [l for l in get_leads_by_status("qualified") if not l.get("preview_url")],
+        "draft": get_outreach_candidates(),
+    }
+    log.info("Pipeline: %s in %s (backlog: %d new, %d to build, %d to draft)", category, metro,
+             len(seeds["qualify"]), len(seeds["build"]), len(seeds["draft"]))
+    started_at = datetime.utcnow().isoformat()
+    with log_context(run_id=uuid.uuid4().hex[:12]):
+        summary = Pipeline(stages).run(prospector.iter_leads(category, metro),
+                                       source_name="prospect", seeds=seeds)
+    log.info("Pipeline done in %.1fs", summary["elapsed_s"])
+
+    # Agents share the process here, so CPU time is not attributable to one of them
+    summary["spans"] = {}
+    for stage_name, agent in (("prospect", prospector), ("qualify", qualifier),
+                              ("build", builder), ("draft", outreach)):
+        stage = summary["stages"][stage_name]
+        spans = agent.span_stats()
+        summary["spans"][agent.name] = spans
+        agent.save_run(started_at, {"ok": True, "result": stage,
+                                    "timing": {"wall_s": stage["wall_s"], "cpu_s": None, "spans": spans}})
+    return summary
+
+
+def format_summary(summary: dict) -> str:
+    lines = [f"{'stage':<10} {'workers':>7} {'in':>5} {'out':>5} {'drop':>5} {'err':>4} "
+             f"{'busy s':>7} {'/s':>7} {'wait avg ms':>11} {'wait max ms':>11}"]
+    for name, s in summary["stages"].items():
+        if "in" not in s:  # source
+            lines.append(f"{name:<10} {'':>7} {'':>5} {s['out']:>5} {'':>5} {s['errors']:>4} "
+                         f"{s['wall_s']:>7} {s['per_s']:>7}")
+            continue
+        lines.append(f"{name:<10} {s['workers']:>7} {s['in']:>5} {s['out']:>5} {s['dropped']:>5} "
+                     f"{s['errors']:>4} {s['busy_s']:>7} {s['per_s']:>7} "
+                     f"{s['wait_avg_ms']:>11} {s['wait_max_ms']:>11}")
+    lines.append(f"elapsed {summary['elapsed_s']}s")
+    for agent, spans in summary.get("spans", {}).items():
+        for name, s in sorted(spans.items(), key=lambda kv: -kv[1]["total_s"]):
+            lines.append(f"  {agent + '.' + name:<30} n={s['count']:<6} total {s['total_s']:>8}s  p95 {s['p95_ms']:>8}ms")
+    return "\n".join(lines)
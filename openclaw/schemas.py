@@ -22,6 +22,30 @@ class LeadStatus(str, Enum):
     PAUSED = "paused"
 
 
+# Allowed lead_status moves, from -> to. Staying in the same status is always allowed.
+LEAD_TRANSITIONS: dict[LeadStatus, frozenset[LeadStatus]] = {
+    LeadStatus.NEW: frozenset({LeadStatus.QUALIFIED, LeadStatus.LOST, LeadStatus.PAUSED}),
+    LeadStatus.QUALIFIED: frozenset({LeadStatus.DRAFT_READY, LeadStatus.LOST, LeadStatus.PAUSED}),
+    LeadStatus.DRAFT_READY: frozenset({LeadStatus.APPROVED, LeadStatus.SENT, LeadStatus.REPLIED,
+                                       LeadStatus.LOST, LeadStatus.PAUSED}),
+    LeadStatus.APPROVED: frozenset({LeadStatus.SENT, LeadStatus.DRAFT_READY, LeadStatus.REPLIED,
+                                    LeadStatus.LOST, LeadStatus.PAUSED}),
+    # Follow-ups take a sent lead back through draft_ready
+    LeadStatus.SENT: frozenset({LeadStatus.DRAFT_READY, LeadStatus.REPLIED, LeadStatus.WON,
+                                LeadStatus.LOST, LeadStatus.PAUSED}),
+    LeadStatus.REPLIED: frozenset({LeadStatus.WON, LeadStatus.LOST, LeadStatus.PAUSED}),
+    LeadStatus.WON: frozenset(),
+    LeadStatus.LOST: frozenset(),
+    LeadStatus.PAUSED: frozenset({LeadStatus.QUALIFIED}),
+}
+
+
+def lead_sources(to_state: str) -> list[str]:
+    """Every status a lead may move to `to_state` from (including itself)."""
+    to_state = LeadStatus(to_state)
+    return [s.value for s, targets in LEAD_TRANSITIONS.items() if s == to_state or to_state in targets]
+
+
 def _id() -> str:
     return uuid.uuid4().hex[:12]
 
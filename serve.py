@@ -4,8 +4,10 @@ Preview server — serves static HTML previews with zero dependencies.
 Routes:
   GET /preview/<slug>  →  docs/preview/<slug>/index.html
   GET /                →  simple index listing all previews
+  GET /metrics         →  Prometheus text metrics
 
-No restart needed: new files are served immediately after build.
+No restart needed: new files are served immediately after build
+(cached pages are revalidated against the file's mtime on every request).
 Uses only Python stdlib (http.server).
 
 Usage:
@@ -15,17 +17,82 @@ Usage:
 
 import os
 import sys
+import time
 import argparse
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from urllib.parse import unquote
 
 # Add project root to path so we can import config
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+from openclaw.observability.metrics import MetricsRegistry
+
 log = logging.getLogger("openclaw.serve")
 
+CACHE_MAX_ENTRIES = 512
+
+
+class PreviewCache:
+    """Small LRU of rendered preview files, revalidated by (mtime, size) on each hit."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: Path) -> tuple[bytes, bool]:
+        """Return (content, hit). Raises OSError if the file is unreadable."""
+        st = file_path.stat()
+        key = str(file_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                return entry[1], True
+        content = file_path.read_bytes()
+        with self._lock:
+            self._entries[key] = (stamp, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return content, False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+METRICS = MetricsRegistry()
+CACHE = PreviewCache()
+
+REQUESTS = METRICS.counter(
+    "openclaw_preview_requests_total", "HTTP requests by route and status.", ("route", "status"))
+LATENCY = METRICS.histogram(
+    "openclaw_preview_request_duration_seconds", "Request latency by route.", ("route",))
+BYTES_SENT = METRICS.counter(
+    "openclaw_preview_response_bytes_total", "Response body bytes sent by route.", ("route",))
+CACHE_LOOKUPS = METRICS.counter(
+    "openclaw_preview_cache_lookups_total", "Preview cache lookups by result.", ("result",))
+IN_FLIGHT = METRICS.gauge(
+    "openclaw_preview_requests_in_flight", "Requests currently being handled.")
+
+
+def _cache_hit_ratio() -> float:
+    lookups = CACHE_LOOKUPS.values()
+    hits = lookups.get(("hit",), 0)
+    total = hits + lookups.get(("miss",), 0)
+    return hits / total if total else 0.0
+
+
+METRICS.gauge_fn("openclaw_preview_cache_hit_ratio", "Preview cache hits / lookups.", _cache_hit_ratio)
+METRICS.gauge_fn("openclaw_preview_previews_loaded", "Preview pages held in the cache.", lambda: len(CACHE))
+METRICS.gauge_fn("openclaw_preview_uptime_seconds", "Seconds since the server started.",
+                 lambda: time.time() - METRICS.started)
+
 
 class PreviewHandler(BaseHTTPRequestHandler):
     """Serves preview sites from the docs/ directory (matches GitHub Pages layout)."""
@@ -33,13 +100,32 @@ class PreviewHandler(BaseHTTPRequestHandler):
     docs_dir: Path = Path("docs")
 
     def do_GET(self):
-        path = unquote(self.path).rstrip("/")
+        path = unquote(self.path.split("?", 1)[0]).rstrip("/")
+        self._route = _route_label(path)
+        self._status = 0
+        self._bytes = 0
+        start = time.perf_counter()
+        IN_FLIGHT.inc()
+        try:
+            self._dispatch(path)
+        finally:
+            IN_FLIGHT.dec()
+            REQUESTS.inc(self._route, str(self._status))
+            LATENCY.observe(time.perf_counter() - start, self._route)
+            BYTES_SENT.inc(self._route, amount=self._bytes)
 
+    def _dispatch(self, path: str):
         # GET / — list all previews
         if path == "" or path == "/":
             self._serve_index()
             return
 
+        # GET /metrics — Prometheus scrape
+        if path == "/metrics":
+            self._send_body(200, METRICS.render().encode("utf-8"),
+                            "text/plain; version=0.0.4; charset=utf-8")
+            return
+
         # GET /preview/<slug> — serve docs/preview/<slug>/index.html
         if path.startswith("/preview/"):
             slug = path[len("/preview/"):]
@@ -85,16 +171,13 @@ class PreviewHandler(BaseHTTPRequestHandler):
 
     def _serve_file(self, file_path: Path):
         try:
-            content = file_path.read_bytes()
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(content)))
-            self.send_header("Cache-Control", "no-cache")
-            self.end_headers()
-            self.wfile.write(content)
+            content, hit = CACHE.get(file_path)
         except Exception as e:
             log.error("Error serving %s: %s", file_path, e)
             self._send_404()
+            return
+        CACHE_LOOKUPS.inc("hit" if hit else "miss")
+        self._send_body(200, content, "text/html; charset=utf-8", {"Cache-Control": "no-cache"})
 
     def _send_404(self):
         self._send_html(404, "<h2>404 — Preview not found</h2>")
@@ -108,12 +191,18 @@ class PreviewHandler(BaseHTTPRequestHandler):
             "a{color:#1565C0} ul{list-style:none;padding:0} li{padding:8px 0;border-bottom:1px solid #eee}</style>"
             f"</head><body>{body}</body></html>"
         )
-        content = html.encode("utf-8")
+        self._send_body(code, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send_body(self, code: int, content: bytes, content_type: str, headers: dict = None):
+        self._status = code
         self.send_response(code)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(content)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
         self.end_headers()
         self.wfile.write(content)
+        self._bytes += len(content)
 
     def log_message(self, fmt, *args):
         """Quieter logging — only errors."""
@@ -122,6 +211,17 @@ class PreviewHandler(BaseHTTPRequestHandler):
         log.info(fmt, *args)
 
 
+def _route_label(path: str) -> str:
+    """Collapse request paths to a bounded set of metric labels."""
+    if path in ("", "/"):
+        return "/"
+    if path == "/metrics":
+        return "/metrics"
+    if path.startswith("/preview/"):
+        return "/preview"
+    return "other"
+
+
 def main():
     parser = argparse.ArgumentParser(description="OpenClaw preview server")
     parser.add_argument("--port", type=int, default=None, help="Port (default: from .env or 8111)")
@@ -150,10 +250,12 @@ def main():
 
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 
-    server = HTTPServer(("0.0.0.0", port), PreviewHandler)
+    server = ThreadingHTTPServer(("0.0.0.0", port), PreviewHandler)
+    server.daemon_threads = True
     print(f"Preview server running at http://localhost:{port}")
     print(f"Serving from: {docs_path.resolve()}")
     print(f"Preview URLs: http://localhost:{port}/preview/<slug>")
+    print(f"Metrics:      http://localhost:{port}/metrics")
     print("Press Ctrl+C to stop.\n")
 
     try: